@@ -0,0 +1,209 @@
+"""Benchmark the keyed idle-pool query against the original date-only join.
+
+The original Query 2 joined METERING_HISTORY to QUERY_HISTORY on the day
+alone, pairing every compute pool metering row with every successful query
+of that day. The current template aggregates both views per pool and day
+and joins on pool and day. This script loads METERING_HISTORY and
+QUERY_HISTORY exports (or a generated account) into ``LocalSQLEngine``,
+reports the rows each join processes, times the keyed template and the
+Python detector, and checks that they agree. The original query is timed
+too with ``--run-legacy``; it scales with the product of the two views.
+Runs without Streamlit or Plotly.
+
+Usage:
+    python app/benchmark_idle_pools.py
+    python app/benchmark_idle_pools.py --pools 50 --queries-per-day 20000 --run-legacy
+    python app/benchmark_idle_pools.py --metering metering_history.csv --queries query_history.csv
+
+Export columns (case-insensitive):
+    metering_history: service_type, name, start_time, credits_used (required)
+    query_history: query_id, query_tag, execution_status, start_time (required)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.idle_pools import DEFAULT_IDLE_LOOKBACK_DAYS, detect_idle_pools
+from models.sql_engine import LocalSQLEngine, numbered_sql_statements
+
+USAGE_QUERIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sql_templates", "usage_queries.sql")
+
+# Query 2 as first published: metering rows joined to every query of the same day
+LEGACY_IDLE_POOLS_SQL = """
+WITH pool_activity AS (
+    SELECT
+        mh.name AS pool_name,
+        DATE(mh.start_time) AS activity_date,
+        SUM(mh.credits_used) AS daily_credits,
+        COUNT(DISTINCT qh.query_id) AS query_count
+    FROM
+        SNOWFLAKE.ACCOUNT_USAGE.METERING_HISTORY mh
+        LEFT JOIN SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY qh
+            ON DATE(mh.start_time) = DATE(qh.start_time)
+            AND qh.execution_status = 'SUCCESS'
+    WHERE
+        mh.service_type = 'COMPUTE_POOL'
+        AND mh.start_time >= DATEADD(day, -30, CURRENT_TIMESTAMP())
+    GROUP BY
+        mh.name,
+        DATE(mh.start_time)
+)
+SELECT pool_name, activity_date, daily_credits, query_count
+FROM pool_activity
+WHERE daily_credits > 0 AND query_count < 5
+"""
+
+# Rows entering and leaving each join, counted from per-day aggregates
+JOIN_ROWS_SQL = """
+WITH metering_days AS (
+    SELECT DATE(start_time) AS activity_date, COUNT(*) AS metering_rows
+    FROM SNOWFLAKE.ACCOUNT_USAGE.METERING_HISTORY
+    WHERE service_type = 'COMPUTE_POOL'
+        AND start_time >= DATEADD(day, -30, CURRENT_TIMESTAMP())
+    GROUP BY DATE(start_time)
+),
+query_days AS (
+    SELECT DATE(start_time) AS activity_date, COUNT(*) AS query_rows
+    FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY
+    WHERE execution_status = 'SUCCESS'
+    GROUP BY DATE(start_time)
+),
+pool_days AS (
+    SELECT COUNT(*) AS n FROM (
+        SELECT name, DATE(start_time) FROM SNOWFLAKE.ACCOUNT_USAGE.METERING_HISTORY
+        WHERE service_type = 'COMPUTE_POOL'
+            AND start_time >= DATE_TRUNC('day', DATEADD(day, -30, CURRENT_TIMESTAMP()))
+        GROUP BY name, DATE(start_time)
+    )
+),
+query_pool_days AS (
+    SELECT COUNT(*) AS n FROM (
+        SELECT query_tag, DATE(start_time) FROM SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY
+        WHERE execution_status = 'SUCCESS'
+            AND start_time >= DATE_TRUNC('day', DATEADD(day, -30, CURRENT_TIMESTAMP()))
+            AND query_tag IS NOT NULL
+        GROUP BY query_tag, DATE(start_time)
+    )
+)
+SELECT
+    (SELECT SUM(metering_rows) FROM metering_days) AS metering_rows,
+    (SELECT SUM(query_rows) FROM query_days) AS successful_query_rows,
+    (SELECT SUM(m.metering_rows * CASE WHEN COALESCE(q.query_rows, 0) > 0 THEN q.query_rows ELSE 1 END)
+     FROM metering_days m LEFT JOIN query_days q ON q.activity_date = m.activity_date) AS legacy_join_rows,
+    (SELECT n FROM pool_days) AS keyed_metering_pool_days,
+    (SELECT n FROM query_pool_days) AS keyed_query_pool_days
+"""
+
+
+def generate_account(pools: int, days: int, queries_per_day: int, seed: int = 0):
+    """
+    Hourly compute pool metering and pool-tagged queries for a synthetic account.
+
+    Pools are busy on weekday working hours and meter a small idle load
+    otherwise; every fifth pool runs no queries at all.
+
+    Returns:
+        Tuple of (METERING_HISTORY, QUERY_HISTORY) DataFrames
+    """
+    rng = np.random.default_rng(seed)
+    hours = pd.date_range("2024-01-01", periods=days * 24, freq="h")
+    busy = (hours.hour >= 9) & (hours.hour < 18) & (hours.dayofweek < 5)
+    names = np.array([f"POOL_{i:03d}" for i in range(pools)])
+
+    metering = pd.DataFrame({
+        "service_type": "COMPUTE_POOL",
+        "name": np.repeat(names, len(hours)),
+        "start_time": np.tile(hours, pools),
+        "end_time": np.tile(hours + pd.Timedelta(hours=1), pools),
+        "credits_used": np.where(np.tile(busy, pools), rng.uniform(0.2, 1.0, pools * len(hours)), 0.02),
+    })
+
+    active = names[np.arange(pools) % 5 != 4]
+    n_queries = days * queries_per_day
+    busy_hours = hours[busy]
+    queries = pd.DataFrame({
+        "query_id": np.arange(n_queries).astype(str),
+        "query_tag": rng.choice(active, n_queries),
+        "execution_status": np.where(rng.random(n_queries) < 0.97, "SUCCESS", "FAIL"),
+        "start_time": busy_hours[rng.integers(0, len(busy_hours), n_queries)]
+        + pd.to_timedelta(rng.integers(0, 3600, n_queries), unit="s"),
+        "total_elapsed_time": rng.exponential(20000, n_queries),
+    })
+    return metering, queries
+
+
+def _timed(fn):
+    """Result of ``fn()`` and its wall time in seconds."""
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare the keyed idle-pool query with the original date-only join."
+    )
+    parser.add_argument("--metering", default=None,
+                        help="METERING_HISTORY export; a synthetic account is generated without it")
+    parser.add_argument("--queries", default=None,
+                        help="QUERY_HISTORY export (used with --metering)")
+    parser.add_argument("--pools", type=int, default=20,
+                        help="Compute pools in the synthetic account (default: 20)")
+    parser.add_argument("--days", type=int, default=DEFAULT_IDLE_LOOKBACK_DAYS,
+                        help=f"Days in the synthetic account (default: {DEFAULT_IDLE_LOOKBACK_DAYS})")
+    parser.add_argument("--queries-per-day", type=int, default=2000,
+                        help="Queries per day in the synthetic account (default: 2000)")
+    parser.add_argument("--run-legacy", action="store_true",
+                        help="Also time the original query (slow on large exports)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.metering:
+        metering, queries = args.metering, args.queries
+    else:
+        metering, queries = generate_account(args.pools, args.days, args.queries_per_day)
+
+    engine = LocalSQLEngine()
+    engine.load_metering_history(metering)
+    if queries is not None:
+        engine.load_query_history(queries)
+
+    with open(USAGE_QUERIES_PATH) as f:
+        keyed_sql = numbered_sql_statements(f.read())[2]
+
+    report = engine.query(JOIN_ROWS_SQL).iloc[0].fillna(0).astype(int).to_dict()
+    report["keyed_join_rows"] = report["keyed_metering_pool_days"]
+    report["join_row_reduction"] = round(
+        report["legacy_join_rows"] / max(report["keyed_metering_pool_days"] + report["keyed_query_pool_days"], 1), 1
+    )
+
+    keyed, report["keyed_sql_secs"] = _timed(lambda: engine.query(keyed_sql))
+    idle, report["python_secs"] = _timed(
+        lambda: detect_idle_pools(metering, queries, now=engine.reference_time)
+    )
+    if args.run_legacy:
+        _, report["legacy_sql_secs"] = _timed(lambda: engine.query(LEGACY_IDLE_POOLS_SQL))
+    engine.close()
+
+    keyed_days = set(zip(keyed["pool_name"], pd.to_datetime(keyed["activity_date"])))
+    report["idle_pool_days"] = len(keyed_days)
+    report["python_matches_sql"] = keyed_days == set(zip(idle["pool_name"], idle["activity_date"]))
+
+    print(json.dumps(
+        {k: round(v, 3) if isinstance(v, float) else v for k, v in report.items()}, indent=2, default=int
+    ))
+    return 0 if report["python_matches_sql"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Command-line calibration of the recommender from observed migrations.
+
+Reads one row per migrated warehouse, pairing its pre-migration profile with
+the compute pool usage observed afterwards, refits the workload multipliers
+and nodes-per-user heuristic, and writes the next version of
+``data/recommender_params.json``. Runs without Streamlit or Plotly.
+
+Usage:
+    python app/calibrate_recommender.py migrations.csv
+    python app/calibrate_recommender.py migrations.csv --dry-run
+
+Sample columns:
+    warehouse_size, workload_type, concurrent_users, observed_memory_gb,
+    observed_avg_nodes, observed_peak_nodes (required)
+    observed_vcpu (optional)
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.calibration import MIN_CALIBRATION_SAMPLES, calibrate_recommender, write_recommender_params
+from models.catalog import RECOMMENDER_PARAMS_PATH
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Calibrate workload multipliers and node sizing from migration history."
+    )
+    parser.add_argument("samples", help="Pre/post migration samples (.csv)")
+    parser.add_argument("--params", default=RECOMMENDER_PARAMS_PATH,
+                        help="Parameter file to update (default: app/data/recommender_params.json)")
+    parser.add_argument("--min-samples", type=int, default=MIN_CALIBRATION_SAMPLES,
+                        help=f"Samples needed to refit a workload type (default: {MIN_CALIBRATION_SAMPLES})")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the fitted parameters without writing them")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    params = calibrate_recommender(pd.read_csv(args.samples), args.min_samples)
+    if not args.dry_run:
+        params = write_recommender_params(params, args.params)
+    print(json.dumps(params, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Command-line workload classifier for QUERY_HISTORY exports.
+
+Streams an exported ACCOUNT_USAGE.QUERY_HISTORY file and writes one row per
+warehouse with its query features, workload type and calibrated workload
+multiplier. Join the output onto a fleet inventory (by warehouse_name) to
+plan migrations without hand-picked workload types. Runs without Streamlit
+or Plotly.
+
+Usage:
+    python app/classify_workloads.py query_history.csv -o workloads.csv
+    python app/classify_workloads.py query_history.parquet -o workloads.csv
+    python app/classify_workloads.py query_history.csv --python-udf score_model
+
+Python work is detected from QUERY_TEXT: Python UDF/procedure DDL and
+Snowpark temporary objects only. Calls to existing Python UDFs/UDTFs read as
+SQL unless their names are passed with --python-udf.
+
+Export columns (case-insensitive):
+    warehouse_name, query_type (required)
+    bytes_scanned, bytes_spilled_to_local_storage,
+    bytes_spilled_to_remote_storage, total_elapsed_time, query_text (optional)
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.exports import DEFAULT_EXPORT_CHUNK_SIZE
+from models.workload_classifier import (
+    DEFAULT_PYTHON_PATTERN,
+    classify_query_history,
+    python_pattern_with_udfs
+)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Classify warehouse workloads from a QUERY_HISTORY export."
+    )
+    parser.add_argument("query_history", help="QUERY_HISTORY export (.csv, .jsonl or .parquet)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="Output CSV file; defaults to stdout")
+    parser.add_argument("--python-pattern", default=DEFAULT_PYTHON_PATTERN,
+                        help="Regular expression marking Python queries in QUERY_TEXT "
+                             "(default matches Python DDL and Snowpark temp objects only)")
+    parser.add_argument("--python-udf", action="append", default=[], metavar="NAME",
+                        help="Name of an existing Python UDF/UDTF whose calls count as Python "
+                             "work; repeat for several")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_EXPORT_CHUNK_SIZE,
+                        help=f"Export rows per chunk (default: {DEFAULT_EXPORT_CHUNK_SIZE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    python_pattern = python_pattern_with_udfs(args.python_udf, args.python_pattern)
+    classified = classify_query_history(args.query_history, python_pattern, args.chunk_size)
+    classified.to_csv(sys.stdout if args.output == "-" else args.output, index=False)
+    print(classified["workload_type"].value_counts().to_string(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,7 +15,13 @@ from .charts import (
     create_savings_chart,
     create_resource_comparison,
     create_credit_usage_timeline,
-    create_workload_distribution_pie
+    create_workload_distribution_pie,
+    create_sensitivity_heatmap,
+    create_pareto_frontier_chart,
+    create_cost_distribution_chart,
+    create_break_even_chart,
+    create_suspend_frontier_chart,
+    create_usage_query_chart
 )
 
 from .pdf_export import (
@@ -38,6 +44,12 @@ __all__ = [
     "create_resource_comparison",
     "create_credit_usage_timeline",
     "create_workload_distribution_pie",
+    "create_sensitivity_heatmap",
+    "create_pareto_frontier_chart",
+    "create_cost_distribution_chart",
+    "create_break_even_chart",
+    "create_suspend_frontier_chart",
+    "create_usage_query_chart",
     "generate_pdf_html",
     "create_pdf_download_button",
     "format_table_for_pdf",
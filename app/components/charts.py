@@ -2,6 +2,7 @@
 
 import plotly.graph_objects as go
 import plotly.express as px
+import numpy as np
 from typing import Dict, List
 
 
@@ -157,3 +158,285 @@ def create_workload_distribution_pie(workloads: Dict[str, float]) -> go.Figure:
     )
 
     return fig
+
+
+def create_sensitivity_heatmap(grid: Dict, rate_index: int = 0) -> go.Figure:
+    """Create a heatmap of monthly savings over hours per day and node count."""
+    savings = grid["monthly_savings"][:, :, rate_index]
+
+    fig = go.Figure(data=[
+        go.Heatmap(
+            x=grid["avg_node_count"],
+            y=grid["hours_per_day"],
+            z=savings,
+            colorscale=[[0, "#F44336"], [0.5, "#FFFFFF"], [1, "#4CAF50"]],
+            zmid=0,
+            colorbar=dict(title="Savings (USD)"),
+            hovertemplate=(
+                "Nodes: %{x}<br>Hours/day: %{y}<br>"
+                "Savings: $%{z:,.2f}<extra></extra>"
+            )
+        )
+    ])
+
+    fig.update_layout(
+        title=f"Monthly Savings Sensitivity (${grid['credit_rate'][rate_index]:.2f}/credit)",
+        xaxis_title="Average Node Count",
+        yaxis_title="Hours Per Day",
+        height=450,
+        template="plotly_white"
+    )
+
+    return fig
+
+
+def create_pareto_frontier_chart(
+    configs,
+    capacity_column: str = "total_memory_gb",
+    capacity_label: str = "Total Memory (GB)",
+    highlight: Dict = None
+) -> go.Figure:
+    """Create a cost vs capacity scatter with the Pareto-optimal configurations highlighted."""
+    dominated = configs[~configs["pareto_optimal"]]
+    frontier = configs[configs["pareto_optimal"]].sort_values("monthly_cost")
+
+    def hover_text(df):
+        return [
+            f"{family} x {nodes}" for family, nodes in zip(df["instance_family"], df["node_count"])
+        ]
+
+    fig = go.Figure(data=[
+        go.Scatter(
+            name="Dominated",
+            x=dominated[capacity_column],
+            y=dominated["monthly_cost"],
+            mode="markers",
+            marker=dict(color="#B0BEC5", size=6, opacity=0.5),
+            text=hover_text(dominated),
+            hovertemplate="%{text}<br>%{x}<br>$%{y:,.2f}/month<extra></extra>"
+        ),
+        go.Scatter(
+            name="Pareto-optimal",
+            x=frontier[capacity_column],
+            y=frontier["monthly_cost"],
+            mode="markers+lines",
+            line=dict(color="#29B5E8", width=2, shape="hv"),
+            marker=dict(color="#29B5E8", size=9),
+            text=hover_text(frontier),
+            hovertemplate="%{text}<br>%{x}<br>$%{y:,.2f}/month<extra></extra>"
+        )
+    ])
+
+    if highlight:
+        fig.add_trace(go.Scatter(
+            name="Recommended",
+            x=[highlight[capacity_column]],
+            y=[highlight["monthly_cost"]],
+            mode="markers",
+            marker=dict(color="#FFA500", size=16, symbol="star"),
+            text=[f"{highlight['instance_family']} x {highlight['node_count']}"],
+            hovertemplate="%{text}<br>%{x}<br>$%{y:,.2f}/month<extra></extra>"
+        ))
+
+    fig.update_layout(
+        title="Cost vs Capacity Frontier",
+        xaxis_title=capacity_label,
+        yaxis_title="Monthly Cost (USD)",
+        height=450,
+        template="plotly_white",
+        hovermode="closest"
+    )
+
+    return fig
+
+
+def create_cost_distribution_chart(samples: Dict, bins: int = 60) -> go.Figure:
+    """
+    Create overlaid histograms of simulated warehouse and compute pool monthly costs.
+
+    Samples are binned here on shared edges so the figure carries ``bins``
+    bars per series rather than every raw draw.
+    """
+    series = (
+        ("warehouse_monthly_cost", "Warehouse", "#29B5E8"),
+        ("compute_pool_monthly_cost", "Compute Pool", "#4CAF50"),
+    )
+    edges = np.histogram_bin_edges(
+        np.concatenate([np.asarray(samples[key], dtype=float) for key, _, _ in series]),
+        bins=bins
+    )
+    centers = (edges[:-1] + edges[1:]) / 2
+    widths = np.diff(edges)
+
+    fig = go.Figure()
+
+    for key, name, color in series:
+        values = np.asarray(samples[key], dtype=float)
+        counts, _ = np.histogram(values, bins=edges)
+        fig.add_trace(go.Bar(
+            x=centers,
+            y=counts / max(len(values), 1),
+            width=widths,
+            name=name,
+            marker_color=color,
+            opacity=0.65,
+            hovertemplate="Cost: $%{x:,.0f}<br>Share: %{y:.1%}<extra></extra>"
+        ))
+
+    fig.update_layout(
+        title="Monthly Cost Distribution",
+        xaxis_title="Monthly Cost (USD)",
+        yaxis_title="Share of Scenarios",
+        barmode="overlay",
+        bargap=0,
+        height=400,
+        template="plotly_white"
+    )
+
+    return fig
+
+
+def create_break_even_chart(
+    x: List[float],
+    savings: List[float],
+    break_even: float,
+    current: float,
+    x_title: str
+) -> go.Figure:
+    """Create a line chart of monthly savings with the break-even point marked."""
+    fig = go.Figure(data=[
+        go.Scatter(
+            x=x,
+            y=savings,
+            mode="lines",
+            name="Monthly Savings",
+            line=dict(color="#29B5E8", width=3),
+            hovertemplate=f"{x_title}: %{{x}}<br>Savings: $%{{y:,.2f}}<extra></extra>"
+        )
+    ])
+
+    fig.add_hline(y=0, line_color="#999999", line_width=1)
+    if np.isfinite(break_even) and min(x) <= break_even <= max(x):
+        fig.add_vline(
+            x=break_even,
+            line_dash="dash",
+            line_color="#F44336",
+            annotation_text=f"Break-even: {break_even:,.2f}",
+            annotation_position="top"
+        )
+    fig.add_vline(
+        x=current,
+        line_dash="dot",
+        line_color="#4CAF50",
+        annotation_text="Current",
+        annotation_position="bottom right"
+    )
+
+    fig.update_layout(
+        title=f"Monthly Savings vs {x_title}",
+        xaxis_title=x_title,
+        yaxis_title="Savings (USD)",
+        height=350,
+        template="plotly_white"
+    )
+
+    return fig
+
+
+def create_suspend_frontier_chart(
+    frontier: Dict,
+    highlight_secs: List[float] = (300, 600, 900, 1800, 3600)
+) -> go.Figure:
+    """Create a chart of idle cost vs cold starts per day across auto-suspend timeouts."""
+    minutes = np.asarray(frontier["auto_suspend_secs"]) / 60
+
+    fig = go.Figure(data=[
+        go.Scatter(
+            x=frontier["cold_starts_per_day"],
+            y=frontier["idle_cost_per_day"],
+            mode="lines",
+            name="Auto-suspend timeouts",
+            line=dict(color="#29B5E8", width=3),
+            customdata=minutes,
+            hovertemplate=(
+                "Timeout: %{customdata:.0f} min<br>Cold starts/day: %{x:.1f}<br>"
+                "Idle cost/day: $%{y:,.2f}<extra></extra>"
+            )
+        )
+    ])
+
+    marked = np.isin(frontier["auto_suspend_secs"], highlight_secs)
+    fig.add_trace(go.Scatter(
+        x=np.asarray(frontier["cold_starts_per_day"])[marked],
+        y=np.asarray(frontier["idle_cost_per_day"])[marked],
+        mode="markers+text",
+        name="Common settings",
+        marker=dict(color="#FF6B6B", size=10),
+        text=[f"{m:.0f} min" for m in minutes[marked]],
+        textposition="top right",
+        hoverinfo="skip"
+    ))
+
+    fig.update_layout(
+        title="Idle Cost vs Cold Starts by Auto-Suspend Timeout",
+        xaxis_title="Expected Cold Starts Per Day",
+        yaxis_title="Idle Cost Per Day (USD)",
+        height=450,
+        template="plotly_white"
+    )
+
+    return fig
+
+
+def create_usage_query_chart(
+    df,
+    x: str,
+    y: str,
+    title: str,
+    y_title: str = "Credits",
+    color: str = None,
+    kind: str = "line"
+) -> go.Figure:
+    """Create a line or bar chart of a monitoring query result, one trace per ``color`` value."""
+    if df is None or len(df) == 0:
+        fig = go.Figure()
+        fig.add_annotation(
+            text="No data available",
+            xref="paper",
+            yref="paper",
+            x=0.5,
+            y=0.5,
+            showarrow=False
+        )
+        return fig
+
+    df = df.sort_values(x)
+    groups = df.groupby(color, sort=True) if color else [(None, df)]
+    palette = ["#29B5E8", "#11567F", "#4CAF50", "#FF9800", "#F44336", "#9C27B0"]
+
+    fig = go.Figure()
+    for i, (name, group) in enumerate(groups):
+        trace_color = palette[i % len(palette)]
+        if kind == "bar":
+            fig.add_trace(go.Bar(x=group[x], y=group[y], name=str(name or y), marker_color=trace_color))
+        else:
+            fig.add_trace(go.Scatter(
+                x=group[x],
+                y=group[y],
+                mode="lines+markers",
+                name=str(name or y),
+                line=dict(color=trace_color, width=2),
+                marker=dict(size=5)
+            ))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title=x.replace("_", " ").title(),
+        yaxis_title=y_title,
+        height=400,
+        template="plotly_white",
+        hovermode="x unified",
+        showlegend=color is not None
+    )
+
+    return fig
@@ -20,23 +20,52 @@ ORDER BY
 
 
 -- Query 2: Detect idle compute pools (low activity)
-WITH pool_activity AS (
+-- QUERY_HISTORY has no compute pool column, so queries are attributed to a pool
+-- by QUERY_TAG: tag notebook sessions with their pool name, e.g.
+--   ALTER SESSION SET QUERY_TAG = '<YOUR_COMPUTE_POOL_NAME>';
+-- Both views are aggregated per pool and day before the join, so the join
+-- touches one row per pool-day on each side. The window starts at midnight so
+-- the oldest day is not reported idle for being only partly covered.
+WITH pool_daily AS (
     SELECT
-        mh.name AS pool_name,
-        DATE(mh.start_time) AS activity_date,
-        SUM(mh.credits_used) AS daily_credits,
-        COUNT(DISTINCT qh.query_id) AS query_count
+        name AS pool_name,
+        DATE(start_time) AS activity_date,
+        SUM(credits_used) AS daily_credits
     FROM
-        SNOWFLAKE.ACCOUNT_USAGE.METERING_HISTORY mh
-        LEFT JOIN SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY qh
-            ON DATE(mh.start_time) = DATE(qh.start_time)
-            AND qh.execution_status = 'SUCCESS'
+        SNOWFLAKE.ACCOUNT_USAGE.METERING_HISTORY
+    WHERE
+        service_type = 'COMPUTE_POOL'
+        AND start_time >= DATE_TRUNC('day', DATEADD(day, -30, CURRENT_TIMESTAMP()))
+    GROUP BY
+        name,
+        DATE(start_time)
+),
+query_daily AS (
+    SELECT
+        query_tag AS pool_name,
+        DATE(start_time) AS activity_date,
+        COUNT(DISTINCT query_id) AS query_count
+    FROM
+        SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY
     WHERE
-        mh.service_type = 'COMPUTE_POOL'
-        AND mh.start_time >= DATEADD(day, -30, CURRENT_TIMESTAMP())
+        execution_status = 'SUCCESS'
+        AND start_time >= DATE_TRUNC('day', DATEADD(day, -30, CURRENT_TIMESTAMP()))
+        AND query_tag IS NOT NULL
     GROUP BY
-        mh.name,
-        DATE(mh.start_time)
+        query_tag,
+        DATE(start_time)
+),
+pool_activity AS (
+    SELECT
+        p.pool_name,
+        p.activity_date,
+        p.daily_credits,
+        COALESCE(q.query_count, 0) AS query_count
+    FROM
+        pool_daily p
+        LEFT JOIN query_daily q
+            ON q.pool_name = p.pool_name
+            AND q.activity_date = p.activity_date
 )
 SELECT
     pool_name,
@@ -0,0 +1,83 @@
+"""Command-line incremental ingestion of ACCOUNT_USAGE exports.
+
+Merges an exported METERING_HISTORY or QUERY_HISTORY file into the local
+columnar usage store. Exports may overlap earlier ones: rows behind the
+store's start_time high-water mark (minus the late-arrival window) are
+skipped, and rows already stored are dropped by primary key. For
+METERING_HISTORY the daily credit rollup is then refreshed for the changed
+partitions only. Prints the append summary as JSON. Requires pyarrow; runs
+without Streamlit or Plotly.
+
+Usage:
+    python app/ingest_usage.py metering_history.csv
+    python app/ingest_usage.py query_history.parquet --source query_history
+    python app/ingest_usage.py metering_history.csv --cache-dir ./usage --rebuild
+
+Export columns (case-insensitive):
+    metering_history: service_type, name, start_time, credits_used (required)
+    query_history: query_id, start_time (required)
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.exports import DEFAULT_EXPORT_CHUNK_SIZE
+from models.usage_cache import (
+    CACHE_SOURCES,
+    DEFAULT_LATE_WINDOW,
+    DEFAULT_USAGE_CACHE_DIR,
+    append_usage_cache,
+    build_usage_cache,
+    refresh_daily_rollup
+)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Merge an ACCOUNT_USAGE export into the local usage store."
+    )
+    parser.add_argument("export", help="Export file (.csv, .jsonl or .parquet)")
+    parser.add_argument("--source", choices=sorted(CACHE_SOURCES), default="metering_history",
+                        help="View the export comes from (default: metering_history)")
+    parser.add_argument("--cache-dir", default=DEFAULT_USAGE_CACHE_DIR,
+                        help=f"Usage store directory (default: {DEFAULT_USAGE_CACHE_DIR})")
+    parser.add_argument("--late-window-hours", type=float,
+                        default=DEFAULT_LATE_WINDOW.total_seconds() / 3600,
+                        help="Hours behind the high-water mark rows are still merged "
+                             f"(default: {DEFAULT_LATE_WINDOW.total_seconds() / 3600:g})")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Replace the stored view instead of merging into it")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_EXPORT_CHUNK_SIZE,
+                        help=f"Export rows per chunk (default: {DEFAULT_EXPORT_CHUNK_SIZE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.rebuild:
+        manifest = build_usage_cache(args.export, args.cache_dir, args.source, args.chunk_size)
+        summary = manifest["appends"][-1]
+    else:
+        summary = append_usage_cache(
+            args.export,
+            args.cache_dir,
+            args.source,
+            args.chunk_size,
+            late_window=timedelta(hours=args.late_window_hours)
+        )
+
+    if args.source == "metering_history":
+        rollup = refresh_daily_rollup(args.cache_dir)
+        summary["rollup_recomputed_partitions"] = len(rollup["recomputed_partitions"])
+
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
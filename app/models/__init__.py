@@ -2,29 +2,249 @@
 
 from .warehouse_mapping import (
     recommend_compute_pool,
+    rank_compute_pools,
     get_warehouse_by_code,
     get_migration_sql,
+    concurrency_node_range,
+    workload_multipliers,
+    node_heuristic
+)
+
+from .catalog import (
+    SpecCatalog,
+    get_catalog,
+    reload_catalog,
     load_warehouse_specs,
     load_compute_pool_specs
 )
 
+from .records import (
+    WarehouseSpec,
+    ComputePoolSpec,
+    GpuDetails,
+    PoolRecommendation
+)
+
+from .batch import (
+    recommend_compute_pool_batch,
+    rank_compute_pools_batch
+)
+
 from .cost_calculator import (
     calculate_monthly_cost,
     calculate_warehouse_cost,
     calculate_compute_pool_cost,
     compare_costs,
-    estimate_annual_savings
+    estimate_annual_savings,
+    estimate_resume_latency,
+    calculate_suspend_frontier
+)
+
+from .cost_engine import (
+    compare_costs_vectorized,
+    compare_costs_batch,
+    cost_sensitivity_grid,
+    sensitivity_grid_to_frame,
+    break_even_vectorized,
+    break_even_batch
+)
+
+from .lookup_table import (
+    RecommendationTable,
+    get_recommendation_table
+)
+
+from .memo import (
+    cached_recommend_compute_pool,
+    cached_compare_costs,
+    configure_cache,
+    clear_cache,
+    cache_info
+)
+
+from .monte_carlo import (
+    sample_distribution,
+    triangular_spec,
+    monte_carlo_compare_costs
+)
+
+from .autoscaling import (
+    generate_sessions,
+    sessions_from_trace,
+    simulate_autoscaling,
+    simulate_recommendation
+)
+
+from .auto_suspend import (
+    idle_gaps,
+    suspend_sweep,
+    recommend_auto_suspend
+)
+
+from .concurrency import (
+    ConcurrencyIndex,
+    concurrency_from_chunks,
+    concurrency_from_file
+)
+
+from .workload_classifier import (
+    python_pattern_with_udfs,
+    classify_workloads,
+    classify_query_history_chunks,
+    classify_query_history
+)
+
+from .calibration import (
+    fit_workload_multipliers,
+    fit_node_heuristic,
+    calibrate_recommender,
+    write_recommender_params
+)
+
+from .consolidation import (
+    hourly_profiles,
+    first_fit_decreasing,
+    plan_consolidation
+)
+
+from .pool_mix import (
+    cohort_cost_matrix,
+    prune_families,
+    optimize_pool_mix
+)
+from .sql_engine import (
+    LocalSQLEngine,
+    translate_sql,
+    split_sql_statements,
+    numbered_sql_statements,
+    fill_placeholders
+)
+from .usage_cache import (
+    build_usage_cache,
+    append_usage_cache,
+    evict_upload_caches,
+    changed_partitions,
+    refresh_daily_rollup,
+    load_cache_manifest,
+    open_usage_cache,
+    read_usage_table,
+    read_usage_cache,
+    cached_names,
+    daily_credit_usage
+)
+from .idle_pools import (
+    pool_daily_credits,
+    pool_daily_queries,
+    detect_idle_pools
+)
+from .queueing import (
+    size_nodes_for_wait,
+    size_nodes_for_wait_batch,
+    size_fleet_for_wait
+)
+
+from .pool_search import (
+    search_pool_configurations,
+    cheapest_configurations
+)
+
+from .pareto import (
+    enumerate_pool_configurations,
+    pareto_optimal_mask,
+    explore_pareto_frontier
 )
 
 __all__ = [
     "recommend_compute_pool",
+    "rank_compute_pools",
     "get_warehouse_by_code",
     "get_migration_sql",
     "load_warehouse_specs",
     "load_compute_pool_specs",
+    "concurrency_node_range",
+    "workload_multipliers",
+    "node_heuristic",
+    "SpecCatalog",
+    "get_catalog",
+    "reload_catalog",
+    "WarehouseSpec",
+    "ComputePoolSpec",
+    "GpuDetails",
+    "PoolRecommendation",
+    "recommend_compute_pool_batch",
+    "rank_compute_pools_batch",
     "calculate_monthly_cost",
     "calculate_warehouse_cost",
     "calculate_compute_pool_cost",
     "compare_costs",
     "estimate_annual_savings",
+    "estimate_resume_latency",
+    "calculate_suspend_frontier",
+    "compare_costs_vectorized",
+    "compare_costs_batch",
+    "cost_sensitivity_grid",
+    "sensitivity_grid_to_frame",
+    "break_even_vectorized",
+    "break_even_batch",
+    "RecommendationTable",
+    "get_recommendation_table",
+    "cached_recommend_compute_pool",
+    "cached_compare_costs",
+    "configure_cache",
+    "clear_cache",
+    "cache_info",
+    "sample_distribution",
+    "triangular_spec",
+    "monte_carlo_compare_costs",
+    "generate_sessions",
+    "sessions_from_trace",
+    "simulate_autoscaling",
+    "simulate_recommendation",
+    "idle_gaps",
+    "suspend_sweep",
+    "recommend_auto_suspend",
+    "ConcurrencyIndex",
+    "concurrency_from_chunks",
+    "concurrency_from_file",
+    "python_pattern_with_udfs",
+    "classify_workloads",
+    "classify_query_history_chunks",
+    "classify_query_history",
+    "fit_workload_multipliers",
+    "fit_node_heuristic",
+    "calibrate_recommender",
+    "write_recommender_params",
+    "hourly_profiles",
+    "first_fit_decreasing",
+    "plan_consolidation",
+    "cohort_cost_matrix",
+    "prune_families",
+    "optimize_pool_mix",
+    "LocalSQLEngine",
+    "translate_sql",
+    "split_sql_statements",
+    "numbered_sql_statements",
+    "fill_placeholders",
+    "build_usage_cache",
+    "append_usage_cache",
+    "evict_upload_caches",
+    "changed_partitions",
+    "refresh_daily_rollup",
+    "load_cache_manifest",
+    "open_usage_cache",
+    "read_usage_table",
+    "read_usage_cache",
+    "cached_names",
+    "daily_credit_usage",
+    "pool_daily_credits",
+    "pool_daily_queries",
+    "detect_idle_pools",
+    "size_nodes_for_wait",
+    "size_nodes_for_wait_batch",
+    "size_fleet_for_wait",
+    "search_pool_configurations",
+    "cheapest_configurations",
+    "enumerate_pool_configurations",
+    "pareto_optimal_mask",
+    "explore_pareto_frontier",
 ]
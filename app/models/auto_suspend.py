@@ -0,0 +1,226 @@
+"""Data-driven AUTO_SUSPEND_SECS recommendations from activity history.
+
+Every idle gap between activity on a pool costs credits while the pool stays
+up. Suspending after ``T`` seconds caps that burn at ``T`` per gap, but each
+gap longer than ``T`` then ends with a resume: nodes bill while they start,
+and the user who triggered the resume waits. The analyzer builds each pool's
+idle-gap distribution and evaluates every candidate timeout at once with
+sorted gaps and prefix sums.
+"""
+
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .autoscaling import DEFAULT_NODE_START_SECS
+from .warehouse_mapping import DEFAULT_AUTO_SUSPEND_MINUTES
+
+# Candidate timeouts: every minute up to 4 hours
+DEFAULT_CANDIDATE_SECS = np.arange(60, 4 * 3600 + 1, 60)
+
+# Value of a user's time while waiting for a pool to resume, in dollars per hour
+DEFAULT_WAIT_COST_PER_HOUR = 50.0
+
+SUSPEND_RECOMMENDATION_COLUMNS = [
+    "pool",
+    "events",
+    "idle_gaps",
+    "median_gap_secs",
+    "p90_gap_secs",
+    "recommended_auto_suspend_secs",
+    "idle_credits",
+    "resumes",
+    "total_cost",
+    "current_auto_suspend_secs",
+    "current_total_cost",
+    "savings",
+]
+
+
+def _epoch_seconds(values: pd.Series) -> np.ndarray:
+    """Timestamps as float seconds since the epoch."""
+    return pd.to_datetime(values).to_numpy("datetime64[ns]").astype(np.int64) / 1e9
+
+
+def idle_gaps(
+    events: pd.DataFrame,
+    pool_column: str = "pool_name",
+    start_column: str = "start_time",
+    end_column: Optional[str] = None
+) -> Tuple[pd.Index, np.ndarray, np.ndarray]:
+    """
+    Idle gaps between activity on each pool.
+
+    Activity may overlap (several sessions or queries at once); a gap starts
+    when all earlier activity on the pool has ended. Without an end column,
+    events are instants. Rows without a pool or start time (e.g. queries
+    that never ran on a warehouse) are ignored.
+
+    Args:
+        events: One row per query, session or event
+        pool_column: Column identifying the pool (or warehouse)
+        start_column: Column with activity start timestamps
+        end_column: Optional column with activity end timestamps
+
+    Returns:
+        Tuple of (pool labels, pool code per gap, gap lengths in seconds)
+    """
+    columns = [pool_column, start_column] + ([end_column] if end_column else [])
+    missing = [c for c in columns if c not in events.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    events = events.dropna(subset=[pool_column, start_column])
+    codes, pools = pd.factorize(events[pool_column], sort=True)
+    start = _epoch_seconds(events[start_column])
+    end = np.maximum(_epoch_seconds(events[end_column]), start) if end_column else start
+
+    order = np.lexsort((start, codes))
+    codes, start, end = codes[order], start[order], end[order]
+    if len(codes) == 0:
+        return pools, codes, np.empty(0)
+
+    # Offset each pool onto its own stretch of the time axis so one running
+    # maximum gives the latest end time seen so far within every pool
+    origin = min(start.min(), end.min())
+    offset = codes * (end.max() - origin + 1.0)
+    latest_end = np.maximum.accumulate(end - origin + offset)
+
+    gap = (start[1:] - origin + offset[1:]) - latest_end[:-1]
+    keep = (codes[1:] == codes[:-1]) & (gap > 0)
+    return pools, codes[1:][keep], gap[keep]
+
+
+def suspend_sweep(
+    gap_codes: np.ndarray,
+    gaps: np.ndarray,
+    n_pools: int,
+    candidate_secs: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Idle seconds and suspends for every (pool, candidate timeout).
+
+    A gap no longer than the timeout is billed in full; a longer gap bills
+    the timeout and ends with one resume. Gaps are sorted once per pool and
+    every candidate is answered with a binary search and a prefix sum.
+
+    Args:
+        gap_codes: Pool code of each gap
+        gaps: Gap lengths in seconds
+        n_pools: Number of pools
+        candidate_secs: Candidate timeouts in seconds
+
+    Returns:
+        Tuple of (idle_secs, suspends) arrays of shape (pools, candidates)
+    """
+    candidates = np.asarray(candidate_secs, dtype=float)
+    span = max(float(gaps.max()) if len(gaps) else 0.0, float(candidates.max())) + 1.0
+
+    order = np.lexsort((gaps, gap_codes))
+    sorted_gaps = gaps[order]
+    keys = gap_codes[order] * span + sorted_gaps
+    prefix = np.concatenate(([0.0], np.cumsum(sorted_gaps)))
+
+    bounds = np.searchsorted(gap_codes[order], np.arange(n_pools + 1), side="left")
+    first, last = bounds[:-1, None], bounds[1:, None]
+
+    pos = np.searchsorted(keys, np.arange(n_pools)[:, None] * span + candidates[None, :], side="right")
+    suspends = last - pos
+    idle = (prefix[pos] - prefix[first]) + candidates[None, :] * suspends
+    return idle, suspends
+
+
+def recommend_auto_suspend(
+    events: pd.DataFrame,
+    pool_column: str = "pool_name",
+    start_column: str = "start_time",
+    end_column: Optional[str] = None,
+    credits_per_hour: Union[float, Dict[str, float], pd.Series] = 1.0,
+    credit_rate: float = 4.0,
+    resume_latency_secs: float = DEFAULT_NODE_START_SECS,
+    wait_cost_per_hour: float = DEFAULT_WAIT_COST_PER_HOUR,
+    candidate_secs: Optional[np.ndarray] = None,
+    current_auto_suspend_secs: float = DEFAULT_AUTO_SUSPEND_MINUTES * 60
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Pick the AUTO_SUSPEND_SECS that minimizes idle burn plus resume cost per pool.
+
+    Cost of a timeout = (idle credits + credits billed while resuming) x
+    credit rate + resumes x resume latency x ``wait_cost_per_hour``.
+
+    Args:
+        events: Activity history, e.g. an exported QUERY_HISTORY
+        pool_column: Column identifying the pool (or warehouse)
+        start_column: Column with activity start timestamps
+        end_column: Optional column with activity end timestamps
+        credits_per_hour: Credits per hour the pool burns while idle
+            (MIN_NODES x instance family rate), as a scalar or per pool
+        credit_rate: Cost per credit
+        resume_latency_secs: Time for a suspended pool to resume
+        wait_cost_per_hour: Dollar value of a user's waiting time per hour
+        candidate_secs: Candidate timeouts; defaults to every minute up to 4 hours
+        current_auto_suspend_secs: Timeout to compare the recommendation against
+
+    Returns:
+        Tuple of (recommendations, cost_curve): one row per pool with
+        ``SUSPEND_RECOMMENDATION_COLUMNS``, and a long-format curve with the cost of
+        every candidate timeout for every pool
+    """
+    candidates = np.unique(np.asarray(
+        DEFAULT_CANDIDATE_SECS if candidate_secs is None else candidate_secs, dtype=float
+    ))
+    pools, gap_codes, gaps = idle_gaps(events, pool_column, start_column, end_column)
+
+    evaluated = np.append(candidates, float(current_auto_suspend_secs))
+    idle, suspends = suspend_sweep(gap_codes, gaps, len(pools), evaluated)
+
+    if isinstance(credits_per_hour, (dict, pd.Series)):
+        rate = pd.Series(credits_per_hour).reindex(pools).to_numpy(dtype=float)
+        if np.any(np.isnan(rate)):
+            unknown = sorted(map(str, pools[np.isnan(rate)]))
+            raise ValueError(f"No credits_per_hour for pool: {', '.join(unknown)}")
+    else:
+        rate = np.full(len(pools), float(credits_per_hour))
+
+    idle_credits = idle / 3600 * rate[:, None]
+    resume_credits = suspends * resume_latency_secs / 3600 * rate[:, None]
+    wait_cost = suspends * resume_latency_secs / 3600 * wait_cost_per_hour
+    total = (idle_credits + resume_credits) * credit_rate + wait_cost
+
+    best = np.argmin(total[:, :-1], axis=1)
+    rows = np.arange(len(pools))
+
+    active = events.dropna(subset=[pool_column, start_column])
+    event_counts = active[pool_column].value_counts().reindex(pools).to_numpy()
+    gap_counts = np.bincount(gap_codes, minlength=len(pools))
+    percentiles = (
+        pd.Series(gaps, dtype=float).groupby(gap_codes).quantile([0.5, 0.9]).unstack()
+        if len(gaps) else pd.DataFrame()
+    )
+    # Pools with no idle gap get NaN percentiles
+    percentiles = percentiles.reindex(index=rows, columns=[0.5, 0.9])
+
+    recommendations = pd.DataFrame({
+        "pool": pools,
+        "events": event_counts,
+        "idle_gaps": gap_counts,
+        "median_gap_secs": percentiles[0.5].to_numpy(),
+        "p90_gap_secs": percentiles[0.9].to_numpy(),
+        "recommended_auto_suspend_secs": candidates[best].astype(np.int64),
+        "idle_credits": idle_credits[rows, best],
+        "resumes": suspends[rows, best],
+        "total_cost": total[rows, best],
+        "current_auto_suspend_secs": int(current_auto_suspend_secs),
+        "current_total_cost": total[:, -1],
+        "savings": total[:, -1] - total[rows, best],
+    }, columns=SUSPEND_RECOMMENDATION_COLUMNS)
+
+    cost_curve = pd.DataFrame({
+        "pool": np.repeat(pools, len(candidates)),
+        "auto_suspend_secs": np.tile(candidates, len(pools)),
+        "idle_credits": idle_credits[:, :-1].ravel(),
+        "resumes": suspends[:, :-1].ravel(),
+        "total_cost": total[:, :-1].ravel(),
+    })
+    return recommendations, cost_curve
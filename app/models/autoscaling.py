@@ -0,0 +1,324 @@
+"""Discrete-event simulation of compute pool autoscaling and billing.
+
+``calculate_compute_pool_cost`` bills the midpoint of the recommended node
+range for every session hour. This module instead replays notebook sessions
+against a pool that starts suspended, auto-resumes on the first session,
+adds nodes up to MAX_NODES when sessions queue, releases idle nodes down to
+MIN_NODES, and suspends after AUTO_SUSPEND_SECS without sessions. Nodes are
+billed per second from the moment they start provisioning until released.
+"""
+
+import heapq
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Heuristic used by recommended_node_range: 2 users per node
+DEFAULT_SESSIONS_PER_NODE = 2
+
+# Approximate time for a node to start (resume or scale-out); measure on your account
+DEFAULT_NODE_START_SECS = 90
+
+# Idle time before a node above MIN_NODES is released
+DEFAULT_SCALE_IN_SECS = 300
+
+# Event kinds, ordered so that at equal times sessions end before new ones arrive
+_END, _NODE_READY, _RELEASE, _SUSPEND, _ARRIVAL = range(5)
+
+
+def generate_sessions(
+    concurrent_users: float,
+    hours_per_day: float = 8.0,
+    days_per_month: int = 22,
+    mean_session_minutes: float = 60.0,
+    day_start_hour: float = 9.0,
+    seed: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draw a month of notebook sessions.
+
+    Arrivals are a Poisson process inside each day's working window and
+    session lengths are exponential. The arrival rate is set so the average
+    number of open sessions during the window is ``concurrent_users``.
+
+    Args:
+        concurrent_users: Average number of sessions open during working hours
+        hours_per_day: Length of the daily working window
+        days_per_month: Working days to simulate
+        mean_session_minutes: Average session length
+        day_start_hour: Hour of day the working window opens
+        seed: Random seed for reproducible draws
+
+    Returns:
+        Tuple of (arrival_secs, duration_secs) arrays, sorted by arrival
+    """
+    rng = np.random.default_rng(seed)
+    window = hours_per_day * 3600
+    mean_duration = mean_session_minutes * 60
+
+    # Little's law: open sessions = arrival rate x mean duration
+    per_day = rng.poisson(concurrent_users * window / mean_duration, size=days_per_month)
+    day = np.repeat(np.arange(days_per_month), per_day)
+
+    arrivals = day * 86400 + day_start_hour * 3600 + rng.uniform(0, window, size=len(day))
+    durations = rng.exponential(mean_duration, size=len(day))
+
+    order = np.argsort(arrivals, kind="stable")
+    return arrivals[order], durations[order]
+
+
+def sessions_from_trace(
+    trace: pd.DataFrame,
+    start_column: str = "start_time",
+    end_column: str = "end_time"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert recorded sessions into simulator input.
+
+    Args:
+        trace: DataFrame with one row per session
+        start_column: Column with session start timestamps
+        end_column: Column with session end timestamps
+
+    Returns:
+        Tuple of (arrival_secs, duration_secs) relative to the first session
+    """
+    missing = [c for c in (start_column, end_column) if c not in trace.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    start = pd.to_datetime(trace[start_column])
+    end = pd.to_datetime(trace[end_column])
+    if len(trace) == 0:
+        return np.empty(0), np.empty(0)
+
+    arrivals = (start - start.min()).dt.total_seconds().to_numpy()
+    durations = np.maximum((end - start).dt.total_seconds().to_numpy(), 0.0)
+
+    order = np.argsort(arrivals, kind="stable")
+    return arrivals[order], durations[order]
+
+
+def simulate_autoscaling(
+    arrival_secs: np.ndarray,
+    duration_secs: np.ndarray,
+    credits_per_node_hour: float,
+    min_nodes: int,
+    max_nodes: int,
+    auto_suspend_secs: float,
+    sessions_per_node: int = DEFAULT_SESSIONS_PER_NODE,
+    node_start_secs: float = DEFAULT_NODE_START_SECS,
+    scale_in_secs: float = DEFAULT_SCALE_IN_SECS,
+    credit_rate: float = 4.0,
+    horizon_secs: Optional[float] = None
+) -> Dict:
+    """
+    Replay sessions against an autoscaling compute pool.
+
+    Sessions take a slot on a running node (filling the busiest node first
+    so extra nodes drain), or wait in FIFO order. Waiting sessions trigger
+    scale-out up to ``max_nodes``; a suspended pool resumes ``min_nodes``.
+    An ``auto_suspend_secs`` of 0 means the pool never suspends: its nodes
+    bill until ``horizon_secs`` (or the last event, if that is later).
+
+    Args:
+        arrival_secs: Session start times in seconds
+        duration_secs: Session lengths in seconds
+        credits_per_node_hour: Instance family credits per node hour
+        min_nodes: Pool MIN_NODES
+        max_nodes: Pool MAX_NODES
+        auto_suspend_secs: Pool AUTO_SUSPEND_SECS
+        sessions_per_node: Concurrent sessions one node can host
+        node_start_secs: Time for a node to become ready after starting
+        scale_in_secs: Idle time before a node above MIN_NODES is released
+        credit_rate: Cost per credit
+        horizon_secs: End of the simulated period, e.g. ``days * 86400``;
+            defaults to the last event
+
+    Returns:
+        Dictionary with billed credits and cost, node hours, session wait
+        statistics and scaling counts
+    """
+    if min_nodes < 1 or max_nodes < min_nodes:
+        raise ValueError("Node range must satisfy 1 <= min_nodes <= max_nodes")
+    if sessions_per_node < 1:
+        raise ValueError("sessions_per_node must be at least 1")
+
+    arrivals = np.asarray(arrival_secs, dtype=float)
+    durations = np.asarray(duration_secs, dtype=float)
+    if arrivals.shape != durations.shape:
+        raise ValueError("arrival_secs and duration_secs must have the same length")
+
+    events = [(t, _ARRIVAL, i, 0) for i, t in enumerate(arrivals.tolist())]
+    heapq.heapify(events)
+    push = heapq.heappush
+    duration_list = durations.tolist()
+
+    # Per-node state, indexed by node id; ids are never reused
+    node_load = []
+    node_ready = []
+    node_started = []
+    node_token = []
+    active = set()
+
+    waiting = deque()
+    wait_secs = np.zeros(len(arrivals))
+    node_seconds = 0.0
+    suspended = True
+    suspend_token = 0
+    pending_slots = 0
+    resumes = 0
+    scale_outs = 0
+    peak_nodes = 0
+    now = 0.0
+
+    def start_nodes(count: int, t: float) -> None:
+        nonlocal pending_slots, peak_nodes
+        for _ in range(count):
+            node = len(node_load)
+            node_load.append(0)
+            node_ready.append(False)
+            node_started.append(t)
+            node_token.append(0)
+            active.add(node)
+            pending_slots += sessions_per_node
+            push(events, (t + node_start_secs, _NODE_READY, node, 0))
+        peak_nodes = max(peak_nodes, len(active))
+
+    def stop_node(node: int, t: float) -> None:
+        nonlocal node_seconds
+        node_seconds += t - node_started[node]
+        active.discard(node)
+
+    def dispatch(t: float) -> None:
+        while waiting:
+            best = -1
+            for node in active:
+                load = node_load[node]
+                if node_ready[node] and load < sessions_per_node and (
+                    best < 0 or load > node_load[best]
+                ):
+                    best = node
+            if best < 0:
+                return
+            session = waiting.popleft()
+            wait_secs[session] = t - arrivals[session]
+            node_load[best] += 1
+            node_token[best] += 1
+            push(events, (t + duration_list[session], _END, best, 0))
+
+    def pool_idle() -> bool:
+        return not waiting and all(node_load[n] == 0 for n in active)
+
+    while events:
+        now, kind, ref, token = heapq.heappop(events)
+
+        if kind == _ARRIVAL:
+            suspend_token += 1
+            waiting.append(ref)
+            if suspended:
+                suspended = False
+                resumes += 1
+                start_nodes(min_nodes, now)
+            dispatch(now)
+            # Scale out when queued sessions exceed the slots already on the way
+            shortfall = len(waiting) - pending_slots
+            if shortfall > 0 and len(active) < max_nodes:
+                extra = min(-(-shortfall // sessions_per_node), max_nodes - len(active))
+                scale_outs += extra
+                start_nodes(extra, now)
+
+        elif kind == _NODE_READY:
+            if ref in active:
+                node_ready[ref] = True
+                pending_slots -= sessions_per_node
+                dispatch(now)
+                if node_load[ref] == 0 and len(active) > min_nodes:
+                    push(events, (now + scale_in_secs, _RELEASE, ref, node_token[ref]))
+
+        elif kind == _END:
+            node_load[ref] -= 1
+            dispatch(now)
+            if node_load[ref] == 0 and len(active) > min_nodes:
+                push(events, (now + scale_in_secs, _RELEASE, ref, node_token[ref]))
+
+        elif kind == _RELEASE:
+            if (ref in active and node_token[ref] == token and node_load[ref] == 0
+                    and len(active) > min_nodes):
+                stop_node(ref, now)
+
+        elif kind == _SUSPEND:
+            if token == suspend_token and not suspended and pool_idle():
+                for node in list(active):
+                    if not node_ready[node]:
+                        pending_slots -= sessions_per_node
+                    stop_node(node, now)
+                suspended = True
+
+        if kind in (_END, _NODE_READY, _RELEASE) and auto_suspend_secs > 0 and pool_idle():
+            suspend_token += 1
+            push(events, (now + auto_suspend_secs, _SUSPEND, 0, suspend_token))
+
+    # A pool that never suspends keeps billing to the end of the simulated period
+    end = max(now, horizon_secs) if horizon_secs is not None else now
+    for node in list(active):
+        stop_node(node, end)
+
+    credits = node_seconds / 3600 * credits_per_node_hour
+    waited = wait_secs > 0
+    return {
+        "billed_credits": credits,
+        "monthly_cost": credits * credit_rate,
+        "node_hours": node_seconds / 3600,
+        "sessions": len(arrivals),
+        "session_hours": float(durations.sum()) / 3600,
+        "mean_wait_secs": float(wait_secs.mean()) if len(arrivals) else 0.0,
+        "p95_wait_secs": float(np.percentile(wait_secs, 95)) if len(arrivals) else 0.0,
+        "max_wait_secs": float(wait_secs.max()) if len(arrivals) else 0.0,
+        "sessions_waited": int(waited.sum()),
+        "resumes": resumes,
+        "scale_outs": scale_outs,
+        "peak_nodes": peak_nodes,
+        "wait_secs": wait_secs,
+    }
+
+
+def simulate_recommendation(
+    recommendation: Dict,
+    concurrent_users: float,
+    hours_per_day: float = 8.0,
+    days_per_month: int = 22,
+    credit_rate: float = 4.0,
+    mean_session_minutes: float = 60.0,
+    seed: Optional[int] = 0
+) -> Dict:
+    """
+    Simulate a month of generated sessions on a recommended compute pool.
+
+    Args:
+        recommendation: Output of ``recommend_compute_pool``
+        concurrent_users: Average number of sessions open during working hours
+        hours_per_day: Length of the daily working window
+        days_per_month: Working days to simulate
+        credit_rate: Cost per credit
+        mean_session_minutes: Average session length
+        seed: Random seed for the session draws
+
+    Returns:
+        ``simulate_autoscaling`` output for the recommended configuration
+    """
+    arrivals, durations = generate_sessions(
+        concurrent_users, hours_per_day, days_per_month, mean_session_minutes, seed=seed
+    )
+    return simulate_autoscaling(
+        arrivals,
+        durations,
+        credits_per_node_hour=recommendation["credits_per_hour"],
+        min_nodes=recommendation["recommended_min_nodes"],
+        max_nodes=recommendation["recommended_max_nodes"],
+        auto_suspend_secs=recommendation["auto_suspend_minutes"] * 60,
+        credit_rate=credit_rate,
+        horizon_secs=days_per_month * 86400
+    )
@@ -0,0 +1,300 @@
+"""Vectorized recommendation over many warehouses at once."""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .catalog import SpecCatalog, get_catalog
+from .records import GpuDetails
+from .warehouse_mapping import (
+    DEFAULT_WORKLOAD_MULTIPLIER,
+    AUTO_SUSPEND_MINUTES,
+    DEFAULT_AUTO_SUSPEND_MINUTES,
+    VCPU_WEIGHT,
+    concurrency_node_range,
+    users_node_range,
+    workload_multipliers
+)
+
+BATCH_INPUT_COLUMNS = ["warehouse_size", "workload_type", "concurrent_users", "gpu_required"]
+
+# Spellings of boolean flags read as true/false (case-insensitive); blank is false
+TRUE_FLAG_VALUES = frozenset({"true", "t", "yes", "y", "1"})
+FALSE_FLAG_VALUES = frozenset({"false", "f", "no", "n", "0", ""})
+
+RECOMMENDATION_COLUMNS = [
+    "instance_family",
+    "instance_type",
+    "memory_gb",
+    "vcpu",
+    "credits_per_hour",
+    "description",
+    "recommended_min_nodes",
+    "recommended_max_nodes",
+    "auto_suspend_minutes",
+    "gpu_details",
+    "workload_multiplier",
+    "original_warehouse",
+]
+
+
+def _object_array(values: List) -> np.ndarray:
+    """Build a 1-D object array without NumPy unpacking nested records."""
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+def _map_workload(workload_types: pd.Series, mapping: Dict, default: float) -> np.ndarray:
+    """Map workload type labels to numbers, using a default for unknown labels."""
+    return workload_types.map(mapping).fillna(default).to_numpy(dtype=float)
+
+
+def parse_flag_column(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Booleans from a flag column such as gpu_required, missing values as False.
+
+    Inventory CSVs often carry flags as text, so strings are parsed
+    (``TRUE_FLAG_VALUES`` / ``FALSE_FLAG_VALUES``) rather than taken as
+    truthy; numbers are true when non-zero.
+
+    Returns:
+        Tuple of (flags, invalid): invalid marks values that are neither
+        spelling, whose flag is False
+    """
+    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+        return values.fillna(0).to_numpy(dtype=float) != 0, np.zeros(len(values), dtype=bool)
+
+    text = values.fillna(False).astype(str).str.strip().str.lower()
+    flags = text.isin(TRUE_FLAG_VALUES).to_numpy()
+    invalid = ~flags & ~text.isin(FALSE_FLAG_VALUES).to_numpy()
+    return flags, invalid
+
+
+def parse_concurrent_users(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Concurrent users as int64, with rows that are missing, non-numeric or below 1 marked.
+
+    Returns:
+        Tuple of (users, invalid); invalid rows hold 1
+    """
+    users = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+    invalid = ~(users >= 1)
+    return np.where(invalid, 1, users).astype(np.int64), invalid
+
+
+def _pool_labels(catalog: SpecCatalog, field: str) -> np.ndarray:
+    """A text field of every instance family as an object array, in catalog order."""
+    return np.array([getattr(p, field) for p in catalog.compute_pools], dtype=object)
+
+
+def score_matrix(
+    target_memory: np.ndarray,
+    target_vcpu: np.ndarray,
+    gpu_required: np.ndarray,
+    catalog: SpecCatalog
+) -> np.ndarray:
+    """
+    Score every (row, instance family) pair.
+
+    Uses the same weighted distance as ``recommend_compute_pool``; families
+    of the wrong type score ``inf``.
+
+    Returns:
+        Array of shape (rows, families) in catalog order
+    """
+    table = catalog.pool_table
+    pool_is_gpu = table["is_gpu"]
+
+    for needs_gpu, label in ((True, "GPU"), (False, "CPU")):
+        if np.any(gpu_required == needs_gpu) and not np.any(pool_is_gpu == needs_gpu):
+            raise ValueError(f"No {label} instance families in compute pool catalog")
+
+    scores = (
+        np.abs(table["memory_gb"][None, :] - target_memory[:, None]) +
+        np.abs(table["vcpu"][None, :] - target_vcpu[:, None]) * VCPU_WEIGHT
+    )
+    scores[pool_is_gpu[None, :] != gpu_required[:, None]] = np.inf
+    return scores
+
+
+def best_match_indices(
+    target_memory: np.ndarray,
+    target_vcpu: np.ndarray,
+    gpu_required: np.ndarray,
+    catalog: SpecCatalog
+) -> np.ndarray:
+    """
+    Pick the closest instance family for each row.
+
+    Returns:
+        Index into ``catalog.compute_pools`` for each row
+    """
+    scores = score_matrix(target_memory, target_vcpu, gpu_required, catalog)
+    # argmin returns the first minimum, matching the scalar loop's tie-breaking
+    return np.argmin(scores, axis=1)
+
+
+def _prepare_batch(warehouses: pd.DataFrame, catalog: SpecCatalog) -> Dict[str, np.ndarray]:
+    """Validate batch inputs and compute per-row targets."""
+    missing = [c for c in BATCH_INPUT_COLUMNS[:3] if c not in warehouses.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    wh_index = pd.Index(catalog.warehouse_codes).get_indexer(warehouses["warehouse_size"])
+    if np.any(wh_index < 0):
+        unknown = sorted(set(warehouses["warehouse_size"][wh_index < 0].astype(str)))
+        raise ValueError(f"Unknown warehouse size: {', '.join(unknown)}")
+
+    wh_table = catalog.warehouse_table
+
+    multiplier = _map_workload(
+        warehouses["workload_type"], workload_multipliers(), DEFAULT_WORKLOAD_MULTIPLIER
+    )
+    # Rows with a calibrated multiplier (e.g. from classify_query_history) use it instead
+    if "workload_multiplier" in warehouses.columns:
+        calibrated = warehouses["workload_multiplier"].to_numpy(dtype=float)
+        multiplier = np.where(np.isnan(calibrated), multiplier, calibrated)
+
+    if "gpu_required" in warehouses.columns:
+        gpu_required, invalid = parse_flag_column(warehouses["gpu_required"])
+        if np.any(invalid):
+            values = sorted(set(warehouses["gpu_required"][invalid].astype(str)))
+            raise ValueError(f"Invalid gpu_required value: {', '.join(values)}")
+    else:
+        gpu_required = np.zeros(len(warehouses), dtype=bool)
+
+    users, invalid = parse_concurrent_users(warehouses["concurrent_users"])
+    if np.any(invalid):
+        values = sorted(set(warehouses["concurrent_users"][invalid].astype(str)))
+        raise ValueError(f"concurrent_users must be a number of at least 1, got: {', '.join(values)}")
+
+    # Heuristic: 2 users per node for interactive workloads, unless calibrated
+    min_nodes, max_nodes = users_node_range(users)
+
+    # Rows with observed concurrency are sized from it instead
+    if "p50_concurrency" in warehouses.columns and "max_concurrency" in warehouses.columns:
+        observed = warehouses["max_concurrency"].notna().to_numpy()
+        if np.any(observed):
+            obs_min, obs_max = concurrency_node_range(
+                warehouses["p50_concurrency"].fillna(0).to_numpy(dtype=float),
+                warehouses["max_concurrency"].fillna(0).to_numpy(dtype=float)
+            )
+            min_nodes = np.where(observed, obs_min, min_nodes)
+            max_nodes = np.where(observed, obs_max, max_nodes)
+
+    return {
+        "wh_index": wh_index,
+        "multiplier": multiplier,
+        "target_memory": wh_table["memory_gb"][wh_index] * multiplier,
+        "target_vcpu": wh_table["vcpu"][wh_index] * multiplier,
+        "gpu_required": gpu_required,
+        "min_nodes": min_nodes,
+        "max_nodes": max_nodes,
+    }
+
+
+def recommend_compute_pool_batch(warehouses: pd.DataFrame) -> pd.DataFrame:
+    """
+    Recommend compute pool configurations for many warehouses at once.
+
+    Args:
+        warehouses: DataFrame with warehouse_size, workload_type and
+            concurrent_users columns, plus optional gpu_required,
+            workload_multiplier and observed p50_concurrency/max_concurrency
+            columns
+
+    Returns:
+        DataFrame with one row per input row (same index) and the same
+        columns as the dictionary returned by ``recommend_compute_pool``
+    """
+    catalog = get_catalog()
+    prepared = _prepare_batch(warehouses, catalog)
+    wh_index = prepared["wh_index"]
+    gpu_required = prepared["gpu_required"]
+
+    best = best_match_indices(
+        prepared["target_memory"], prepared["target_vcpu"], gpu_required, catalog
+    )
+
+    auto_suspend = _map_workload(
+        warehouses["workload_type"], AUTO_SUSPEND_MINUTES, DEFAULT_AUTO_SUSPEND_MINUTES
+    ).astype(np.int64)
+
+    # One shared GpuDetails / WarehouseSpec per catalog entry, referenced by every row
+    table = catalog.pool_table
+    gpu_details = _object_array([GpuDetails.from_pool(p) for p in catalog.compute_pools])[best]
+    gpu_details[~gpu_required] = None
+
+    return pd.DataFrame({
+        "instance_family": _pool_labels(catalog, "family")[best],
+        "instance_type": _pool_labels(catalog, "type")[best],
+        "memory_gb": table["memory_gb"][best],
+        "vcpu": table["vcpu"][best],
+        "credits_per_hour": table["credits_per_hour"][best],
+        "description": _pool_labels(catalog, "description")[best],
+        "recommended_min_nodes": prepared["min_nodes"],
+        "recommended_max_nodes": prepared["max_nodes"],
+        "auto_suspend_minutes": auto_suspend,
+        "gpu_details": gpu_details,
+        "workload_multiplier": prepared["multiplier"],
+        "original_warehouse": _object_array(catalog.warehouses)[wh_index],
+    }, index=warehouses.index, columns=RECOMMENDATION_COLUMNS)
+
+
+def rank_compute_pools_batch(
+    warehouses: pd.DataFrame,
+    top_k: int = 3,
+    hours_per_day: float = 8.0,
+    days_per_month: int = 22,
+    credit_rate: float = 4.0
+) -> pd.DataFrame:
+    """
+    Rank the top-k instance families for many warehouses at once.
+
+    Args:
+        warehouses: Same input columns as ``recommend_compute_pool_batch``
+        top_k: Number of candidates per warehouse
+        hours_per_day: Session hours per day for the cost projection
+        days_per_month: Working days per month for the cost projection
+        credit_rate: Cost per credit for the cost projection
+
+    Returns:
+        Long-format DataFrame with one row per (warehouse, candidate) and the
+        same fields as ``rank_compute_pools``; ``row`` holds the input index
+    """
+    catalog = get_catalog()
+    prepared = _prepare_batch(warehouses, catalog)
+    scores = score_matrix(
+        prepared["target_memory"], prepared["target_vcpu"], prepared["gpu_required"], catalog
+    )
+
+    # Stable sort keeps catalog order on ties, like the scalar ranking
+    k = min(top_k, scores.shape[1])
+    order = np.argsort(scores, axis=1, kind="stable")[:, :k]
+    top_scores = np.take_along_axis(scores, order, axis=1)
+    feasible = np.isfinite(top_scores)
+
+    rows = np.repeat(np.arange(len(warehouses)), k)[feasible.ravel()]
+    ranks = np.tile(np.arange(1, k + 1), len(warehouses))[feasible.ravel()]
+    family = order[feasible]
+
+    table = catalog.pool_table
+    # Use average of min and max recommended nodes, as calculate_compute_pool_cost does
+    avg_nodes = ((prepared["min_nodes"] + prepared["max_nodes"]) // 2)[rows]
+    credits = table["credits_per_hour"][family]
+
+    return pd.DataFrame({
+        "row": warehouses.index.to_numpy()[rows],
+        "rank": ranks,
+        "instance_family": _pool_labels(catalog, "family")[family],
+        "instance_type": _pool_labels(catalog, "type")[family],
+        "memory_gb": table["memory_gb"][family],
+        "vcpu": table["vcpu"][family],
+        "score": top_scores[feasible],
+        "credits_per_hour": credits,
+        "cost_per_node_hour": credits * credit_rate,
+        "avg_node_count": avg_nodes,
+        "projected_monthly_cost": credits * avg_nodes * (hours_per_day * days_per_month) * credit_rate,
+    })
@@ -0,0 +1,211 @@
+"""Calibrate recommender parameters from observed migrations.
+
+Each calibration sample pairs a warehouse's pre-migration profile (size,
+workload type, concurrent users) with what its notebooks actually used on a
+compute pool afterwards. Workload multipliers and the nodes-per-user
+heuristic are refit with closed-form least squares, grouped per workload
+type with ``np.bincount``, and written to the versioned parameter file that
+``SpecCatalog`` loads.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .catalog import RECOMMENDER_PARAMS_PATH, get_catalog, load_recommender_params
+from .warehouse_mapping import VCPU_WEIGHT, node_heuristic, workload_multipliers
+
+CALIBRATION_INPUT_COLUMNS = [
+    "warehouse_size",
+    "workload_type",
+    "concurrent_users",
+    "observed_memory_gb",
+    "observed_avg_nodes",
+    "observed_peak_nodes",
+]
+
+# Workload types with fewer samples keep their current multiplier
+MIN_CALIBRATION_SAMPLES = 3
+
+CALIBRATION_FIT_COLUMNS = [
+    "workload_type",
+    "samples",
+    "previous_multiplier",
+    "multiplier",
+    "rmse_memory_gb",
+    "calibrated",
+]
+
+
+def _weighted_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Least-squares slope through the origin, NaN where there is no data."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), np.nan)
+
+
+def fit_workload_multipliers(
+    samples: pd.DataFrame,
+    min_samples: int = MIN_CALIBRATION_SAMPLES
+) -> pd.DataFrame:
+    """
+    Fit one memory/vCPU multiplier per workload type.
+
+    For each type the multiplier ``m`` minimizes
+    ``sum (m * wh_memory - observed_memory)^2 +
+    VCPU_WEIGHT^2 * sum (m * wh_vcpu - observed_vcpu)^2``, whose solution is
+    a ratio of per-type sums. The vCPU term is used only when an
+    ``observed_vcpu`` column is present.
+
+    Args:
+        samples: DataFrame with ``CALIBRATION_INPUT_COLUMNS``; observed_memory_gb
+            is the per-node memory the migrated notebooks needed
+        min_samples: Samples a workload type needs before its multiplier is refit
+
+    Returns:
+        DataFrame with ``CALIBRATION_FIT_COLUMNS``, one row per workload type;
+        types seen only in the samples with fewer than ``min_samples`` rows
+        have a NaN multiplier
+    """
+    catalog = get_catalog()
+    wh_index = pd.Index(catalog.warehouse_codes).get_indexer(samples["warehouse_size"])
+    if np.any(wh_index < 0):
+        unknown = sorted(set(samples["warehouse_size"][wh_index < 0].astype(str)))
+        raise ValueError(f"Unknown warehouse size: {', '.join(unknown)}")
+
+    current = workload_multipliers()
+    types = pd.Index(sorted(set(current) | set(samples["workload_type"].dropna())))
+    codes = types.get_indexer(samples["workload_type"])
+    n = len(types)
+
+    x_mem = catalog.warehouse_table["memory_gb"][wh_index]
+    y_mem = samples["observed_memory_gb"].to_numpy(dtype=float)
+    numerator = np.bincount(codes, weights=x_mem * y_mem, minlength=n)
+    denominator = np.bincount(codes, weights=x_mem * x_mem, minlength=n)
+
+    if "observed_vcpu" in samples.columns:
+        x_vcpu = catalog.warehouse_table["vcpu"][wh_index] * VCPU_WEIGHT
+        y_vcpu = samples["observed_vcpu"].to_numpy(dtype=float) * VCPU_WEIGHT
+        numerator += np.bincount(codes, weights=x_vcpu * y_vcpu, minlength=n)
+        denominator += np.bincount(codes, weights=x_vcpu * x_vcpu, minlength=n)
+
+    counts = np.bincount(codes, minlength=n)
+    fitted = _weighted_ratio(numerator, denominator)
+    previous = np.array([current.get(t, np.nan) for t in types], dtype=float)
+    calibrated = (counts >= min_samples) & ~np.isnan(fitted)
+    multiplier = np.where(calibrated, np.round(fitted, 3), previous)
+
+    residual = multiplier[codes] * x_mem - y_mem
+    squared = np.bincount(codes, weights=residual ** 2, minlength=n)
+    rmse = np.sqrt(_weighted_ratio(squared, counts.astype(float)))
+
+    return pd.DataFrame({
+        "workload_type": types,
+        "samples": counts,
+        "previous_multiplier": previous,
+        "multiplier": multiplier,
+        "rmse_memory_gb": rmse,
+        "calibrated": calibrated,
+    }, columns=CALIBRATION_FIT_COLUMNS)
+
+
+def fit_node_heuristic(samples: pd.DataFrame) -> Dict[str, float]:
+    """
+    Fit nodes per concurrent user for MIN_NODES and MAX_NODES.
+
+    MIN_NODES tracks the average number of nodes the pool actually ran and
+    MAX_NODES its peak, each as a least-squares slope through the origin
+    against concurrent users.
+
+    Returns:
+        Dictionary with min_nodes_per_user and max_nodes_per_user
+    """
+    users = samples["concurrent_users"].to_numpy(dtype=float)
+    avg_nodes = samples["observed_avg_nodes"].to_numpy(dtype=float)
+    peak_nodes = samples["observed_peak_nodes"].to_numpy(dtype=float)
+
+    users_squared = float(users @ users)
+    if users_squared == 0:
+        return node_heuristic()
+
+    min_per_user = float(users @ avg_nodes) / users_squared
+    max_per_user = max(float(users @ peak_nodes) / users_squared, min_per_user)
+    return {
+        "min_nodes_per_user": round(min_per_user, 3),
+        "max_nodes_per_user": round(max_per_user, 3),
+    }
+
+
+def calibrate_recommender(
+    samples: pd.DataFrame,
+    min_samples: int = MIN_CALIBRATION_SAMPLES
+) -> Dict:
+    """
+    Fit workload multipliers and the node heuristic from migration samples.
+
+    Args:
+        samples: DataFrame with ``CALIBRATION_INPUT_COLUMNS`` and an optional
+            observed_vcpu column, one row per migrated warehouse
+        min_samples: Samples a workload type needs before its multiplier is refit
+
+    Returns:
+        Parameter dictionary ready for ``write_recommender_params``
+    """
+    missing = [c for c in CALIBRATION_INPUT_COLUMNS if c not in samples.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    samples = samples.dropna(subset=CALIBRATION_INPUT_COLUMNS)
+    if samples.empty:
+        raise ValueError("No complete calibration samples")
+
+    fit = fit_workload_multipliers(samples, min_samples)
+    # Types seen only in the samples, with too few rows to fit, have no
+    # multiplier yet; leave them out so lookups fall back to the default
+    fitted = fit[np.isfinite(fit["multiplier"].to_numpy(dtype=float))]
+    return {
+        "workload_multipliers": dict(zip(fitted["workload_type"], fitted["multiplier"].astype(float))),
+        "node_heuristic": fit_node_heuristic(samples),
+        "calibration": {
+            "samples": int(len(samples)),
+            "workload_types": fit.astype(object).where(fit.notna(), None).to_dict(orient="records"),
+        },
+    }
+
+
+def write_recommender_params(params: Dict, path: Optional[str] = None) -> Dict:
+    """
+    Write calibrated parameters as the next version of the parameter file.
+
+    The version is one more than the file's current version and the write is
+    atomic, so a running app never reads a partial file. Call
+    ``reload_catalog()`` to pick it up; the Migration Calculator page does
+    so on every rerun when the file changed.
+
+    Returns:
+        The parameters as written, including version and calibrated_at
+    """
+    path = path or RECOMMENDER_PARAMS_PATH
+    previous = load_recommender_params(path)
+    written = {
+        "version": int(previous.get("version", 0)) + 1,
+        "calibrated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        **{k: v for k, v in params.items() if k not in ("version", "calibrated_at")},
+    }
+
+    # Serialize first: a non-finite value raises before anything is written
+    text = json.dumps(written, indent=2, default=_json_default, allow_nan=False)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text + "\n")
+    os.replace(tmp_path, path)
+    return written
+
+
+def _json_default(value):
+    """Serialize NumPy scalars in calibration diagnostics."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,209 @@
+"""Process-wide, indexed catalog of warehouse and compute pool specs."""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .records import ComputePoolSpec, WarehouseSpec
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+WAREHOUSE_SPECS_PATH = os.path.join(DATA_DIR, "warehouse_specs.json")
+COMPUTE_POOL_SPECS_PATH = os.path.join(DATA_DIR, "compute_pool_specs.json")
+RECOMMENDER_PARAMS_PATH = os.path.join(DATA_DIR, "recommender_params.json")
+
+# Numeric columns of the catalog as NumPy structured arrays, for batch paths
+WAREHOUSE_DTYPE = np.dtype([
+    ("memory_gb", "f8"),
+    ("vcpu", "f8"),
+    ("credits_per_hour", "f8"),
+])
+COMPUTE_POOL_DTYPE = np.dtype([
+    ("memory_gb", "f8"),
+    ("vcpu", "f8"),
+    ("credits_per_hour", "f8"),
+    ("gpu_memory_gb", "f8"),
+    ("gpu_count", "f8"),
+    ("is_gpu", "?"),
+])
+
+
+def load_warehouse_specs(path: str = WAREHOUSE_SPECS_PATH) -> List[Dict]:
+    """Load warehouse specifications from JSON."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    return data["warehouses"]
+
+
+def load_compute_pool_specs(path: str = COMPUTE_POOL_SPECS_PATH) -> List[Dict]:
+    """Load compute pool specifications from JSON."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    return data["instance_families"]
+
+
+def load_recommender_params(path: str = RECOMMENDER_PARAMS_PATH) -> Dict:
+    """Load calibrated recommender parameters from JSON, or {} if the file is missing."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _mtime(path: str) -> float:
+    """Return a file's modification time, or 0 if it is missing."""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+class SpecCatalog:
+    """
+    In-memory catalog built from the JSON spec files.
+
+    The files are parsed once into immutable ``WarehouseSpec`` and
+    ``ComputePoolSpec`` records and indexed so that lookups by warehouse code,
+    instance family or instance type are dictionary hits instead of file reads
+    and linear scans. ``warehouse_table`` and ``pool_table`` hold the numeric
+    columns as structured arrays in catalog order for vectorized code.
+    ``recommender_params`` holds the calibrated workload multipliers and node
+    heuristic, if a parameter file exists. Call ``reload()`` to force a
+    re-read, or ``reload_if_changed()`` to re-read only when a data file's
+    mtime moved. ``version`` increases on every reload so derived caches can
+    detect it.
+    """
+
+    def __init__(
+        self,
+        warehouse_path: str = WAREHOUSE_SPECS_PATH,
+        compute_pool_path: str = COMPUTE_POOL_SPECS_PATH,
+        params_path: str = RECOMMENDER_PARAMS_PATH
+    ):
+        self.warehouse_path = warehouse_path
+        self.compute_pool_path = compute_pool_path
+        self.params_path = params_path
+        self._lock = threading.Lock()
+        self.version = 0
+        self.reload()
+
+    def reload(self) -> None:
+        """Re-read the data files and rebuild every index."""
+        with self._lock:
+            mtimes = self._current_mtimes()
+            warehouses = tuple(
+                WarehouseSpec.from_dict(wh) for wh in load_warehouse_specs(self.warehouse_path)
+            )
+            pools = tuple(
+                ComputePoolSpec.from_dict(p) for p in load_compute_pool_specs(self.compute_pool_path)
+            )
+
+            params = load_recommender_params(self.params_path)
+
+            pools_by_type: Dict[str, List[ComputePoolSpec]] = {}
+            for pool in pools:
+                pools_by_type.setdefault(pool.type, []).append(pool)
+
+            warehouse_table = np.array(
+                [(wh.memory_gb, wh.vcpu, wh.credits_per_hour) for wh in warehouses],
+                dtype=WAREHOUSE_DTYPE
+            )
+            pool_table = np.array(
+                [
+                    (p.memory_gb, p.vcpu, p.credits_per_hour, p.gpu_memory_gb or 0,
+                     p.gpu_count or 0, p.type == "GPU")
+                    for p in pools
+                ],
+                dtype=COMPUTE_POOL_DTYPE
+            )
+
+            # Swap in fully built indexes so readers never see a partial state
+            self._warehouses = warehouses
+            self._warehouses_by_code = {wh.code: wh for wh in warehouses}
+            self._pools = pools
+            self._pools_by_family = {p.family: p for p in pools}
+            self._pools_by_type = pools_by_type
+            self.warehouse_table = warehouse_table
+            self.pool_table = pool_table
+            self.recommender_params = params
+            self._mtimes = mtimes
+            self.version += 1
+
+    def _current_mtimes(self) -> Tuple[float, float, float]:
+        """Modification times of the data files."""
+        return (
+            _mtime(self.warehouse_path),
+            _mtime(self.compute_pool_path),
+            _mtime(self.params_path)
+        )
+
+    def is_stale(self) -> bool:
+        """Whether any data file changed on disk since the last load."""
+        return self._current_mtimes() != self._mtimes
+
+    def reload_if_changed(self) -> bool:
+        """Reload if the data files changed on disk. Returns True if reloaded."""
+        if self.is_stale():
+            self.reload()
+            return True
+        return False
+
+    @property
+    def warehouses(self) -> Tuple[WarehouseSpec, ...]:
+        """All warehouse specs in file order."""
+        return self._warehouses
+
+    @property
+    def compute_pools(self) -> Tuple[ComputePoolSpec, ...]:
+        """All compute pool instance families in file order."""
+        return self._pools
+
+    @property
+    def warehouse_codes(self) -> Tuple[str, ...]:
+        """Warehouse size codes in file order."""
+        return tuple(self._warehouses_by_code)
+
+    def get_warehouse(self, code: str) -> Optional[WarehouseSpec]:
+        """Get a warehouse spec by size code."""
+        return self._warehouses_by_code.get(code)
+
+    def get_pool(self, family: str) -> Optional[ComputePoolSpec]:
+        """Get a compute pool spec by instance family."""
+        return self._pools_by_family.get(family)
+
+    def pools_of_type(self, instance_type: str) -> List[ComputePoolSpec]:
+        """Get all compute pool specs of an instance type (CPU or GPU)."""
+        return self._pools_by_type.get(instance_type, [])
+
+
+_catalog: Optional[SpecCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> SpecCatalog:
+    """Return the shared catalog, loading it on first use."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = SpecCatalog()
+    return _catalog
+
+
+def reload_catalog(only_if_changed: bool = False) -> bool:
+    """
+    Reload the shared catalog from disk.
+
+    Args:
+        only_if_changed: Skip the reload unless a data file's mtime changed
+
+    Returns:
+        True if the catalog was reloaded
+    """
+    catalog = get_catalog()
+    if only_if_changed:
+        return catalog.reload_if_changed()
+    catalog.reload()
+    return True
@@ -0,0 +1,268 @@
+"""Session concurrency from exported session intervals.
+
+Each interval becomes a +1 event at its start and a -1 event at its end.
+Events are reduced per (warehouse, timestamp) as chunks stream in, so memory
+is bounded by the number of distinct event times rather than the number of
+intervals. A single sort and running sum over the reduced events then gives
+every warehouse's concurrency timeline in O(n log n).
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .autoscaling import DEFAULT_SESSIONS_PER_NODE
+from .fleet_planner import read_inventory
+from .warehouse_mapping import concurrency_node_range
+
+DEFAULT_INTERVAL_CHUNK_SIZE = 1_000_000
+
+# Reduced event parts are merged once this many have accumulated
+_COMPACT_EVERY = 8
+
+# Event ticks since the Unix epoch are packed with the warehouse code into one
+# sortable int64 key; 34 bits covers five centuries at one-second resolution
+_TIME_BITS = 34
+
+CONCURRENCY_COLUMNS = [
+    "warehouse_name",
+    "intervals",
+    "busy_hours",
+    "p50_concurrency",
+    "p95_concurrency",
+    "max_concurrency",
+    "recommended_min_nodes",
+    "recommended_max_nodes",
+]
+
+
+def _reduce_events(
+    keys: np.ndarray,
+    deltas: np.ndarray,
+    kind: str = "quicksort"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Sort events by key and sum the deltas of equal keys, dropping zeros."""
+    order = np.argsort(keys, kind=kind)
+    keys, deltas = keys[order], deltas[order]
+    if len(keys) == 0:
+        return keys, deltas
+
+    first = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    keys, deltas = keys[first], np.add.reduceat(deltas, first)
+    nonzero = deltas != 0
+    return keys[nonzero], deltas[nonzero]
+
+
+class ConcurrencyIndex:
+    """
+    Streaming accumulator of session intervals per warehouse.
+
+    Times are quantized to ``resolution_secs`` (starts rounded down, ends
+    rounded up) before events are reduced, which bounds memory for very
+    large exports.
+    """
+
+    def __init__(self, resolution_secs: float = 1.0):
+        if resolution_secs <= 0:
+            raise ValueError("resolution_secs must be positive")
+        self.resolution_secs = resolution_secs
+        self.intervals = 0
+        self._labels: List = []
+        self._codes: Dict = {}
+        self._interval_counts: List[int] = []
+        self._parts: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    def _warehouse_codes(self, warehouses: pd.Series) -> np.ndarray:
+        """Stable integer codes for warehouse labels across chunks; -1 for null labels."""
+        local, uniques = pd.factorize(warehouses)
+        # The extra trailing entry maps factorize's -1 (null label) to -1
+        mapping = np.full(len(uniques) + 1, -1, dtype=np.int64)
+        for i, label in enumerate(uniques):
+            code = self._codes.get(label)
+            if code is None:
+                code = self._codes[label] = len(self._labels)
+                self._labels.append(label)
+                self._interval_counts.append(0)
+            mapping[i] = code
+        return mapping[local]
+
+    def add(self, warehouses: pd.Series, start: pd.Series, end: pd.Series) -> None:
+        """Add one chunk of intervals; intervals without a warehouse, start or end are skipped."""
+        start = pd.to_datetime(start)
+        end = pd.to_datetime(end)
+        start_ticks = np.floor(
+            start.to_numpy("datetime64[ns]").astype(np.int64) / 1e9 / self.resolution_secs
+        ).astype(np.int64)
+        end_ticks = np.ceil(
+            end.to_numpy("datetime64[ns]").astype(np.int64) / 1e9 / self.resolution_secs
+        ).astype(np.int64)
+
+        codes = self._warehouse_codes(pd.Series(warehouses).reset_index(drop=True))
+        valid = (
+            (end_ticks > start_ticks) & (codes >= 0) &
+            np.asarray(pd.notna(start)) & np.asarray(pd.notna(end))
+        )
+        codes = codes[valid]
+        start_ticks, end_ticks = start_ticks[valid], end_ticks[valid]
+        if len(codes) == 0:
+            return
+
+        if start_ticks.min() < 0 or end_ticks.max() >= 1 << _TIME_BITS:
+            raise ValueError("Interval times span too wide a range for the chosen resolution")
+
+        counts = np.bincount(codes, minlength=len(self._labels))
+        for code in np.flatnonzero(counts):
+            self._interval_counts[code] += int(counts[code])
+        self.intervals += len(codes)
+
+        base = codes << _TIME_BITS
+        keys = np.concatenate((base + start_ticks, base + end_ticks))
+        deltas = np.concatenate((np.ones(len(codes), np.int64), -np.ones(len(codes), np.int64)))
+        self._parts.append(_reduce_events(keys, deltas))
+
+        if len(self._parts) >= _COMPACT_EVERY:
+            self._compact()
+
+    def add_frame(
+        self,
+        chunk: pd.DataFrame,
+        warehouse_column: str = "warehouse_name",
+        start_column: str = "start_time",
+        end_column: str = "end_time"
+    ) -> None:
+        """Add one chunk of intervals from a DataFrame."""
+        missing = [c for c in (warehouse_column, start_column, end_column) if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}")
+        self.add(chunk[warehouse_column], chunk[start_column], chunk[end_column])
+
+    def _compact(self) -> None:
+        """Merge all reduced parts into one."""
+        if len(self._parts) > 1:
+            keys = np.concatenate([k for k, _ in self._parts])
+            deltas = np.concatenate([d for _, d in self._parts])
+            # Parts are already sorted runs, which a stable (merge) sort exploits
+            self._parts = [_reduce_events(keys, deltas, kind="stable")]
+
+    def timeline(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Concurrency timeline of every warehouse.
+
+        Returns:
+            Tuple of (warehouse code, time in seconds since epoch, concurrency
+            from that time until the next entry of the same warehouse)
+        """
+        self._compact()
+        if not self._parts:
+            return np.empty(0, np.int64), np.empty(0), np.empty(0, np.int64)
+
+        keys, deltas = self._parts[0]
+        codes = keys >> _TIME_BITS
+        ticks = keys & ((1 << _TIME_BITS) - 1)
+        # Each warehouse's deltas sum to zero, so one running sum resets per warehouse
+        levels = np.cumsum(deltas)
+        return codes, ticks * self.resolution_secs, levels
+
+    def summary(self, sessions_per_node: int = DEFAULT_SESSIONS_PER_NODE) -> pd.DataFrame:
+        """
+        Concurrency statistics and node range per warehouse.
+
+        Percentiles are weighted by time and taken over busy time (at least
+        one open session), so idle nights and weekends do not drag them to 0.
+
+        Returns:
+            DataFrame with ``CONCURRENCY_COLUMNS``, one row per warehouse
+        """
+        codes, times, levels = self.timeline()
+        n = len(self._labels)
+
+        same = codes[1:] == codes[:-1]
+        busy = same & (levels[:-1] > 0)
+        seg_code = codes[:-1][busy]
+        seg_level = levels[:-1][busy]
+        seg_secs = (times[1:] - times[:-1])[busy]
+
+        # Busy seconds at each (warehouse, level): a dense histogram, since
+        # levels are bounded by the peak number of open sessions
+        levels_count = int(seg_level.max()) + 1 if len(seg_level) else 1
+        histogram = np.bincount(
+            seg_code * levels_count + seg_level, weights=seg_secs, minlength=n * levels_count
+        ).reshape(n, levels_count)
+        busy_secs = histogram.sum(axis=1)
+        has_busy = busy_secs > 0
+        peak = np.where(has_busy, levels_count - 1 - np.argmax(histogram[:, ::-1] > 0, axis=1), 0)
+
+        cumulative = np.cumsum(histogram, axis=1)
+
+        def percentile(q: float) -> np.ndarray:
+            # Lowest level whose cumulative busy time reaches q of the total
+            values = np.argmax(cumulative >= (q * busy_secs - 1e-9)[:, None], axis=1)
+            return np.where(has_busy, values, 0)
+
+        p50, p95 = percentile(0.50), percentile(0.95)
+        min_nodes, max_nodes = concurrency_node_range(p50, peak, sessions_per_node)
+
+        return pd.DataFrame({
+            "warehouse_name": self._labels,
+            "intervals": self._interval_counts,
+            "busy_hours": busy_secs / 3600,
+            "p50_concurrency": p50,
+            "p95_concurrency": p95,
+            "max_concurrency": peak,
+            "recommended_min_nodes": min_nodes,
+            "recommended_max_nodes": max_nodes,
+        }, columns=CONCURRENCY_COLUMNS)
+
+
+def concurrency_from_chunks(
+    chunks: Iterable[pd.DataFrame],
+    warehouse_column: str = "warehouse_name",
+    start_column: str = "start_time",
+    end_column: str = "end_time",
+    resolution_secs: float = 1.0,
+    sessions_per_node: int = DEFAULT_SESSIONS_PER_NODE
+) -> pd.DataFrame:
+    """
+    Concurrency statistics per warehouse from a stream of interval chunks.
+
+    Args:
+        chunks: DataFrames with one row per session or query interval
+        warehouse_column: Column identifying the warehouse
+        start_column: Column with interval start timestamps
+        end_column: Column with interval end timestamps
+        resolution_secs: Time resolution of the concurrency timeline
+        sessions_per_node: Concurrent sessions one node can host
+
+    Returns:
+        DataFrame with ``CONCURRENCY_COLUMNS``, one row per warehouse
+    """
+    index = ConcurrencyIndex(resolution_secs)
+    for chunk in chunks:
+        index.add_frame(chunk, warehouse_column, start_column, end_column)
+    return index.summary(sessions_per_node)
+
+
+def concurrency_from_file(
+    path: str,
+    warehouse_column: str = "warehouse_name",
+    start_column: str = "start_time",
+    end_column: str = "end_time",
+    resolution_secs: float = 1.0,
+    sessions_per_node: int = DEFAULT_SESSIONS_PER_NODE,
+    chunk_size: int = DEFAULT_INTERVAL_CHUNK_SIZE
+) -> pd.DataFrame:
+    """
+    Concurrency statistics per warehouse from an exported CSV or JSON Lines file.
+
+    The file is streamed in ``chunk_size`` rows at a time; see
+    ``concurrency_from_chunks`` for the other arguments.
+    """
+    return concurrency_from_chunks(
+        read_inventory(path, chunk_size),
+        warehouse_column,
+        start_column,
+        end_column,
+        resolution_secs,
+        sessions_per_node
+    )
@@ -0,0 +1,295 @@
+"""Consolidate many small compute pools by packing their hourly load profiles.
+
+Pools whose busy hours do not overlap can share nodes. Each pool's hourly
+credits (e.g. Query 1 of ``usage_queries.sql`` exported for every pool) are
+converted to a node-demand profile, and pools of the same instance family
+are packed into shared pools with first-fit decreasing: pools are taken in
+order of decreasing peak demand and placed into the first shared pool whose
+load stays within ``max_nodes`` in every hour. The fit check against all
+open pools is one NumPy comparison per pool.
+
+Billing is modeled per hour at whole-node granularity: a pool active in an
+hour holds ``ceil(demand)`` nodes (at least MIN_NODES), so packing saves the
+partially used nodes and warm MIN_NODES that separate pools each pay for.
+Pools whose own peak demand exceeds ``max_nodes`` cannot be hosted under the
+cap; they are left unconsolidated and flagged rather than packed on clipped
+demand. Pools that end up alone keep their name and get no DDL; merged pools
+get CREATE statements for the shared pool and DROP statements, to run once
+their services have moved, for the pools it replaces.
+"""
+
+import re
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .catalog import get_catalog
+from .warehouse_mapping import DEFAULT_AUTO_SUSPEND_MINUTES, MAX_NODES, get_migration_sql
+
+# Family assumed for pools whose instance family is not given
+DEFAULT_INSTANCE_FAMILY = "CPU_X64_S"
+
+# Tolerance for floating-point node demand when checking capacity
+_CAPACITY_TOLERANCE = 1e-9
+
+ASSIGNMENT_COLUMNS = [
+    "pool_name",
+    "instance_family",
+    "peak_nodes",
+    "active_hours",
+    "consolidated_pool",
+    "exceeds_max_nodes",
+]
+
+CONSOLIDATED_POOL_COLUMNS = [
+    "consolidated_pool",
+    "instance_family",
+    "member_pools",
+    "recommended_min_nodes",
+    "recommended_max_nodes",
+    "auto_suspend_minutes",
+    "baseline_credits",
+    "consolidated_credits",
+    "credit_savings",
+    "retired_pools",
+    "migration_sql",
+    "retire_sql",
+]
+
+
+def hourly_profiles(
+    usage: pd.DataFrame,
+    hour_column: str = "hour",
+    pool_column: str = "pool_name",
+    credits_column: str = "credits_per_hour"
+) -> Tuple[pd.Index, pd.DatetimeIndex, np.ndarray]:
+    """
+    Dense (pools x hours) matrix of credits from long-format hourly usage.
+
+    Hours missing for a pool are zero; the hour axis runs from the first to
+    the last hour in ``usage``.
+
+    Returns:
+        Tuple of (pool labels, hour index, credits matrix)
+    """
+    missing = [c for c in (hour_column, pool_column, credits_column) if c not in usage.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    hours = pd.to_datetime(usage[hour_column]).dt.floor("h")
+    codes, pools = pd.factorize(usage[pool_column], sort=True)
+    if len(usage) == 0:
+        return pools, pd.DatetimeIndex([]), np.zeros((0, 0))
+
+    first = hours.min()
+    offset = ((hours - first) // pd.Timedelta(hours=1)).to_numpy(dtype=np.int64)
+    span = int(offset.max()) + 1
+
+    credits = np.bincount(
+        codes * span + offset,
+        weights=usage[credits_column].fillna(0).to_numpy(dtype=float),
+        minlength=len(pools) * span
+    ).reshape(len(pools), span)
+    return pools, pd.date_range(first, periods=span, freq="h"), credits
+
+
+def first_fit_decreasing(
+    demand: np.ndarray,
+    capacity: float
+) -> np.ndarray:
+    """
+    Pack time-series items into bins with first-fit decreasing.
+
+    Items are taken by decreasing peak (then total) demand and placed into
+    the first open bin whose load stays within ``capacity`` in every period.
+
+    Args:
+        demand: Array of shape (items, periods)
+        capacity: Per-period capacity of a bin
+
+    Returns:
+        Bin index for every item, in input order
+    """
+    items, periods = demand.shape
+    if np.any(demand.max(axis=1, initial=0) > capacity + _CAPACITY_TOLERANCE):
+        raise ValueError("An item's peak demand exceeds the bin capacity")
+
+    order = np.lexsort((-demand.sum(axis=1), -demand.max(axis=1, initial=0)))
+    loads = np.zeros((items, periods))
+    assignment = np.empty(items, dtype=np.int64)
+    open_bins = 0
+
+    for item in order:
+        fits = np.all(loads[:open_bins] + demand[item] <= capacity + _CAPACITY_TOLERANCE, axis=1)
+        target = int(np.argmax(fits)) if fits.any() else open_bins
+        if target == open_bins:
+            open_bins += 1
+        loads[target] += demand[item]
+        assignment[item] = target
+
+    return assignment
+
+
+def _billed_nodes(demand: np.ndarray, min_nodes: int) -> np.ndarray:
+    """Whole nodes billed per hour: ceil(demand), at least ``min_nodes`` while active."""
+    nodes = np.ceil(demand - _CAPACITY_TOLERANCE)
+    return np.where(demand > 0, np.maximum(nodes, min_nodes), 0)
+
+
+def _shared_pool_name(family: str, number: int) -> str:
+    """Name for a consolidated pool."""
+    return f"{re.sub(r'[^A-Z0-9_]', '_', family.upper())}_SHARED_POOL_{number}"
+
+
+def _retire_sql(pool_names) -> str:
+    """DROP statements for pools replaced by a consolidated pool."""
+    return "\n".join(
+        ["-- Run after moving the services of these pools onto the consolidated pool"] +
+        [f"DROP COMPUTE POOL IF EXISTS {name};" for name in pool_names]
+    )
+
+
+def plan_consolidation(
+    usage: pd.DataFrame,
+    pool_families: Optional[Mapping[str, str]] = None,
+    max_nodes: int = MAX_NODES,
+    min_nodes: int = 1,
+    credit_rate: float = 4.0,
+    hour_column: str = "hour",
+    pool_column: str = "pool_name",
+    credits_column: str = "credits_per_hour",
+    default_family: str = DEFAULT_INSTANCE_FAMILY,
+    pool_auto_suspend_minutes: Optional[Mapping[str, float]] = None
+) -> Dict:
+    """
+    Pack pools into fewer shared pools under a per-hour node capacity.
+
+    Args:
+        usage: Hourly credits per pool, e.g. Query 1 of ``usage_queries.sql``
+            exported without the pool name filter; instance_family and
+            auto_suspend_minutes columns, if present, give each pool's
+            family and current auto-suspend
+        pool_families: Instance family per pool, overriding the column
+        max_nodes: MAX_NODES of every consolidated pool
+        min_nodes: MIN_NODES of every pool, before and after consolidation
+        credit_rate: Cost per credit
+        hour_column: Column with the hour timestamp
+        pool_column: Column with the pool name
+        credits_column: Column with credits used in the hour
+        default_family: Instance family of pools with none given
+        pool_auto_suspend_minutes: Current auto-suspend per pool, overriding
+            the column; a consolidated pool takes the smallest value among its
+            members, or ``DEFAULT_AUTO_SUSPEND_MINUTES`` if none is known
+
+    Returns:
+        Dictionary with ``assignments`` (one row per original pool),
+        ``pools`` (one row per consolidated pool, with its DDL), the
+        combined ``migration_sql`` and credit and cost totals. Pools that
+        exceed ``max_nodes`` keep their own name in ``assignments``, are
+        flagged in ``exceeds_max_nodes`` and listed in
+        ``unconsolidated_pools``; they get no DDL and are left out of the
+        baseline and consolidated credits. Pools left alone by packing also
+        get no DDL; ``retire_sql`` drops the pools that were merged
+    """
+    if max_nodes < 1 or min_nodes < 1 or min_nodes > max_nodes:
+        raise ValueError("Node limits must satisfy 1 <= min_nodes <= max_nodes")
+
+    pools, hours, credits = hourly_profiles(usage, hour_column, pool_column, credits_column)
+
+    families = pd.Series(default_family, index=pools, dtype=object)
+    if "instance_family" in usage.columns:
+        given = usage.dropna(subset=["instance_family"]).groupby(pool_column)["instance_family"].first()
+        families.update(given)
+    if pool_families:
+        families.update(pd.Series(pool_families, dtype=object))
+
+    suspend = pd.Series(np.nan, index=pools, dtype=float)
+    if "auto_suspend_minutes" in usage.columns:
+        given = usage.dropna(subset=["auto_suspend_minutes"]).groupby(pool_column)["auto_suspend_minutes"].min()
+        suspend.update(given.astype(float))
+    if pool_auto_suspend_minutes:
+        suspend.update(pd.Series(pool_auto_suspend_minutes, dtype=float))
+    suspend = suspend.to_numpy()
+
+    catalog = get_catalog()
+    unknown = sorted({f for f in families if catalog.get_pool(f) is None})
+    if unknown:
+        raise ValueError(f"Unknown instance family: {', '.join(unknown)}")
+
+    rate = families.map(lambda f: catalog.get_pool(f)["credits_per_hour"]).to_numpy(dtype=float)
+    demand = credits / rate[:, None]
+
+    peak = demand.max(axis=1, initial=0)
+    oversized = peak > max_nodes + _CAPACITY_TOLERANCE
+
+    consolidated = np.empty(len(pools), dtype=object)
+    consolidated[oversized] = pools.to_numpy()[oversized]
+    pool_rows = []
+    for family in sorted(set(families[~oversized])):
+        members = np.flatnonzero((families.to_numpy() == family) & ~oversized)
+        bins = first_fit_decreasing(demand[members], max_nodes)
+        family_rate = catalog.get_pool(family)["credits_per_hour"]
+
+        for number in range(int(bins.max(initial=-1)) + 1):
+            in_bin = members[bins == number]
+            load = demand[in_bin].sum(axis=0)
+            merged = len(in_bin) > 1
+            name = _shared_pool_name(family, number + 1) if merged else pools[in_bin[0]]
+            consolidated[in_bin] = name
+            known_suspend = suspend[in_bin][~np.isnan(suspend[in_bin])]
+            auto_suspend = (
+                int(round(known_suspend.min())) if len(known_suspend) else DEFAULT_AUTO_SUSPEND_MINUTES
+            )
+            retired = [str(p) for p in pools[in_bin]] if merged else []
+
+            baseline = _billed_nodes(demand[in_bin], min_nodes).sum() * family_rate
+            shared = _billed_nodes(load, min_nodes).sum() * family_rate
+            recommendation = {
+                "recommended_min_nodes": min_nodes,
+                "recommended_max_nodes": int(max(min_nodes, np.ceil(load.max() - _CAPACITY_TOLERANCE))),
+                "instance_family": family,
+                "auto_suspend_minutes": auto_suspend,
+            }
+            pool_rows.append({
+                "consolidated_pool": name,
+                "instance_family": family,
+                "member_pools": len(in_bin),
+                **recommendation,
+                "baseline_credits": float(baseline),
+                "consolidated_credits": float(shared),
+                "credit_savings": float(baseline - shared),
+                "retired_pools": retired,
+                # A pool left on its own already exists; only merged pools are created
+                "migration_sql": get_migration_sql(recommendation, name) if merged else "",
+                "retire_sql": _retire_sql(retired) if merged else "",
+            })
+
+    assignments = pd.DataFrame({
+        "pool_name": pools,
+        "instance_family": families.to_numpy(),
+        "peak_nodes": peak,
+        "active_hours": (credits > 0).sum(axis=1),
+        "consolidated_pool": consolidated,
+        "exceeds_max_nodes": oversized,
+    }, columns=ASSIGNMENT_COLUMNS)
+    consolidated_pools = pd.DataFrame(pool_rows, columns=CONSOLIDATED_POOL_COLUMNS)
+
+    baseline_credits = float(consolidated_pools["baseline_credits"].sum())
+    consolidated_credits = float(consolidated_pools["consolidated_credits"].sum())
+    return {
+        "assignments": assignments,
+        "pools": consolidated_pools,
+        "migration_sql": "\n\n".join(sql for sql in consolidated_pools["migration_sql"] if sql),
+        "retire_sql": "\n\n".join(sql for sql in consolidated_pools["retire_sql"] if sql),
+        "retired_pools": [p for retired in consolidated_pools["retired_pools"] for p in retired],
+        "hours": len(hours),
+        "original_pool_count": len(pools),
+        "consolidated_pool_count": len(consolidated_pools),
+        "unconsolidated_pools": [str(p) for p in pools[oversized]],
+        "observed_credits": float(credits.sum()),
+        "baseline_credits": baseline_credits,
+        "consolidated_credits": consolidated_credits,
+        "credit_savings": baseline_credits - consolidated_credits,
+        "cost_savings": (baseline_credits - consolidated_credits) * credit_rate,
+    }
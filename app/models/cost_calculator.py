@@ -1,6 +1,17 @@
 """Cost calculation and comparison logic."""
 
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .autoscaling import DEFAULT_NODE_START_SECS
+
+# Approximate seconds for a suspended pool to resume, by instance type, plus
+# a per-node increment for pools that resume with several nodes
+DEFAULT_RESUME_LATENCY_MODEL = {
+    "base_secs": {"CPU": DEFAULT_NODE_START_SECS, "GPU": 2 * DEFAULT_NODE_START_SECS},
+    "per_additional_node_secs": 5.0,
+}
 
 
 def calculate_monthly_cost(
@@ -129,6 +140,88 @@ def compare_costs(
     }
 
 
+def estimate_resume_latency(
+    instance_type: str = "CPU",
+    min_nodes: int = 1,
+    latency_model: Optional[Dict] = None
+) -> float:
+    """
+    Estimate how long a suspended compute pool takes to resume.
+
+    Args:
+        instance_type: CPU or GPU
+        min_nodes: Nodes started on resume
+        latency_model: Dict with ``base_secs`` per instance type and
+            ``per_additional_node_secs``; defaults to ``DEFAULT_RESUME_LATENCY_MODEL``
+
+    Returns:
+        Resume latency in seconds
+    """
+    model = latency_model or DEFAULT_RESUME_LATENCY_MODEL
+    base = model["base_secs"].get(instance_type, DEFAULT_NODE_START_SECS)
+    return base + model.get("per_additional_node_secs", 0.0) * max(min_nodes - 1, 0)
+
+
+def calculate_suspend_frontier(
+    idle_gap_secs: np.ndarray,
+    trace_days: float,
+    credits_per_hour: float,
+    candidate_secs: np.ndarray,
+    credit_rate: float = 4.0,
+    resume_latency_secs: Optional[float] = None,
+    instance_type: str = "CPU",
+    min_nodes: int = 1,
+    latency_model: Optional[Dict] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Idle cost vs cold-start frontier across candidate AUTO_SUSPEND_SECS values.
+
+    For a timeout ``T``, gaps up to ``T`` are billed in full; longer gaps
+    bill ``T``, then the next session waits for a resume (also billed).
+    Longer timeouts trade idle credits for fewer cold starts, so every
+    candidate lies on the frontier. All candidates are evaluated with the
+    same single-pool sweep the auto-suspend recommender uses.
+
+    Args:
+        idle_gap_secs: Idle gaps between activity on the pool, in seconds
+        trace_days: Days covered by the activity trace
+        credits_per_hour: Credits per hour the pool burns while up (MIN_NODES x family rate)
+        candidate_secs: Candidate AUTO_SUSPEND_SECS values
+        credit_rate: Cost per credit
+        resume_latency_secs: Resume latency; estimated from the latency model if omitted
+        instance_type: CPU or GPU, for the latency model
+        min_nodes: Nodes started on resume, for the latency model
+        latency_model: Override for ``DEFAULT_RESUME_LATENCY_MODEL``
+
+    Returns:
+        Dictionary of per-candidate arrays (per day of trace): idle credits,
+        idle cost including resume billing, cold starts and cold-start wait
+    """
+    if trace_days <= 0:
+        raise ValueError("trace_days must be positive")
+    if resume_latency_secs is None:
+        resume_latency_secs = estimate_resume_latency(instance_type, min_nodes, latency_model)
+
+    from .auto_suspend import suspend_sweep
+
+    gaps = np.asarray(idle_gap_secs, dtype=float)
+    candidates = np.asarray(candidate_secs, dtype=float)
+    idle, suspends = suspend_sweep(np.zeros(len(gaps), dtype=np.int64), gaps, 1, candidates)
+    idle_secs, cold_starts = idle[0], suspends[0]
+
+    idle_credits = idle_secs / 3600 * credits_per_hour
+    resume_credits = cold_starts * resume_latency_secs / 3600 * credits_per_hour
+
+    return {
+        "auto_suspend_secs": candidates,
+        "idle_credits_per_day": idle_credits / trace_days,
+        "idle_cost_per_day": (idle_credits + resume_credits) * credit_rate / trace_days,
+        "cold_starts_per_day": cold_starts / trace_days,
+        "cold_start_wait_secs_per_day": cold_starts * resume_latency_secs / trace_days,
+        "resume_latency_secs": np.full(len(candidates), float(resume_latency_secs)),
+    }
+
+
 def estimate_annual_savings(monthly_savings: float, months: int = 12) -> float:
     """Calculate annual savings projection."""
     return monthly_savings * months
@@ -0,0 +1,319 @@
+"""Array-based cost engine for fleets and sensitivity grids."""
+
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[float, int, np.ndarray, pd.Series, list]
+
+COST_COLUMNS = [
+    "warehouse_monthly_cost",
+    "compute_pool_monthly_cost",
+    "compute_pool_credits_per_hour",
+    "total_hours",
+    "monthly_savings",
+    "savings_percent",
+]
+
+
+def compare_costs_vectorized(
+    warehouse_credits_per_hour: ArrayLike,
+    pool_credits_per_hour_per_node: ArrayLike,
+    hours_per_day: ArrayLike,
+    days_per_month: ArrayLike = 22,
+    credit_rate: ArrayLike = 4.0,
+    avg_node_count: ArrayLike = 1
+) -> Dict[str, np.ndarray]:
+    """
+    Compare warehouse vs compute pool costs over broadcastable arrays.
+
+    Uses the same formulas as ``compare_costs`` but evaluates every input
+    combination in a single NumPy pass. Inputs follow NumPy broadcasting
+    rules, so scalars, per-row arrays and grid axes can be mixed freely.
+
+    Args:
+        warehouse_credits_per_hour: Warehouse credits per hour
+        pool_credits_per_hour_per_node: Compute pool credits per hour per node
+        hours_per_day: Session hours per day
+        days_per_month: Working days per month
+        credit_rate: Cost per credit
+        avg_node_count: Average nodes for compute pool
+
+    Returns:
+        Dictionary of arrays keyed by ``COST_COLUMNS``
+    """
+    wh_rate = np.asarray(warehouse_credits_per_hour, dtype=float)
+    pool_rate = np.asarray(pool_credits_per_hour_per_node, dtype=float)
+    nodes = np.asarray(avg_node_count, dtype=float)
+    rate = np.asarray(credit_rate, dtype=float)
+
+    total_hours = np.asarray(hours_per_day, dtype=float) * np.asarray(days_per_month, dtype=float)
+    pool_credits_per_hour = pool_rate * nodes
+
+    warehouse_cost = wh_rate * total_hours * rate
+    pool_cost = pool_credits_per_hour * total_hours * rate
+    savings = warehouse_cost - pool_cost
+
+    savings_percent = np.divide(
+        savings * 100, warehouse_cost,
+        out=np.zeros(np.broadcast(savings, warehouse_cost).shape),
+        where=warehouse_cost > 0
+    )
+
+    shape = np.broadcast(warehouse_cost, pool_cost).shape
+    return {
+        "warehouse_monthly_cost": np.broadcast_to(warehouse_cost, shape),
+        "compute_pool_monthly_cost": np.broadcast_to(pool_cost, shape),
+        "compute_pool_credits_per_hour": np.broadcast_to(pool_credits_per_hour, shape),
+        "total_hours": np.broadcast_to(total_hours, shape),
+        "monthly_savings": savings,
+        "savings_percent": savings_percent,
+    }
+
+
+def compare_costs_batch(
+    recommendations: pd.DataFrame,
+    hours_per_day: ArrayLike,
+    days_per_month: ArrayLike = 22,
+    credit_rate: ArrayLike = 4.0,
+    avg_node_count: Optional[ArrayLike] = None
+) -> pd.DataFrame:
+    """
+    Compare costs for every row of a batch recommendation DataFrame.
+
+    Args:
+        recommendations: Output of ``recommend_compute_pool_batch``
+        hours_per_day: Scalar or per-row session hours per day
+        days_per_month: Scalar or per-row working days per month
+        credit_rate: Scalar or per-row cost per credit
+        avg_node_count: Scalar or per-row average nodes; defaults to the
+            midpoint of the recommended min and max nodes
+
+    Returns:
+        DataFrame with ``COST_COLUMNS`` plus a ``recommendation`` column,
+        indexed like ``recommendations``
+    """
+    if avg_node_count is None:
+        # Use average of min and max recommended nodes
+        avg_node_count = (
+            recommendations["recommended_min_nodes"].to_numpy() +
+            recommendations["recommended_max_nodes"].to_numpy()
+        ) // 2
+
+    warehouse_rate = np.fromiter(
+        (wh["credits_per_hour"] for wh in recommendations["original_warehouse"]),
+        dtype=float, count=len(recommendations)
+    )
+
+    costs = compare_costs_vectorized(
+        warehouse_rate,
+        recommendations["credits_per_hour"].to_numpy(dtype=float),
+        np.asarray(hours_per_day),
+        np.asarray(days_per_month),
+        np.asarray(credit_rate),
+        np.asarray(avg_node_count)
+    )
+
+    result = pd.DataFrame(
+        {col: np.broadcast_to(costs[col], (len(recommendations),)) for col in COST_COLUMNS},
+        index=recommendations.index
+    )
+    result["recommendation"] = np.where(
+        result["monthly_savings"] > 0, "Compute Pool", "Warehouse"
+    )
+    return result
+
+
+BREAK_EVEN_COLUMNS = [
+    "break_even_avg_node_count",
+    "break_even_hours_per_day",
+    "break_even_pool_credit_rate",
+    "monthly_savings",
+]
+
+
+def break_even_vectorized(
+    warehouse_credits_per_hour: ArrayLike,
+    pool_credits_per_hour_per_node: ArrayLike,
+    hours_per_day: ArrayLike,
+    days_per_month: ArrayLike = 22,
+    credit_rate: ArrayLike = 4.0,
+    avg_node_count: ArrayLike = 1,
+    pool_idle_hours_per_day: ArrayLike = 0.0,
+    pool_credit_rate: Optional[ArrayLike] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Solve warehouse cost = compute pool cost for each input in closed form.
+
+    With the ``compare_costs`` formulas both costs scale with hours and
+    credit rate, so only the node count decides which side is cheaper. Two
+    optional terms make the other break-evens meaningful: hours the pool
+    stays billed after sessions end each day (its auto-suspend tail), and a
+    pool credit price that differs from the warehouse's.
+
+    Each break-even holds the other inputs fixed:
+
+    - ``break_even_avg_node_count``: the pool is cheaper below it
+    - ``break_even_hours_per_day``: the pool is cheaper above it; ``inf``
+      when the pool is never cheaper, 0 when it is cheaper at any usage
+    - ``break_even_pool_credit_rate``: the pool is cheaper below it
+
+    Args:
+        warehouse_credits_per_hour: Warehouse credits per hour
+        pool_credits_per_hour_per_node: Compute pool credits per hour per node
+        hours_per_day: Session hours per day
+        days_per_month: Working days per month
+        credit_rate: Cost per credit (warehouse, and pool unless overridden)
+        avg_node_count: Average nodes for compute pool
+        pool_idle_hours_per_day: Extra billed pool hours per day
+        pool_credit_rate: Cost per compute pool credit; defaults to ``credit_rate``
+
+    Returns:
+        Dictionary of arrays keyed by ``BREAK_EVEN_COLUMNS``
+    """
+    wh_rate = np.asarray(warehouse_credits_per_hour, dtype=float)
+    pool_rate = np.asarray(pool_credits_per_hour_per_node, dtype=float)
+    hours = np.asarray(hours_per_day, dtype=float)
+    days = np.asarray(days_per_month, dtype=float)
+    nodes = np.asarray(avg_node_count, dtype=float)
+    idle = np.asarray(pool_idle_hours_per_day, dtype=float)
+    wh_price = np.asarray(credit_rate, dtype=float)
+    pool_price = wh_price if pool_credit_rate is None else np.asarray(pool_credit_rate, dtype=float)
+
+    warehouse_per_day = wh_rate * hours * wh_price
+    pool_hours = hours + idle
+    pool_per_hour = pool_rate * nodes * pool_price
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        nodes_star = warehouse_per_day / (pool_rate * pool_hours * pool_price)
+        price_star = warehouse_per_day / (pool_rate * nodes * pool_hours)
+
+        # W r_w H = P N r_p (H + I)  =>  H = P N r_p I / (W r_w - P N r_p)
+        margin = wh_rate * wh_price - pool_per_hour
+        hours_star = np.where(
+            margin > 0,
+            np.where(idle > 0, pool_per_hour * idle / margin, 0.0),
+            np.inf
+        )
+
+    savings = (warehouse_per_day - pool_per_hour * pool_hours) * days
+
+    shape = np.broadcast(nodes_star, price_star, hours_star, savings).shape
+    return {
+        "break_even_avg_node_count": np.broadcast_to(nodes_star, shape),
+        "break_even_hours_per_day": np.broadcast_to(hours_star, shape),
+        "break_even_pool_credit_rate": np.broadcast_to(price_star, shape),
+        "monthly_savings": np.broadcast_to(savings, shape),
+    }
+
+
+def break_even_batch(
+    recommendations: pd.DataFrame,
+    hours_per_day: ArrayLike,
+    days_per_month: ArrayLike = 22,
+    credit_rate: ArrayLike = 4.0,
+    avg_node_count: Optional[ArrayLike] = None,
+    pool_idle_hours_per_day: ArrayLike = 0.0,
+    pool_credit_rate: Optional[ArrayLike] = None
+) -> pd.DataFrame:
+    """
+    Break-even points for every row of a batch recommendation DataFrame.
+
+    Args:
+        recommendations: Output of ``recommend_compute_pool_batch``
+        hours_per_day: Scalar or per-row session hours per day
+        days_per_month: Scalar or per-row working days per month
+        credit_rate: Scalar or per-row cost per credit
+        avg_node_count: Scalar or per-row average nodes; defaults to the
+            midpoint of the recommended min and max nodes
+        pool_idle_hours_per_day: Scalar or per-row extra billed pool hours per day
+        pool_credit_rate: Scalar or per-row cost per compute pool credit
+
+    Returns:
+        DataFrame with ``BREAK_EVEN_COLUMNS``, indexed like ``recommendations``
+    """
+    if avg_node_count is None:
+        avg_node_count = (
+            recommendations["recommended_min_nodes"].to_numpy() +
+            recommendations["recommended_max_nodes"].to_numpy()
+        ) // 2
+
+    warehouse_rate = np.fromiter(
+        (wh["credits_per_hour"] for wh in recommendations["original_warehouse"]),
+        dtype=float, count=len(recommendations)
+    )
+
+    points = break_even_vectorized(
+        warehouse_rate,
+        recommendations["credits_per_hour"].to_numpy(dtype=float),
+        np.asarray(hours_per_day),
+        np.asarray(days_per_month),
+        np.asarray(credit_rate),
+        np.asarray(avg_node_count),
+        np.asarray(pool_idle_hours_per_day),
+        None if pool_credit_rate is None else np.asarray(pool_credit_rate)
+    )
+    return pd.DataFrame(
+        {col: np.broadcast_to(points[col], (len(recommendations),)) for col in BREAK_EVEN_COLUMNS},
+        index=recommendations.index
+    )
+
+
+def cost_sensitivity_grid(
+    warehouse: Dict,
+    recommendation: Dict,
+    hours_per_day: ArrayLike,
+    avg_node_count: ArrayLike,
+    credit_rate: ArrayLike = 4.0,
+    days_per_month: float = 22
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate a full hours x node count x credit rate sensitivity grid.
+
+    Each axis is placed on its own dimension, so the result arrays have
+    shape ``(len(hours_per_day), len(avg_node_count), len(credit_rate))``.
+
+    Args:
+        warehouse: Warehouse specification
+        recommendation: Compute pool recommendation
+        hours_per_day: Hours-per-day axis values
+        avg_node_count: Node count axis values
+        credit_rate: Credit rate axis values
+        days_per_month: Working days per month
+
+    Returns:
+        Dictionary of grid arrays keyed by ``COST_COLUMNS`` plus the three
+        axis arrays under ``hours_per_day``, ``avg_node_count`` and
+        ``credit_rate``
+    """
+    hours = np.atleast_1d(np.asarray(hours_per_day, dtype=float))
+    nodes = np.atleast_1d(np.asarray(avg_node_count, dtype=float))
+    rates = np.atleast_1d(np.asarray(credit_rate, dtype=float))
+
+    grid = compare_costs_vectorized(
+        warehouse["credits_per_hour"],
+        recommendation["credits_per_hour"],
+        hours[:, None, None],
+        days_per_month,
+        rates[None, None, :],
+        nodes[None, :, None]
+    )
+    shape = (len(hours), len(nodes), len(rates))
+    grid = {key: np.broadcast_to(value, shape) for key, value in grid.items()}
+    grid.update({"hours_per_day": hours, "avg_node_count": nodes, "credit_rate": rates})
+    return grid
+
+
+def sensitivity_grid_to_frame(grid: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Flatten a ``cost_sensitivity_grid`` result into a long-format DataFrame."""
+    hours, nodes, rates = np.meshgrid(
+        grid["hours_per_day"], grid["avg_node_count"], grid["credit_rate"], indexing="ij"
+    )
+    data = {
+        "hours_per_day": hours.ravel(),
+        "avg_node_count": nodes.ravel(),
+        "credit_rate": rates.ravel(),
+    }
+    data.update({col: grid[col].ravel() for col in COST_COLUMNS})
+    return pd.DataFrame(data)
@@ -0,0 +1,115 @@
+"""Streaming readers for exported ACCOUNT_USAGE views."""
+
+import os
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+DEFAULT_EXPORT_CHUNK_SIZE = 500_000
+
+EXPORT_FORMATS = (".csv", ".jsonl", ".ndjson", ".parquet")
+
+# An export file path, a DataFrame, or an iterable of DataFrame chunks
+ExportSource = Union[str, pd.DataFrame, Iterable[pd.DataFrame]]
+
+
+def normalize_columns(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Lower-case column names; Snowsight exports use upper case."""
+    chunk.columns = [str(c).strip().lower() for c in chunk.columns]
+    return chunk
+
+
+def read_export(
+    path: str,
+    chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE,
+    columns: Optional[Sequence[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream an exported view (CSV, JSON Lines or Parquet) in chunks.
+
+    Column names are lower-cased, so ``columns`` selects case-insensitively.
+    Parquet files are read one record batch at a time, reading only the
+    requested columns, and require pyarrow.
+
+    Args:
+        path: Export file path
+        chunk_size: Rows per chunk
+        columns: Optional subset of columns to read
+
+    Returns:
+        Iterator of DataFrames with lower-case column names
+    """
+    ext = os.path.splitext(path)[1].lower()
+    wanted = {c.lower() for c in columns} if columns else None
+
+    if ext == ".parquet":
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Reading Parquet exports requires pyarrow (pip install pyarrow)")
+        parquet = pq.ParquetFile(path)
+        selected = None
+        if wanted is not None:
+            selected = [name for name in parquet.schema_arrow.names if name.lower() in wanted]
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=selected):
+            yield normalize_columns(batch.to_pandas())
+        return
+
+    if ext == ".csv":
+        usecols = (lambda name: name.strip().lower() in wanted) if wanted is not None else None
+        reader = pd.read_csv(path, chunksize=chunk_size, usecols=usecols)
+    elif ext in (".jsonl", ".ndjson"):
+        reader = pd.read_json(path, lines=True, chunksize=chunk_size)
+    else:
+        raise ValueError(f"Unsupported export format: {ext or path} (use {', '.join(EXPORT_FORMATS)})")
+
+    for chunk in reader:
+        chunk = normalize_columns(chunk)
+        if wanted is not None:
+            chunk = chunk[[c for c in chunk.columns if c in wanted]]
+        yield chunk
+
+
+def iter_export_chunks(
+    source: ExportSource,
+    chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE,
+    columns: Optional[Sequence[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream chunks with lower-case column names from a path, DataFrame or iterable.
+
+    Paths are read with ``read_export``; DataFrames and iterables (for
+    example ``pd.read_csv(..., chunksize=...)`` over an upload) are passed
+    through with their column names normalized.
+    """
+    if isinstance(source, str):
+        yield from read_export(source, chunk_size, columns)
+        return
+    chunks = [source] if isinstance(source, pd.DataFrame) else source
+    for chunk in chunks:
+        yield normalize_columns(chunk.copy(deep=False))
+
+
+def parse_export_timestamps(values: pd.Series) -> pd.Series:
+    """
+    Parse exported timestamps to naive UTC; offsets are converted, naive values taken as UTC.
+
+    Exports repeat the same timestamps many times (METERING_HISTORY is
+    hourly), so each distinct value is parsed once. Unparseable values are NaT.
+    """
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques)
+    stamps = pd.to_datetime(uniques, utc=True, errors="coerce")
+    # The format is inferred from the first value; re-parse the rest one by one if it differs
+    retry = stamps.isna() & uniques.notna()
+    if retry.any():
+        stamps[retry] = pd.to_datetime(uniques[retry], utc=True, errors="coerce", format="mixed")
+    stamps = stamps.dt.tz_localize(None)
+    # Missing values have code -1, which picks the trailing NaT
+    parsed = np.append(stamps.to_numpy(dtype="datetime64[us]"), np.datetime64("NaT", "us"))
+    return pd.Series(parsed[codes], index=values.index)
@@ -0,0 +1,297 @@
+"""Headless fleet migration planning over warehouse inventories."""
+
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .batch import parse_concurrent_users, parse_flag_column, recommend_compute_pool_batch
+from .catalog import get_catalog
+from .cost_engine import COST_COLUMNS, compare_costs_batch
+from .warehouse_mapping import get_migration_sql
+
+DEFAULT_CHUNK_SIZE = 5000
+
+PLAN_COLUMNS = [
+    "warehouse_name",
+    "warehouse_size",
+    "workload_type",
+    "concurrent_users",
+    "gpu_required",
+    "hours_per_day",
+    "days_per_month",
+    "credit_rate",
+    "instance_family",
+    "instance_type",
+    "memory_gb",
+    "vcpu",
+    "credits_per_hour",
+    "gpu_memory_gb",
+    "gpu_count",
+    "recommended_min_nodes",
+    "recommended_max_nodes",
+    "auto_suspend_minutes",
+    "workload_multiplier",
+] + COST_COLUMNS + [
+    "recommendation",
+    "pool_name",
+    "migration_sql",
+    "error",
+]
+
+
+def read_inventory(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Stream a warehouse inventory file in chunks.
+
+    CSV files are read with ``pandas.read_csv``; ``.jsonl``/``.ndjson`` files
+    are read as JSON Lines. Only one chunk is held in memory at a time.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson"):
+        reader = pd.read_json(path, lines=True, chunksize=chunk_size)
+    elif ext == ".csv":
+        reader = pd.read_csv(path, chunksize=chunk_size)
+    else:
+        raise ValueError(f"Unsupported inventory format: {ext or path} (use .csv or .jsonl)")
+
+    offset = 0
+    for chunk in reader:
+        # Keep a global row number so default pool names stay unique across chunks
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
+
+
+def _pool_name(pool_name, warehouse_name, row_number: int) -> str:
+    """Derive a compute pool name for an inventory row."""
+    if isinstance(pool_name, str) and pool_name:
+        return pool_name
+    if isinstance(warehouse_name, str) and warehouse_name:
+        return re.sub(r"[^A-Z0-9_]", "_", warehouse_name.upper()) + "_POOL"
+    return f"NOTEBOOK_POOL_{row_number + 1}"
+
+
+def _column_or_default(chunk: pd.DataFrame, column: str, default: float) -> np.ndarray:
+    """Per-row values for a usage column, falling back to a default."""
+    if column not in chunk.columns:
+        return np.full(len(chunk), default, dtype=float)
+    return chunk[column].fillna(default).to_numpy(dtype=float)
+
+
+def plan_chunk(
+    chunk: pd.DataFrame,
+    hours_per_day: float = 8.0,
+    days_per_month: int = 22,
+    credit_rate: float = 4.0
+) -> pd.DataFrame:
+    """
+    Plan the migration of one chunk of warehouse inventory.
+
+    Rows may override the usage defaults with their own hours_per_day,
+    days_per_month and credit_rate columns. Rows with an unknown warehouse
+    size, a gpu_required value that is not a recognizable true/false, or
+    concurrent_users missing or below 1 get an ``error`` value instead of a
+    recommendation.
+
+    Returns:
+        DataFrame with ``PLAN_COLUMNS``
+    """
+    chunk = chunk.copy()
+    raw_gpu = chunk["gpu_required"] if "gpu_required" in chunk.columns else pd.Series(False, index=chunk.index)
+    gpu_required, bad_gpu = parse_flag_column(raw_gpu)
+    chunk["gpu_required"] = gpu_required
+    if "concurrent_users" in chunk.columns:
+        raw_users = chunk["concurrent_users"]
+        users, bad_users = parse_concurrent_users(raw_users)
+        chunk["concurrent_users"] = users
+    chunk["hours_per_day"] = _column_or_default(chunk, "hours_per_day", hours_per_day)
+    chunk["days_per_month"] = _column_or_default(chunk, "days_per_month", days_per_month)
+    chunk["credit_rate"] = _column_or_default(chunk, "credit_rate", credit_rate)
+
+    plan = pd.DataFrame(index=chunk.index, columns=PLAN_COLUMNS, dtype=object)
+    for col in PLAN_COLUMNS:
+        if col in chunk.columns:
+            plan[col] = chunk[col]
+
+    known_size = chunk["warehouse_size"].isin(get_catalog().warehouse_codes).to_numpy()
+    problems = [
+        (~known_size, "Unknown warehouse size: " + chunk["warehouse_size"].astype(str)),
+        (bad_gpu, "Invalid gpu_required value: " + raw_gpu.astype(str)),
+    ]
+    if "concurrent_users" in chunk.columns:
+        problems.append((bad_users, "Invalid concurrent_users: " + raw_users.astype(str)))
+        plan["concurrent_users"] = raw_users.where(bad_users, users)
+    plan["gpu_required"] = raw_gpu.where(bad_gpu, gpu_required)
+
+    valid = np.ones(len(chunk), dtype=bool)
+    for bad, message in problems:
+        # Report the first problem of each row
+        plan.loc[valid & bad, "error"] = message[valid & bad]
+        valid &= ~bad
+    valid = pd.Series(valid, index=chunk.index)
+
+    rows = chunk[valid]
+    if not rows.empty:
+        recs = recommend_compute_pool_batch(rows)
+        costs = compare_costs_batch(
+            recs,
+            rows["hours_per_day"].to_numpy(),
+            rows["days_per_month"].to_numpy(),
+            rows["credit_rate"].to_numpy()
+        )
+        gpu = recs["gpu_details"]
+        recs["gpu_memory_gb"] = pd.Series(
+            [d["gpu_memory_gb"] if d else None for d in gpu], index=recs.index, dtype=object
+        )
+        recs["gpu_count"] = pd.Series(
+            [d["gpu_count"] if d else None for d in gpu], index=recs.index, dtype=object
+        )
+
+        for col in PLAN_COLUMNS:
+            if col in recs.columns:
+                plan.loc[valid, col] = recs[col]
+            elif col in costs.columns:
+                plan.loc[valid, col] = costs[col]
+
+        pool_names = [
+            _pool_name(pool_name, warehouse_name, row_number)
+            for pool_name, warehouse_name, row_number in zip(
+                plan.loc[valid, "pool_name"], plan.loc[valid, "warehouse_name"], rows.index
+            )
+        ]
+        migration_sql = [
+            get_migration_sql({
+                "recommended_min_nodes": min_nodes,
+                "recommended_max_nodes": max_nodes,
+                "instance_family": family,
+                "auto_suspend_minutes": suspend,
+            }, name)
+            for min_nodes, max_nodes, family, suspend, name in zip(
+                recs["recommended_min_nodes"], recs["recommended_max_nodes"],
+                recs["instance_family"], recs["auto_suspend_minutes"], pool_names
+            )
+        ]
+        plan.loc[valid, "pool_name"] = pool_names
+        plan.loc[valid, "migration_sql"] = migration_sql
+
+    return plan
+
+
+def _bounded_map(
+    func: Callable,
+    items: Iterable,
+    workers: int,
+    max_pending: int
+) -> Iterator:
+    """
+    Map ``func`` over ``items`` in a process pool, preserving order.
+
+    At most ``max_pending`` items are submitted ahead of the consumer, so
+    memory stays bounded no matter how long ``items`` is.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def serialize_plan(plan: pd.DataFrame, output_format: str) -> str:
+    """Serialize a plan chunk as JSON Lines or header-less CSV text."""
+    if output_format == "csv":
+        return plan.to_csv(index=False, header=False, lineterminator="\n")
+    return plan.to_json(orient="records", lines=True)
+
+
+def _summarize(plan: pd.DataFrame) -> Dict[str, float]:
+    """Row, error and cost totals for one plan chunk."""
+    ok = plan["error"].isna()
+    summary = {"rows": len(plan), "errors": int((~ok).sum())}
+    for col in ("warehouse_monthly_cost", "compute_pool_monthly_cost", "monthly_savings"):
+        summary[col] = float(plan.loc[ok, col].astype(float).sum())
+    return summary
+
+
+class _ChunkPlanner:
+    """Picklable callable that plans and serializes one chunk in a worker."""
+
+    def __init__(
+        self,
+        hours_per_day: float,
+        days_per_month: int,
+        credit_rate: float,
+        output_format: str
+    ):
+        self.hours_per_day = hours_per_day
+        self.days_per_month = days_per_month
+        self.credit_rate = credit_rate
+        self.output_format = output_format
+
+    def __call__(self, chunk: pd.DataFrame) -> Tuple[str, Dict[str, float]]:
+        plan = plan_chunk(chunk, self.hours_per_day, self.days_per_month, self.credit_rate)
+        return serialize_plan(plan, self.output_format), _summarize(plan)
+
+
+def plan_fleet(
+    input_path: str,
+    output: TextIO,
+    output_format: str = "jsonl",
+    hours_per_day: float = 8.0,
+    days_per_month: int = 22,
+    credit_rate: float = 4.0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None
+) -> Dict[str, float]:
+    """
+    Plan a whole warehouse inventory, writing results incrementally.
+
+    Args:
+        input_path: CSV or JSONL inventory file
+        output: Text stream to write the plan to
+        output_format: ``jsonl`` or ``csv``
+        hours_per_day: Default session hours per day
+        days_per_month: Default working days per month
+        credit_rate: Default cost per credit
+        chunk_size: Inventory rows per chunk
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+
+    Returns:
+        Summary with row, error and monthly cost/savings totals
+    """
+    if output_format not in ("jsonl", "csv"):
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    workers = workers or os.cpu_count() or 1
+    planner = _ChunkPlanner(hours_per_day, days_per_month, credit_rate, output_format)
+    chunks = read_inventory(input_path, chunk_size)
+
+    if workers == 1:
+        results = map(planner, chunks)
+    else:
+        results = _bounded_map(planner, chunks, workers, max_pending=workers * 2)
+
+    if output_format == "csv":
+        output.write(",".join(PLAN_COLUMNS) + "\n")
+
+    summary = {
+        "rows": 0,
+        "errors": 0,
+        "warehouse_monthly_cost": 0.0,
+        "compute_pool_monthly_cost": 0.0,
+        "monthly_savings": 0.0,
+    }
+    for text, chunk_summary in results:
+        output.write(text)
+        output.flush()
+        for key, value in chunk_summary.items():
+            summary[key] += value
+
+    return summary
@@ -0,0 +1,172 @@
+"""Idle compute pool detection over exported ACCOUNT_USAGE views.
+
+The Python counterpart of Query 2 in ``usage_queries.sql``. Each export chunk
+is reduced to one row per pool and day (credits from METERING_HISTORY,
+successful queries from QUERY_HISTORY) with a groupby, the partial sums are
+combined, and the two per-pool-day tables are joined on pool and day. Memory
+and join size depend on the number of pool-days, not on the number of
+metering or query rows.
+
+QUERY_HISTORY has no compute pool column, so queries are attributed to a pool
+through a column holding the pool name, by default QUERY_TAG.
+"""
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .exports import DEFAULT_EXPORT_CHUNK_SIZE, ExportSource, iter_export_chunks, parse_export_timestamps
+
+# Successful queries per day below which a pool that used credits is idle
+DEFAULT_IDLE_QUERY_THRESHOLD = 5
+
+DEFAULT_IDLE_LOOKBACK_DAYS = 30
+
+POOL_DAY_COLUMNS = ["pool_name", "activity_date"]
+
+IDLE_POOL_COLUMNS = ["pool_name", "activity_date", "daily_credits", "query_count", "status"]
+
+
+def _pool_days(chunk: pd.DataFrame, pool_column: str) -> pd.DataFrame:
+    """Pool name and start day of every row of a chunk."""
+    return pd.DataFrame({
+        "pool_name": chunk[pool_column].to_numpy(),
+        "activity_date": parse_export_timestamps(chunk["start_time"]).dt.normalize().to_numpy(),
+    }, index=chunk.index)
+
+
+def _latest_time(chunk: pd.DataFrame) -> pd.Timestamp:
+    """Latest end time (start time where missing) in a chunk, as ``LocalSQLEngine`` takes it."""
+    latest = parse_export_timestamps(chunk["start_time"])
+    if "end_time" in chunk.columns:
+        latest = parse_export_timestamps(chunk["end_time"]).fillna(latest)
+    return latest.max()
+
+
+def pool_daily_credits(
+    chunks: Iterable[pd.DataFrame],
+    service_type: str = "COMPUTE_POOL"
+) -> pd.DataFrame:
+    """
+    Credits per pool per day from a stream of METERING_HISTORY chunks.
+
+    Args:
+        chunks: DataFrames with lower-case METERING_HISTORY columns
+        service_type: Metered service to keep
+
+    Returns:
+        DataFrame with pool_name, activity_date and daily_credits
+    """
+    partials = []
+    for chunk in chunks:
+        missing = [c for c in ("service_type", "name", "start_time", "credits_used") if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}")
+        chunk = chunk[chunk["service_type"] == service_type]
+        rows = _pool_days(chunk, "name")
+        rows["daily_credits"] = pd.to_numeric(chunk["credits_used"]).fillna(0).to_numpy(dtype=float)
+        partials.append(
+            rows.dropna(subset=["activity_date"])
+            .groupby(POOL_DAY_COLUMNS, sort=False)
+            .agg(daily_credits=("daily_credits", "sum"))
+        )
+    if not partials:
+        return pd.DataFrame(columns=POOL_DAY_COLUMNS + ["daily_credits"])
+    return pd.concat(partials).groupby(level=[0, 1], sort=False).sum().reset_index()
+
+
+def pool_daily_queries(
+    chunks: Iterable[pd.DataFrame],
+    pool_column: str = "query_tag"
+) -> pd.DataFrame:
+    """
+    Successful queries per pool per day from a stream of QUERY_HISTORY chunks.
+
+    Queries are counted once per query_id within a chunk; an export has one
+    row per query, so counts add up across chunks.
+
+    Args:
+        chunks: DataFrames with lower-case QUERY_HISTORY columns
+        pool_column: Column holding the pool a query ran for
+
+    Returns:
+        DataFrame with pool_name, activity_date and query_count
+    """
+    partials = []
+    for chunk in chunks:
+        missing = [c for c in (pool_column, "query_id", "execution_status", "start_time") if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}")
+        chunk = chunk[(chunk["execution_status"] == "SUCCESS") & chunk[pool_column].notna()]
+        chunk = chunk.drop_duplicates("query_id")
+        rows = _pool_days(chunk, pool_column)
+        partials.append(
+            rows.dropna(subset=["activity_date"])
+            .groupby(POOL_DAY_COLUMNS, sort=False)
+            .agg(query_count=("pool_name", "size"))
+        )
+    if not partials:
+        return pd.DataFrame(columns=POOL_DAY_COLUMNS + ["query_count"])
+    return pd.concat(partials).groupby(level=[0, 1], sort=False).sum().reset_index()
+
+
+def detect_idle_pools(
+    metering: ExportSource,
+    queries: Optional[ExportSource] = None,
+    min_queries: int = DEFAULT_IDLE_QUERY_THRESHOLD,
+    lookback_days: int = DEFAULT_IDLE_LOOKBACK_DAYS,
+    now: Optional[datetime] = None,
+    pool_column: str = "query_tag",
+    chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE
+) -> pd.DataFrame:
+    """
+    Pool-days that used credits but ran fewer than ``min_queries`` queries.
+
+    Matches Query 2 of ``usage_queries.sql`` run on the same exports: the
+    window covers whole days from ``lookback_days`` before ``now``, and
+    ``now`` defaults to the latest timestamp in the exports, as
+    CURRENT_TIMESTAMP() does in ``LocalSQLEngine``.
+
+    Args:
+        metering: METERING_HISTORY export (path, DataFrame or chunks)
+        queries: QUERY_HISTORY export; without it every pool-day counts zero queries
+        min_queries: Successful queries per day below which a pool is idle
+        lookback_days: Days of history to report
+        now: Reference time for the window
+        pool_column: QUERY_HISTORY column holding the pool a query ran for
+        chunk_size: Rows per chunk when reading export files
+
+    Returns:
+        DataFrame with ``IDLE_POOL_COLUMNS``, newest day first
+    """
+    if min_queries < 1 or lookback_days < 1:
+        raise ValueError("min_queries and lookback_days must be at least 1")
+
+    latest = []
+
+    def chunks(source: Optional[ExportSource]) -> Iterable[pd.DataFrame]:
+        for chunk in iter_export_chunks(source, chunk_size) if source is not None else ():
+            if now is None and "start_time" in chunk.columns:
+                latest.append(_latest_time(chunk))
+            yield chunk
+
+    credits = pool_daily_credits(chunks(metering))
+    counts = pool_daily_queries(chunks(queries), pool_column)
+
+    if now is None:
+        now = pd.Series(latest, dtype="datetime64[us]").max()
+        if pd.isna(now):
+            return pd.DataFrame(columns=IDLE_POOL_COLUMNS)
+    window_start = (pd.Timestamp(now) - pd.Timedelta(days=lookback_days)).normalize()
+
+    activity = credits[credits["activity_date"] >= window_start].merge(
+        counts[POOL_DAY_COLUMNS + ["query_count"]], on=POOL_DAY_COLUMNS, how="left"
+    )
+    activity["query_count"] = activity["query_count"].fillna(0).astype(np.int64)
+
+    idle = activity[(activity["daily_credits"] > 0) & (activity["query_count"] < min_queries)].copy()
+    idle["status"] = "Potentially Idle"
+    idle = idle.sort_values(["activity_date", "daily_credits", "pool_name"], ascending=[False, False, True])
+    return idle[IDLE_POOL_COLUMNS].reset_index(drop=True)
@@ -0,0 +1,246 @@
+"""Precomputed recommendation table for the calculator's input space.
+
+The calculator only offers 10 warehouse sizes, 4 workload types, 1-100
+concurrent users and a GPU toggle, so every recommendation can be computed
+up front. Lookups are then a handful of array reads, and cost comparisons
+are a cheap rescale of the stored per-hour credits by hours and credit rate.
+
+The table is built at first use (a few milliseconds) or loaded from a
+compact ``.npz`` artifact written at build time::
+
+    cd app && python -c "from models import RecommendationTable; RecommendationTable.build().save()"
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .batch import recommend_compute_pool_batch
+from .catalog import DATA_DIR, SpecCatalog, get_catalog
+from .cost_calculator import compare_costs
+from .records import PoolRecommendation
+from .warehouse_mapping import (
+    WORKLOAD_MULTIPLIERS,
+    AUTO_SUSPEND_MINUTES,
+    recommend_compute_pool,
+    workload_multipliers
+)
+
+MAX_CONCURRENT_USERS = 100
+RECOMMENDATION_TABLE_PATH = os.path.join(DATA_DIR, "recommendation_table.npz")
+
+
+def catalog_fingerprint(catalog: SpecCatalog) -> str:
+    """Hash of the spec data and recommender parameters a table was built from."""
+    payload = json.dumps(
+        {
+            "warehouses": [wh.to_dict() for wh in catalog.warehouses],
+            "compute_pools": [p.to_dict() for p in catalog.compute_pools],
+            "recommender_params": {
+                key: catalog.recommender_params.get(key)
+                for key in ("workload_multipliers", "node_heuristic")
+            }
+        },
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RecommendationTable:
+    """
+    Dense table of recommendations indexed by
+    (warehouse size, workload type, concurrent users, GPU required).
+
+    Inputs outside the table (unknown workload types, more than
+    ``max_users`` users) fall back to ``recommend_compute_pool``.
+    """
+
+    def __init__(
+        self,
+        warehouse_codes: Tuple[str, ...],
+        workload_types: Tuple[str, ...],
+        families: Tuple[str, ...],
+        family_index: np.ndarray,
+        min_nodes: np.ndarray,
+        max_nodes: np.ndarray,
+        fingerprint: str
+    ):
+        self.warehouse_codes = warehouse_codes
+        self.workload_types = workload_types
+        self.families = families
+        self.family_index = family_index
+        self.min_nodes = min_nodes
+        self.max_nodes = max_nodes
+        self.fingerprint = fingerprint
+        self.max_users = family_index.shape[2]
+
+        self._warehouse_pos = {code: i for i, code in enumerate(warehouse_codes)}
+        self._workload_pos = {wt: i for i, wt in enumerate(workload_types)}
+
+    @classmethod
+    def build(
+        cls,
+        catalog: Optional[SpecCatalog] = None,
+        max_users: int = MAX_CONCURRENT_USERS
+    ) -> "RecommendationTable":
+        """Compute every recommendation in the input space with the batch recommender."""
+        catalog = catalog or get_catalog()
+        codes = catalog.warehouse_codes
+        workload_types = tuple(WORKLOAD_MULTIPLIERS)
+        shape = (len(codes), len(workload_types), max_users, 2)
+
+        grid = np.indices(shape).reshape(len(shape), -1)
+        inputs = pd.DataFrame({
+            "warehouse_size": np.asarray(codes, dtype=object)[grid[0]],
+            "workload_type": np.asarray(workload_types, dtype=object)[grid[1]],
+            "concurrent_users": grid[2] + 1,
+            "gpu_required": grid[3].astype(bool),
+        })
+        recs = recommend_compute_pool_batch(inputs)
+
+        families = tuple(p.family for p in catalog.compute_pools)
+        family_index = pd.Index(families).get_indexer(recs["instance_family"])
+
+        return cls(
+            warehouse_codes=codes,
+            workload_types=workload_types,
+            families=families,
+            family_index=family_index.astype(np.int16).reshape(shape),
+            min_nodes=recs["recommended_min_nodes"].to_numpy(np.int32).reshape(shape),
+            max_nodes=recs["recommended_max_nodes"].to_numpy(np.int32).reshape(shape),
+            fingerprint=catalog_fingerprint(catalog)
+        )
+
+    def save(self, path: str = RECOMMENDATION_TABLE_PATH) -> None:
+        """Write the table to a compressed ``.npz`` artifact."""
+        np.savez_compressed(
+            path,
+            warehouse_codes=np.array(self.warehouse_codes),
+            workload_types=np.array(self.workload_types),
+            families=np.array(self.families),
+            family_index=self.family_index,
+            min_nodes=self.min_nodes,
+            max_nodes=self.max_nodes,
+            fingerprint=np.array(self.fingerprint)
+        )
+
+    @classmethod
+    def load(cls, path: str = RECOMMENDATION_TABLE_PATH) -> "RecommendationTable":
+        """Read a table written by ``save``."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                warehouse_codes=tuple(data["warehouse_codes"].tolist()),
+                workload_types=tuple(data["workload_types"].tolist()),
+                families=tuple(data["families"].tolist()),
+                family_index=data["family_index"],
+                min_nodes=data["min_nodes"],
+                max_nodes=data["max_nodes"],
+                fingerprint=str(data["fingerprint"])
+            )
+
+    def _position(
+        self,
+        warehouse_size: str,
+        workload_type: str,
+        concurrent_users: int,
+        gpu_required: bool
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """Table coordinates for an input, or None if it is not covered."""
+        wh = self._warehouse_pos.get(warehouse_size)
+        wt = self._workload_pos.get(workload_type)
+        if wh is None or wt is None or not 1 <= concurrent_users <= self.max_users:
+            return None
+        return wh, wt, int(concurrent_users) - 1, int(bool(gpu_required))
+
+    def recommend(
+        self,
+        warehouse_size: str,
+        workload_type: str,
+        concurrent_users: int,
+        gpu_required: bool = False
+    ) -> PoolRecommendation:
+        """Same result as ``recommend_compute_pool``, served from the table."""
+        pos = self._position(warehouse_size, workload_type, concurrent_users, gpu_required)
+        if pos is None:
+            return recommend_compute_pool(
+                warehouse_size, workload_type, concurrent_users, gpu_required
+            )
+
+        catalog = get_catalog()
+        pool = catalog.get_pool(self.families[int(self.family_index[pos])])
+        return PoolRecommendation.from_pool(
+            pool,
+            catalog.get_warehouse(warehouse_size),
+            min_nodes=int(self.min_nodes[pos]),
+            max_nodes=int(self.max_nodes[pos]),
+            auto_suspend_minutes=AUTO_SUSPEND_MINUTES[workload_type],
+            workload_multiplier=workload_multipliers()[workload_type],
+            gpu_required=bool(gpu_required)
+        )
+
+    def compare_costs(
+        self,
+        warehouse_size: str,
+        workload_type: str,
+        concurrent_users: int,
+        gpu_required: bool,
+        hours_per_day: float,
+        days_per_month: int = 22,
+        credit_rate: float = 4.0
+    ) -> Tuple[PoolRecommendation, Dict]:
+        """
+        Look up a recommendation and rescale its per-hour credits into costs.
+
+        Returns:
+            Tuple of (recommendation, comparison) matching
+            ``recommend_compute_pool`` and ``compare_costs``
+        """
+        recommendation = self.recommend(
+            warehouse_size, workload_type, concurrent_users, gpu_required
+        )
+        comparison = compare_costs(
+            recommendation.original_warehouse,
+            recommendation,
+            hours_per_day,
+            days_per_month,
+            credit_rate
+        )
+        return recommendation, comparison
+
+
+_table: Optional[RecommendationTable] = None
+_table_version: Optional[int] = None
+_table_lock = threading.Lock()
+
+
+def get_recommendation_table() -> RecommendationTable:
+    """
+    Return the shared recommendation table.
+
+    Loads the build-time artifact if it matches the current spec data,
+    otherwise builds the table in memory. The table is rebuilt whenever the
+    catalog is reloaded.
+    """
+    global _table, _table_version
+    catalog = get_catalog()
+    if _table is not None and _table_version == catalog.version:
+        return _table
+
+    with _table_lock:
+        if _table is None or _table_version != catalog.version:
+            table = None
+            if os.path.exists(RECOMMENDATION_TABLE_PATH):
+                try:
+                    table = RecommendationTable.load(RECOMMENDATION_TABLE_PATH)
+                except (OSError, ValueError, KeyError):
+                    table = None
+                if table is not None and table.fingerprint != catalog_fingerprint(catalog):
+                    table = None
+            _table = table or RecommendationTable.build(catalog)
+            _table_version = catalog.version
+    return _table
@@ -0,0 +1,179 @@
+"""Memoized recommendations and cost comparisons shared across sessions.
+
+``recommend_compute_pool`` and ``compare_costs`` are pure functions of their
+inputs, so results are cached process-wide in a bounded LRU keyed on
+normalized inputs and the catalog version. Every Streamlit session in the
+process shares the same cache; all access goes through one lock.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Tuple
+
+from .catalog import get_catalog
+from .lookup_table import get_recommendation_table
+from .records import PoolRecommendation
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+class CacheInfo(NamedTuple):
+    """Cache statistics, in the style of ``functools.lru_cache``."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """
+    Thread-safe mapping with least-recently-used eviction and hit/miss counters.
+
+    The lock is not held while a missing value is computed, so two sessions
+    asking for the same new key at once may both compute it; the second
+    result simply replaces the first.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, computing and storing it on a miss."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def resize(self, maxsize: int) -> None:
+        """Change the capacity, evicting least recently used entries if needed."""
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Current hit/miss counters and size."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+_recommendation_cache = LRUCache()
+_comparison_cache = LRUCache()
+
+
+def _recommendation_key(
+    warehouse_size: str,
+    workload_type: str,
+    concurrent_users: int,
+    gpu_required: bool
+) -> Tuple:
+    """Normalized cache key; includes the catalog version so reloads invalidate."""
+    return (
+        get_catalog().version,
+        str(warehouse_size).strip().upper(),
+        str(workload_type).strip(),
+        int(concurrent_users),
+        bool(gpu_required)
+    )
+
+
+def cached_recommend_compute_pool(
+    warehouse_size: str,
+    workload_type: str,
+    concurrent_users: int,
+    gpu_required: bool = False
+) -> PoolRecommendation:
+    """
+    Memoized ``recommend_compute_pool``.
+
+    Records are immutable, so the cached instance is returned directly.
+    """
+    key = _recommendation_key(warehouse_size, workload_type, concurrent_users, gpu_required)
+    return _recommendation_cache.get_or_compute(
+        key,
+        lambda: get_recommendation_table().recommend(*key[1:])
+    )
+
+
+def cached_compare_costs(
+    warehouse_size: str,
+    workload_type: str,
+    concurrent_users: int,
+    gpu_required: bool,
+    hours_per_day: float,
+    days_per_month: int = 22,
+    credit_rate: float = 4.0
+) -> Tuple[PoolRecommendation, Dict]:
+    """
+    Memoized recommendation plus ``compare_costs`` for the same inputs.
+
+    Returns:
+        Tuple of (recommendation, comparison). The comparison is a copy, so
+        callers may modify it without affecting other sessions.
+    """
+    key = _recommendation_key(
+        warehouse_size, workload_type, concurrent_users, gpu_required
+    ) + (float(hours_per_day), int(days_per_month), float(credit_rate))
+
+    def compute() -> Tuple[PoolRecommendation, Dict]:
+        return get_recommendation_table().compare_costs(
+            *key[1:5],
+            hours_per_day=hours_per_day,
+            days_per_month=days_per_month,
+            credit_rate=credit_rate
+        )
+
+    recommendation, comparison = _comparison_cache.get_or_compute(key, compute)
+    return recommendation, copy.deepcopy(comparison)
+
+
+def configure_cache(maxsize: int) -> None:
+    """Set the maximum number of entries kept by each memoized function."""
+    _recommendation_cache.resize(maxsize)
+    _comparison_cache.resize(maxsize)
+
+
+def clear_cache() -> None:
+    """Drop all memoized results and reset the hit/miss counters."""
+    _recommendation_cache.clear()
+    _comparison_cache.clear()
+
+
+def cache_info() -> Dict[str, CacheInfo]:
+    """Hit/miss statistics for each memoized function."""
+    return {
+        "recommend_compute_pool": _recommendation_cache.info(),
+        "compare_costs": _comparison_cache.info(),
+    }
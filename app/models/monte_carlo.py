@@ -0,0 +1,182 @@
+"""Monte Carlo cost comparison over uncertain usage."""
+
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from .cost_engine import compare_costs_vectorized
+from .warehouse_mapping import users_node_range
+
+DEFAULT_DRAWS = 100_000
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+# A distribution is a plain number (fixed) or a dict such as
+# {"distribution": "triangular", "low": 4, "mode": 8, "high": 12}
+DistributionSpec = Union[float, int, Dict]
+
+DISTRIBUTION_PARAMETERS = {
+    "fixed": ("value",),
+    "uniform": ("low", "high"),
+    "triangular": ("low", "mode", "high"),
+    "normal": ("mean", "std"),
+    "lognormal": ("median", "sigma"),
+    "poisson": ("mean",),
+}
+
+
+def sample_distribution(
+    spec: DistributionSpec,
+    size: int,
+    rng: np.random.Generator,
+    low: float = -np.inf,
+    high: float = np.inf
+) -> np.ndarray:
+    """
+    Draw samples from a distribution spec, clipped to ``[low, high]``.
+
+    Args:
+        spec: A number for a fixed value, or a dict with a ``distribution``
+            key (fixed, uniform, triangular, normal, lognormal, poisson)
+            and that distribution's parameters, plus optional ``min``/``max``
+            to clip further.
+        size: Number of draws
+        rng: NumPy random generator
+        low: Hard lower bound for the quantity
+        high: Hard upper bound for the quantity
+
+    Returns:
+        Array of ``size`` samples
+    """
+    if not isinstance(spec, dict):
+        return np.full(size, np.clip(float(spec), low, high))
+
+    kind = spec.get("distribution", "fixed")
+    if kind not in DISTRIBUTION_PARAMETERS:
+        raise ValueError(f"Unknown distribution: {kind}")
+    missing = [p for p in DISTRIBUTION_PARAMETERS[kind] if p not in spec]
+    if missing:
+        raise ValueError(f"Missing parameters for {kind} distribution: {', '.join(missing)}")
+
+    if kind == "fixed":
+        samples = np.full(size, float(spec["value"]))
+    elif kind == "uniform":
+        samples = rng.uniform(spec["low"], spec["high"], size)
+    elif kind == "triangular":
+        samples = rng.triangular(spec["low"], spec["mode"], spec["high"], size)
+    elif kind == "normal":
+        samples = rng.normal(spec["mean"], spec["std"], size)
+    elif kind == "lognormal":
+        samples = rng.lognormal(np.log(spec["median"]), spec["sigma"], size)
+    else:
+        samples = rng.poisson(spec["mean"], size).astype(float)
+
+    return np.clip(samples, max(low, spec.get("min", low)), min(high, spec.get("max", high)))
+
+
+def triangular_spec(low: float, mode: float, high: float) -> DistributionSpec:
+    """
+    Triangular distribution spec, with the mode clamped into ``[low, high]``.
+
+    Collapses to a fixed value when the range is empty.
+    """
+    if high <= low:
+        return low
+    return {
+        "distribution": "triangular",
+        "low": low,
+        "mode": min(max(mode, low), high),
+        "high": high
+    }
+
+
+def _percentiles(values: np.ndarray, percentiles: Sequence[float]) -> Dict[str, float]:
+    """Percentiles of ``values`` keyed as p50, p90, ..."""
+    points = np.percentile(values, percentiles)
+    return {f"p{p:g}": float(v) for p, v in zip(percentiles, points)}
+
+
+def monte_carlo_compare_costs(
+    warehouse: Dict,
+    recommendation: Dict,
+    hours_per_day: DistributionSpec,
+    days_per_month: DistributionSpec = 22,
+    concurrent_users: Optional[DistributionSpec] = None,
+    credit_rate: float = 4.0,
+    draws: int = DEFAULT_DRAWS,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    seed: Optional[int] = None
+) -> Dict:
+    """
+    Compare warehouse and compute pool costs over sampled usage.
+
+    Each draw samples hours per day, active days and concurrent users, sizes
+    the pool with the same node heuristic as ``recommend_compute_pool``
+    (midpoint of the recommended range) and prices both options with
+    ``compare_costs_vectorized``. All draws are evaluated in one NumPy pass.
+
+    Args:
+        warehouse: Warehouse configuration
+        recommendation: Compute pool recommendation
+        hours_per_day: Distribution of session hours per day
+        days_per_month: Distribution of active days per month
+        concurrent_users: Distribution of concurrent users; defaults to the
+            recommendation's node range as is
+        credit_rate: Cost per credit
+        draws: Number of Monte Carlo draws
+        percentiles: Percentiles to report
+        seed: Random seed for reproducible results
+
+    Returns:
+        Dictionary with percentile summaries of each cost, mean values,
+        the probability that the pool is cheaper and the raw draws
+    """
+    if draws < 1:
+        raise ValueError("draws must be at least 1")
+    rng = np.random.default_rng(seed)
+
+    hours = sample_distribution(hours_per_day, draws, rng, low=0, high=24)
+    days = np.rint(sample_distribution(days_per_month, draws, rng, low=0, high=31))
+
+    if concurrent_users is None:
+        avg_nodes = np.full(draws, (
+            recommendation["recommended_min_nodes"] + recommendation["recommended_max_nodes"]
+        ) // 2)
+        users = None
+    else:
+        users = np.maximum(np.rint(sample_distribution(concurrent_users, draws, rng, low=1)), 1)
+        users = users.astype(np.int64)
+        # Same heuristic as recommended_node_range
+        min_nodes, max_nodes = users_node_range(users)
+        avg_nodes = (min_nodes + max_nodes) // 2
+
+    costs = compare_costs_vectorized(
+        warehouse["credits_per_hour"],
+        recommendation["credits_per_hour"],
+        hours,
+        days,
+        credit_rate,
+        avg_nodes
+    )
+    savings = costs["monthly_savings"]
+
+    samples = {
+        "hours_per_day": hours,
+        "days_per_month": days,
+        "concurrent_users": users,
+        "avg_node_count": avg_nodes,
+        "warehouse_monthly_cost": costs["warehouse_monthly_cost"],
+        "compute_pool_monthly_cost": costs["compute_pool_monthly_cost"],
+        "monthly_savings": savings,
+    }
+
+    return {
+        "draws": draws,
+        "warehouse_monthly_cost": _percentiles(costs["warehouse_monthly_cost"], percentiles),
+        "compute_pool_monthly_cost": _percentiles(costs["compute_pool_monthly_cost"], percentiles),
+        "monthly_savings": _percentiles(savings, percentiles),
+        "mean_warehouse_monthly_cost": float(costs["warehouse_monthly_cost"].mean()),
+        "mean_compute_pool_monthly_cost": float(costs["compute_pool_monthly_cost"].mean()),
+        "mean_monthly_savings": float(savings.mean()),
+        "probability_pool_cheaper": float(np.mean(savings > 0)),
+        "samples": samples,
+    }
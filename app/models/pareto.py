@@ -0,0 +1,115 @@
+"""Cost vs capacity Pareto frontier over compute pool configurations."""
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .pool_search import get_configuration_index
+from .warehouse_mapping import MAX_NODES
+
+CAPACITY_COLUMNS = ("total_memory_gb", "total_vcpu", "total_gpu_memory_gb")
+
+
+def enumerate_pool_configurations(
+    hours_per_day: float = 8.0,
+    days_per_month: int = 22,
+    credit_rate: float = 4.0,
+    max_nodes: int = MAX_NODES,
+    instance_type: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Every instance family x node count (1 to ``max_nodes``) with its capacity and cost.
+
+    Args:
+        hours_per_day: Session hours per day
+        days_per_month: Working days per month
+        credit_rate: Cost per credit
+        max_nodes: Largest node count to enumerate
+        instance_type: Restrict to CPU or GPU families
+
+    Returns:
+        DataFrame ordered by monthly cost, cheapest first
+    """
+    index = get_configuration_index(max_nodes)
+    configs = pd.DataFrame({
+        "instance_family": index.families[index.family],
+        "instance_type": index.types[index.family],
+        "node_count": index.node_count,
+        "total_memory_gb": index.total_memory_gb,
+        "total_vcpu": index.total_vcpu,
+        "total_gpu_count": index.total_gpu_count,
+        "total_gpu_memory_gb": index.gpu_memory_gb * index.node_count,
+        "credits_per_hour": index.credits_per_hour,
+        "monthly_cost": index.credits_per_hour * (hours_per_day * days_per_month) * credit_rate,
+    })
+    if instance_type is not None:
+        configs = configs[configs["instance_type"] == instance_type].reset_index(drop=True)
+    return configs
+
+
+def pareto_optimal_mask(
+    cost: np.ndarray,
+    capacities: np.ndarray,
+    block_size: int = 512
+) -> np.ndarray:
+    """
+    Flag configurations no other configuration dominates.
+
+    A configuration is dominated when another one costs no more, offers at
+    least as much of every capacity, and is strictly better on one of them.
+
+    Args:
+        cost: Array of shape (n,) to minimize
+        capacities: Array of shape (n, k) to maximize
+        block_size: Rows compared at once, bounding memory to block x n
+
+    Returns:
+        Boolean array of shape (n,)
+    """
+    cost = np.asarray(cost, dtype=float)
+    capacities = np.asarray(capacities, dtype=float).reshape(len(cost), -1)
+    optimal = np.ones(len(cost), dtype=bool)
+
+    for start in range(0, len(cost), block_size):
+        stop = min(start + block_size, len(cost))
+        c = cost[start:stop, None]
+        cap = capacities[start:stop, None, :]
+
+        no_worse = (cost[None, :] <= c) & np.all(capacities[None, :, :] >= cap, axis=2)
+        strictly_better = (cost[None, :] < c) | np.any(capacities[None, :, :] > cap, axis=2)
+        optimal[start:stop] = ~np.any(no_worse & strictly_better, axis=1)
+
+    return optimal
+
+
+def explore_pareto_frontier(
+    hours_per_day: float = 8.0,
+    days_per_month: int = 22,
+    credit_rate: float = 4.0,
+    max_nodes: int = MAX_NODES,
+    instance_type: Optional[str] = None,
+    objectives: Sequence[str] = CAPACITY_COLUMNS
+) -> pd.DataFrame:
+    """
+    Enumerate configurations and flag the Pareto-optimal ones.
+
+    Args:
+        hours_per_day: Session hours per day
+        days_per_month: Working days per month
+        credit_rate: Cost per credit
+        max_nodes: Largest node count to enumerate
+        instance_type: Restrict to CPU or GPU families
+        objectives: Capacity columns to maximize against monthly cost
+
+    Returns:
+        ``enumerate_pool_configurations`` output plus a ``pareto_optimal`` column
+    """
+    configs = enumerate_pool_configurations(
+        hours_per_day, days_per_month, credit_rate, max_nodes, instance_type
+    )
+    configs["pareto_optimal"] = pareto_optimal_mask(
+        configs["monthly_cost"].to_numpy(),
+        configs[list(objectives)].to_numpy()
+    )
+    return configs
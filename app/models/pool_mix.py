@@ -0,0 +1,321 @@
+"""Heterogeneous pool mix: cover user cohorts with several instance families.
+
+``recommend_compute_pool`` picks a single instance family. When most users
+fit a small CPU node but a few need high-memory nodes, running one pool per
+family in a mix is cheaper than sizing everyone for the largest need.
+
+The problem is an uncapacitated facility location over the catalog: opening
+a pool of family ``f`` costs ``pool_overhead_nodes`` idle nodes, and each
+cohort then runs on the cheapest open family that fits its sessions. Every
+subset of families is a candidate; subsets are evaluated in vectorized
+batches, after removing families no cohort can use and families another
+family dominates, and subsets whose overhead alone exceeds the best mix
+found so far are pruned. The search is exact for the fractional-node cost
+model and stays fast for hundreds of cohorts because its size depends on
+the catalog, not the number of cohorts.
+"""
+
+from itertools import combinations
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .batch import parse_flag_column
+from .catalog import get_catalog
+from .warehouse_mapping import DEFAULT_AUTO_SUSPEND_MINUTES, MAX_NODES, get_migration_sql, node_heuristic
+
+COHORT_INPUT_COLUMNS = ["cohort", "users", "memory_gb_per_user", "vcpu_per_user"]
+
+# Idle nodes charged for every open pool (warm MIN_NODES, auto-suspend tails)
+DEFAULT_POOL_OVERHEAD_NODES = 1.0
+
+# Families left after pruning beyond which subset enumeration is refused
+MAX_MIX_FAMILIES = 20
+
+# Subsets evaluated per vectorized batch
+_SUBSET_BATCH = 4096
+
+
+MIX_POOL_COLUMNS = [
+    "pool_name",
+    "instance_family",
+    "instance_type",
+    "cohorts",
+    "users",
+    "load_nodes",
+    "recommended_min_nodes",
+    "recommended_max_nodes",
+    "credits_per_hour",
+    "migration_sql",
+]
+
+
+def _node_shares(cohorts: pd.DataFrame) -> np.ndarray:
+    """
+    Fraction of a node one user's session takes on each family.
+
+    A session takes the largest of its memory, vCPU and GPU memory fractions
+    of a node; families where it does not fit on one node, or of the wrong
+    CPU/GPU type, get ``inf``.
+
+    Returns:
+        Array of shape (cohorts, families) in catalog order
+    """
+    table = get_catalog().pool_table
+
+    def fraction(need: str, capacity: np.ndarray) -> np.ndarray:
+        if need not in cohorts.columns:
+            return np.zeros((len(cohorts), len(capacity)))
+        values = cohorts[need].fillna(0).to_numpy(dtype=float)[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(values > 0, values / capacity[None, :], 0.0)
+
+    share = np.maximum.reduce([
+        fraction("memory_gb_per_user", table["memory_gb"]),
+        fraction("vcpu_per_user", table["vcpu"]),
+        fraction("gpu_memory_gb_per_user", table["gpu_memory_gb"]),
+    ])
+
+    if "gpu_required" in cohorts.columns:
+        gpu, invalid = parse_flag_column(cohorts["gpu_required"])
+        if np.any(invalid):
+            values = sorted(set(cohorts["gpu_required"][invalid].astype(str)))
+            raise ValueError(f"Invalid gpu_required value: {', '.join(values)}")
+    else:
+        gpu = np.zeros(len(cohorts), dtype=bool)
+
+    eligible = (share <= 1) & (table["is_gpu"][None, :] == gpu[:, None])
+    return np.where(eligible, share, np.inf)
+
+
+def cohort_cost_matrix(cohorts: pd.DataFrame) -> np.ndarray:
+    """
+    Credits per hour to host each cohort on each instance family.
+
+    Returns:
+        Array of shape (cohorts, families) in catalog order, ``inf`` where
+        the family cannot host the cohort's sessions
+    """
+    share = _node_shares(cohorts)
+    users = cohorts["users"].to_numpy(dtype=float)[:, None]
+    cost = users * np.where(np.isfinite(share), share, 0) * get_catalog().pool_table["credits_per_hour"][None, :]
+    return np.where(np.isfinite(share), cost, np.inf)
+
+
+def prune_families(cost: np.ndarray, overhead: np.ndarray) -> np.ndarray:
+    """
+    Families worth considering: usable by some cohort and not dominated.
+
+    Family ``g`` dominates ``f`` when it is no more expensive for every
+    cohort and its overhead is no higher; swapping ``f`` for ``g`` in any mix
+    never costs more, so ``f`` can be dropped without losing the optimum.
+    Among identical families the first in catalog order is kept.
+
+    Returns:
+        Indices of the remaining families
+    """
+    candidates = np.flatnonzero(np.isfinite(cost).any(axis=0))
+    keep = []
+    for f in candidates:
+        dominated = False
+        for g in candidates:
+            if g == f:
+                continue
+            no_worse = np.all(cost[:, g] <= cost[:, f]) and overhead[g] <= overhead[f]
+            strictly = np.any(cost[:, g] < cost[:, f]) or overhead[g] < overhead[f] or g < f
+            if no_worse and strictly:
+                dominated = True
+                break
+        if not dominated:
+            keep.append(f)
+    return np.array(keep, dtype=np.int64)
+
+
+def _pool_count(load_nodes: float) -> int:
+    """Pools of one family needed to host ``load_nodes`` within MAX_NODES each."""
+    return int(max(1, np.ceil(load_nodes / MAX_NODES - 1e-9)))
+
+
+def _search_subsets(cost: np.ndarray, overhead: np.ndarray) -> Dict:
+    """
+    Exact minimum over subsets of the columns of ``cost``.
+
+    Subsets are enumerated by size in vectorized batches. A subset is skipped
+    when its overhead plus every cohort's cheapest cost over all families (a
+    lower bound on any mix) cannot beat the best total found so far.
+    """
+    n_families = cost.shape[1]
+    lower_bound = cost.min(axis=1).sum()
+    best_total = np.inf
+    best_subset = None
+    evaluated = pruned = 0
+
+    for size in range(1, n_families + 1):
+        subsets = np.array(list(combinations(range(n_families), size)), dtype=np.int64)
+        subset_overhead = overhead[subsets].sum(axis=1)
+        promising = subset_overhead + lower_bound < best_total
+        pruned += int((~promising).sum())
+        subsets = subsets[promising]
+
+        for start in range(0, len(subsets), _SUBSET_BATCH):
+            batch = subsets[start:start + _SUBSET_BATCH]
+            # (batch, cohorts): each cohort's cheapest family within the subset
+            assigned = cost[:, batch].min(axis=2).T
+            totals = assigned.sum(axis=1) + overhead[batch].sum(axis=1)
+            evaluated += len(batch)
+            i = int(np.argmin(totals))
+            if totals[i] < best_total:
+                best_total = float(totals[i])
+                best_subset = batch[i]
+
+        # Larger subsets pay at least this much overhead, so none can win
+        if overhead.min() * (size + 1) + lower_bound >= best_total:
+            break
+
+    return {"subset": best_subset, "total": best_total, "evaluated": evaluated, "pruned": pruned}
+
+
+def optimize_pool_mix(
+    cohorts: pd.DataFrame,
+    pool_overhead_nodes: float = DEFAULT_POOL_OVERHEAD_NODES,
+    hours_per_day: float = 8.0,
+    days_per_month: int = 22,
+    credit_rate: float = 4.0,
+    pool_prefix: str = "NOTEBOOK_POOL"
+) -> Dict:
+    """
+    Choose the set of compute pools that hosts every cohort at minimum credits.
+
+    A family whose cohorts need more than ``MAX_NODES`` nodes is split
+    across ``ceil(load / MAX_NODES)`` pools of that family sharing the load
+    evenly; each pool pays its own overhead and gets its own MIN_NODES. The
+    subset search charges one overhead per family, so the mix is exact
+    whenever no family needs splitting.
+
+    Args:
+        cohorts: DataFrame with ``COHORT_INPUT_COLUMNS`` (concurrent users and
+            per-user memory/vCPU needs) and optional gpu_required and
+            gpu_memory_gb_per_user columns, one row per user cohort
+        pool_overhead_nodes: Idle nodes charged for every pool in the mix
+        hours_per_day: Session hours per day, for monthly cost
+        days_per_month: Working days per month, for monthly cost
+        credit_rate: Cost per credit
+        pool_prefix: Prefix for the generated pool names
+
+    Returns:
+        Dictionary with ``pools`` (one row per pool in the mix, with its DDL),
+        ``assignments`` (cohort to instance family and pool, or the
+        comma-separated pools of a split family), the combined
+        ``migration_sql``, credits per hour and monthly cost of the mix and
+        of the best single-family pool, and search statistics
+    """
+    missing = [c for c in COHORT_INPUT_COLUMNS if c not in cohorts.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    if cohorts.empty:
+        raise ValueError("No cohorts to cover")
+
+    catalog = get_catalog()
+    table = catalog.pool_table
+    shares = _node_shares(cohorts)
+    cost = cohort_cost_matrix(cohorts)
+    uncovered = ~np.isfinite(cost).any(axis=1)
+    if np.any(uncovered):
+        names = ", ".join(cohorts["cohort"][uncovered].astype(str))
+        raise ValueError(f"No instance family fits a session of cohort: {names}")
+
+    overhead = pool_overhead_nodes * table["credits_per_hour"]
+    families = prune_families(cost, overhead)
+    if len(families) > MAX_MIX_FAMILIES:
+        raise ValueError(f"Too many candidate instance families ({len(families)}) for exact search")
+
+    # CPU and GPU cohorts never share a family, so each type is solved on its own
+    gpu_family = table["is_gpu"][families]
+    chosen: List[int] = []
+    evaluated = pruned = 0
+    for is_gpu in (False, True):
+        group = families[gpu_family == is_gpu]
+        rows = np.isfinite(cost[:, group]).any(axis=1) if len(group) else np.zeros(len(cohorts), bool)
+        if not rows.any():
+            continue
+        result = _search_subsets(cost[np.ix_(rows, group)], overhead[group])
+        chosen.extend(group[result["subset"]].tolist())
+        evaluated += result["evaluated"]
+        pruned += result["pruned"]
+
+    chosen = np.array(sorted(chosen), dtype=np.int64)
+    assignment = chosen[np.argmin(cost[:, chosen], axis=1)]
+
+    pools = catalog.compute_pools
+    heuristic = node_heuristic()
+    min_ratio = heuristic["min_nodes_per_user"] / heuristic["max_nodes_per_user"]
+
+    all_users = cohorts["users"].to_numpy(dtype=float)
+    family_members = [np.flatnonzero(assignment == family) for family in chosen]
+    family_load = [float((all_users[m] * shares[m, f]).sum()) for f, m in zip(chosen, family_members)]
+    shard_counts = [_pool_count(load) for load in family_load]
+
+    pool_rows = []
+    number = 0
+    for family, members, load, shards in zip(chosen, family_members, family_load, shard_counts):
+        pool = pools[family]
+        users = all_users[members]
+        shard_load = load / shards
+        max_nodes = int(max(1, np.ceil(shard_load - 1e-9)))
+        min_nodes = int(max(1, np.ceil(max_nodes * min_ratio - 1e-9)))
+        for _ in range(shards):
+            number += 1
+            name = f"{pool_prefix}_{number}" if sum(shard_counts) > 1 else pool_prefix
+            recommendation = {
+                "recommended_min_nodes": min_nodes,
+                "recommended_max_nodes": max_nodes,
+                "instance_family": pool.family,
+                "auto_suspend_minutes": DEFAULT_AUTO_SUSPEND_MINUTES,
+            }
+            pool_rows.append({
+                "pool_name": name,
+                "instance_family": pool.family,
+                "instance_type": pool.type,
+                "cohorts": cohorts["cohort"].to_numpy()[members].tolist(),
+                "users": float(users.sum()) / shards,
+                "load_nodes": shard_load,
+                "recommended_min_nodes": min_nodes,
+                "recommended_max_nodes": max_nodes,
+                "credits_per_hour": shard_load * pool.credits_per_hour + overhead[family],
+                "migration_sql": get_migration_sql(recommendation, name),
+            })
+    mix = pd.DataFrame(pool_rows, columns=MIX_POOL_COLUMNS)
+    # Cohorts of a split family are spread over all of its pools
+    family_pools = mix.groupby("instance_family", sort=False)["pool_name"].agg(", ".join)
+
+    # Baseline: every cohort on one family (one pool per CPU/GPU type in use,
+    # split the same way when it exceeds MAX_NODES)
+    load_matrix = all_users[:, None] * np.where(np.isfinite(shares), shares, 0)
+    single = 0.0
+    for is_gpu in (False, True):
+        of_type = np.flatnonzero(table["is_gpu"] == is_gpu)
+        rows = np.isfinite(cost[:, of_type]).any(axis=1)
+        if rows.any():
+            counts = np.array([_pool_count(load) for load in load_matrix[np.ix_(rows, of_type)].sum(axis=0)])
+            totals = cost[np.ix_(rows, of_type)].sum(axis=0) + overhead[of_type] * counts
+            single += float(totals.min())
+
+    monthly_hours = hours_per_day * days_per_month
+    mix_credits = float(mix["credits_per_hour"].sum())
+    return {
+        "pools": mix,
+        "assignments": pd.DataFrame({
+            "cohort": cohorts["cohort"].to_numpy(),
+            "instance_family": [pools[f].family for f in assignment],
+            "pool_name": family_pools.reindex([pools[f].family for f in assignment]).to_numpy(),
+        }),
+        "migration_sql": "\n\n".join(mix["migration_sql"]),
+        "credits_per_hour": mix_credits,
+        "monthly_cost": mix_credits * monthly_hours * credit_rate,
+        "single_family_credits_per_hour": single,
+        "single_family_monthly_cost": single * monthly_hours * credit_rate,
+        "candidate_families": [pools[f].family for f in families],
+        "evaluated_subsets": evaluated,
+        "pruned_subsets": pruned,
+    }
@@ -0,0 +1,236 @@
+"""Constraint-based search over compute pool configurations."""
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .catalog import SpecCatalog, get_catalog
+from .warehouse_mapping import MAX_NODES
+
+CONFIGURATION_COLUMNS = [
+    "instance_family",
+    "instance_type",
+    "node_count",
+    "total_memory_gb",
+    "total_vcpu",
+    "gpu_memory_gb",
+    "total_gpu_count",
+    "credits_per_hour",
+    "monthly_cost",
+]
+
+
+class ConfigurationIndex:
+    """
+    Every (instance family, node count) configuration, presorted by credits/hour.
+
+    Cost caps become a binary search for the affordable prefix; the resource
+    constraints are then a vectorized mask over that prefix, so results come
+    out already ordered by cost. Ties keep catalog order, then node count.
+    """
+
+    def __init__(self, catalog: SpecCatalog, max_nodes: int = MAX_NODES):
+        pools = catalog.compute_pools
+        nodes = np.arange(1, max_nodes + 1)
+
+        family = np.repeat(np.arange(len(pools)), max_nodes)
+        node_count = np.tile(nodes, len(pools))
+
+        table = catalog.pool_table[family]
+        memory = table["memory_gb"]
+        vcpu = table["vcpu"]
+        gpu_memory = table["gpu_memory_gb"]
+        gpu_count = table["gpu_count"]
+        rate = table["credits_per_hour"]
+
+        credits_per_hour = rate * node_count
+        order = np.lexsort((node_count, family, credits_per_hour))
+
+        self.max_nodes = max_nodes
+        self.families = np.array([p.family for p in pools], dtype=object)
+        self.types = np.array([p.type for p in pools], dtype=object)
+        self.family = family[order]
+        self.node_count = node_count[order]
+        self.total_memory_gb = (memory * node_count)[order]
+        self.total_vcpu = (vcpu * node_count)[order]
+        self.gpu_memory_gb = gpu_memory[order]
+        self.total_gpu_count = (gpu_count * node_count)[order]
+        self.credits_per_hour = credits_per_hour[order]
+
+    def affordable_prefix(self, max_credits_per_hour: float) -> int:
+        """Number of leading configurations within a credits/hour cap."""
+        # Small tolerance so a cap equal to a configuration's cost includes it
+        return int(np.searchsorted(
+            self.credits_per_hour, max_credits_per_hour * (1 + 1e-12), side="right"
+        ))
+
+    def feasible_mask(
+        self,
+        stop: int,
+        min_memory_gb: float,
+        min_vcpu: float,
+        min_gpu_memory_gb: float
+    ) -> np.ndarray:
+        """Resource feasibility of the first ``stop`` configurations."""
+        return (
+            (self.total_memory_gb[:stop] >= min_memory_gb) &
+            (self.total_vcpu[:stop] >= min_vcpu) &
+            (self.gpu_memory_gb[:stop] >= min_gpu_memory_gb)
+        )
+
+
+_indexes: Dict[int, ConfigurationIndex] = {}
+_index_version: Optional[int] = None
+_index_lock = threading.Lock()
+
+
+def get_configuration_index(max_nodes: int = MAX_NODES) -> ConfigurationIndex:
+    """Return the shared configuration index, rebuilt when the catalog reloads."""
+    global _index_version
+    catalog = get_catalog()
+    with _index_lock:
+        if _index_version != catalog.version:
+            _indexes.clear()
+            _index_version = catalog.version
+        if max_nodes not in _indexes:
+            _indexes[max_nodes] = ConfigurationIndex(catalog, max_nodes)
+        return _indexes[max_nodes]
+
+
+def _credit_cap(
+    max_credits_per_hour: Optional[float],
+    max_monthly_budget: Optional[float],
+    hours_per_day: float,
+    days_per_month: int,
+    credit_rate: float
+) -> float:
+    """Tightest credits/hour cap implied by the hourly and monthly limits."""
+    cap = np.inf if max_credits_per_hour is None else max_credits_per_hour
+    if max_monthly_budget is not None:
+        cap = min(cap, max_monthly_budget / (hours_per_day * days_per_month * credit_rate))
+    return cap
+
+
+def search_pool_configurations(
+    min_memory_gb: float = 0,
+    min_vcpu: float = 0,
+    min_gpu_memory_gb: float = 0,
+    max_credits_per_hour: Optional[float] = None,
+    max_monthly_budget: Optional[float] = None,
+    hours_per_day: float = 8.0,
+    days_per_month: int = 22,
+    credit_rate: float = 4.0,
+    max_nodes: int = MAX_NODES,
+    limit: Optional[int] = None
+) -> List[Dict]:
+    """
+    Find every compute pool configuration that meets hard constraints.
+
+    Memory and vCPU are totals across the pool's nodes; GPU memory is per
+    node, since a model has to fit on a single node's GPUs.
+
+    Args:
+        min_memory_gb: Minimum total memory across nodes
+        min_vcpu: Minimum total vCPU across nodes
+        min_gpu_memory_gb: Minimum GPU memory per node (>0 implies GPU families)
+        max_credits_per_hour: Maximum pool credits per hour
+        max_monthly_budget: Maximum projected monthly cost in dollars
+        hours_per_day: Session hours per day for the cost projection
+        days_per_month: Working days per month for the cost projection
+        credit_rate: Cost per credit for the cost projection
+        max_nodes: Largest node count to consider
+        limit: Return at most this many configurations
+
+    Returns:
+        Feasible configurations ordered by cost, cheapest first
+    """
+    index = get_configuration_index(max_nodes)
+    cap = _credit_cap(
+        max_credits_per_hour, max_monthly_budget, hours_per_day, days_per_month, credit_rate
+    )
+    stop = index.affordable_prefix(cap)
+    positions = np.flatnonzero(
+        index.feasible_mask(stop, min_memory_gb, min_vcpu, min_gpu_memory_gb)
+    )
+    if limit is not None:
+        positions = positions[:limit]
+
+    hours = hours_per_day * days_per_month
+    return [
+        {
+            "instance_family": index.families[index.family[i]],
+            "instance_type": index.types[index.family[i]],
+            "node_count": int(index.node_count[i]),
+            "total_memory_gb": float(index.total_memory_gb[i]),
+            "total_vcpu": float(index.total_vcpu[i]),
+            "gpu_memory_gb": float(index.gpu_memory_gb[i]),
+            "total_gpu_count": int(index.total_gpu_count[i]),
+            "credits_per_hour": float(index.credits_per_hour[i]),
+            "monthly_cost": float(index.credits_per_hour[i]) * hours * credit_rate
+        }
+        for i in positions
+    ]
+
+
+def cheapest_configurations(
+    constraints: pd.DataFrame,
+    hours_per_day: float = 8.0,
+    days_per_month: int = 22,
+    credit_rate: float = 4.0,
+    max_nodes: int = MAX_NODES
+) -> pd.DataFrame:
+    """
+    Cheapest feasible configuration for each row of a constraints table.
+
+    Evaluates all queries against the presorted index in one vectorized
+    pass. Missing constraint columns (or NaN values) are unconstrained.
+
+    Args:
+        constraints: DataFrame with any of min_memory_gb, min_vcpu,
+            min_gpu_memory_gb, max_credits_per_hour and max_monthly_budget
+        hours_per_day: Session hours per day for the cost projection
+        days_per_month: Working days per month for the cost projection
+        credit_rate: Cost per credit for the cost projection
+        max_nodes: Largest node count to consider
+
+    Returns:
+        DataFrame indexed like ``constraints`` with ``CONFIGURATION_COLUMNS``
+        and a ``feasible`` flag; infeasible rows have NaN configuration values
+    """
+    index = get_configuration_index(max_nodes)
+
+    def column(name: str, default: float) -> np.ndarray:
+        if name not in constraints.columns:
+            return np.full(len(constraints), default)
+        return constraints[name].fillna(default).to_numpy(dtype=float)
+
+    cap = np.minimum(
+        column("max_credits_per_hour", np.inf),
+        column("max_monthly_budget", np.inf) / (hours_per_day * days_per_month * credit_rate)
+    )
+    feasible = (
+        (index.total_memory_gb[None, :] >= column("min_memory_gb", 0)[:, None]) &
+        (index.total_vcpu[None, :] >= column("min_vcpu", 0)[:, None]) &
+        (index.gpu_memory_gb[None, :] >= column("min_gpu_memory_gb", 0)[:, None]) &
+        (index.credits_per_hour[None, :] <= cap[:, None] * (1 + 1e-12))
+    )
+
+    # The index is sorted by cost, so the first feasible column is the cheapest
+    first = np.argmax(feasible, axis=1)
+    found = feasible[np.arange(len(constraints)), first]
+
+    result = pd.DataFrame({
+        "instance_family": np.where(found, index.families[index.family[first]], None),
+        "instance_type": np.where(found, index.types[index.family[first]], None),
+        "node_count": np.where(found, index.node_count[first], np.nan),
+        "total_memory_gb": np.where(found, index.total_memory_gb[first], np.nan),
+        "total_vcpu": np.where(found, index.total_vcpu[first], np.nan),
+        "gpu_memory_gb": np.where(found, index.gpu_memory_gb[first], np.nan),
+        "total_gpu_count": np.where(found, index.total_gpu_count[first], np.nan),
+        "credits_per_hour": np.where(found, index.credits_per_hour[first], np.nan),
+    }, index=constraints.index)
+    result["monthly_cost"] = result["credits_per_hour"] * (hours_per_day * days_per_month) * credit_rate
+    result["feasible"] = found
+    return result
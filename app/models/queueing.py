@@ -0,0 +1,220 @@
+"""Erlang-C (M/M/c) node sizing against a session wait-time target.
+
+Each node hosts ``sessions_per_node`` notebook sessions, so a pool of ``n``
+nodes is an M/M/c queue with ``c = n * sessions_per_node`` servers. Sessions
+arrive as a Poisson process and hold a slot for an exponential time. The
+probability a session has to wait is Erlang C, and the wait of those that do
+is exponential with rate ``c * mu - lambda``, which gives the P95 wait in
+closed form.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .autoscaling import DEFAULT_SESSIONS_PER_NODE
+from .warehouse_mapping import MAX_NODES
+
+# Wait-time percentile that targets apply to
+TARGET_PERCENTILE = 95
+
+SIZING_INPUT_COLUMNS = ["arrival_rate_per_hour", "mean_session_minutes", "target_p95_wait_secs"]
+
+SIZING_COLUMNS = [
+    "nodes",
+    "servers",
+    "utilization",
+    "probability_wait",
+    "mean_wait_secs",
+    "p95_wait_secs",
+    "feasible",
+]
+
+
+def _wait_percentile(
+    erlang_c: np.ndarray,
+    drain_rate: np.ndarray,
+    percentile: float
+) -> np.ndarray:
+    """Wait time not exceeded by ``percentile`` percent of sessions."""
+    tail = 1 - percentile / 100
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wait = np.log(erlang_c / tail) / drain_rate
+    return np.where(erlang_c > tail, wait, 0.0)
+
+
+def size_nodes_for_wait_batch(
+    arrival_rate_per_hour: np.ndarray,
+    mean_session_minutes: np.ndarray,
+    target_wait_secs: np.ndarray,
+    sessions_per_node: np.ndarray = DEFAULT_SESSIONS_PER_NODE,
+    max_nodes: int = MAX_NODES
+) -> Dict[str, np.ndarray]:
+    """
+    Smallest node count whose P95 wait for a session slot meets a target, per row.
+
+    Erlang B is built up one server at a time with the stable recurrence
+    ``B(k) = A B(k-1) / (k + A B(k-1))`` for every row at once, and
+    converted to Erlang C at each whole node. Memory stays O(rows).
+
+    Args:
+        arrival_rate_per_hour: Session arrivals per hour
+        mean_session_minutes: Average session length
+        target_wait_secs: Target 95th percentile wait in seconds
+        sessions_per_node: Concurrent sessions one node can host
+        max_nodes: Largest node count to consider
+
+    Returns:
+        Dictionary of arrays keyed by ``SIZING_COLUMNS``; rows that cannot
+        meet the target within ``max_nodes`` report ``max_nodes`` with
+        ``feasible`` set to False
+    """
+    arrival, minutes, target, per_node = np.broadcast_arrays(
+        np.asarray(arrival_rate_per_hour, dtype=float),
+        np.asarray(mean_session_minutes, dtype=float),
+        np.asarray(target_wait_secs, dtype=float),
+        np.asarray(sessions_per_node, dtype=np.int64)
+    )
+    arrival, minutes, target, per_node = (
+        np.atleast_1d(a).ravel() for a in (arrival, minutes, target, per_node)
+    )
+    if np.any(per_node < 1):
+        raise ValueError("sessions_per_node must be at least 1")
+    if np.any(arrival < 0) or np.any(minutes <= 0):
+        raise ValueError("Arrival rates must be >= 0 and session lengths > 0")
+
+    lam = arrival / 3600
+    mu = 1 / (minutes * 60)
+    offered = lam / mu
+
+    rows = len(arrival)
+    nodes = np.full(rows, max_nodes, dtype=np.int64)
+    found = np.zeros(rows, dtype=bool)
+    p_wait = np.ones(rows)
+    mean_wait = np.full(rows, np.inf)
+    pct_wait = np.full(rows, np.inf)
+
+    # Only rows still searching are carried through the recurrence
+    active = np.arange(rows)
+    erlang_b = np.ones(rows)
+    for k in range(1, max_nodes * int(per_node.max()) + 1):
+        a = offered[active]
+        erlang_b = a * erlang_b / (k + a * erlang_b)
+
+        c = per_node[active]
+        at_node = (k % c == 0) & (k // c <= max_nodes)
+        if not np.any(at_node):
+            continue
+
+        idx = active[at_node]
+        a, b = a[at_node], erlang_b[at_node]
+        stable = a < k
+        drain = k * mu[idx] - lam[idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            erlang_c = np.where(stable, k * b / (k - a * (1 - b)), 1.0)
+            average = np.where(stable, erlang_c / drain, np.inf)
+        wait = np.where(stable, _wait_percentile(erlang_c, drain, TARGET_PERCENTILE), np.inf)
+
+        # Record the latest evaluation; rows meeting the target stop searching
+        p_wait[idx] = erlang_c
+        pct_wait[idx] = wait
+        mean_wait[idx] = average
+        nodes[idx] = k // c[at_node]
+        met = wait <= target[idx]
+        found[idx[met]] = True
+
+        done = np.zeros(len(active), dtype=bool)
+        done[np.flatnonzero(at_node)[met]] = True
+        done |= k // c >= max_nodes
+        if np.any(done):
+            active = active[~done]
+            erlang_b = erlang_b[~done]
+            if len(active) == 0:
+                break
+
+    servers = nodes * per_node
+    return {
+        "nodes": nodes,
+        "servers": servers,
+        "utilization": offered / servers,
+        "probability_wait": p_wait,
+        "mean_wait_secs": mean_wait,
+        "p95_wait_secs": pct_wait,
+        "feasible": found,
+    }
+
+
+def size_nodes_for_wait(
+    arrival_rate_per_hour: float,
+    mean_session_minutes: float,
+    target_p95_wait_secs: float,
+    sessions_per_node: int = DEFAULT_SESSIONS_PER_NODE,
+    max_nodes: int = MAX_NODES
+) -> Dict:
+    """
+    Cheapest node count whose P95 wait for a session slot meets a target.
+
+    Args:
+        arrival_rate_per_hour: Session arrivals per hour
+        mean_session_minutes: Average session length
+        target_p95_wait_secs: Target 95th percentile wait in seconds
+        sessions_per_node: Concurrent sessions one node can host
+        max_nodes: Largest node count to consider
+
+    Returns:
+        Dictionary keyed by ``SIZING_COLUMNS`` with scalar values
+    """
+    result = size_nodes_for_wait_batch(
+        arrival_rate_per_hour, mean_session_minutes, target_p95_wait_secs,
+        sessions_per_node, max_nodes
+    )
+    return {
+        "nodes": int(result["nodes"][0]),
+        "servers": int(result["servers"][0]),
+        "utilization": float(result["utilization"][0]),
+        "probability_wait": float(result["probability_wait"][0]),
+        "mean_wait_secs": float(result["mean_wait_secs"][0]),
+        "p95_wait_secs": float(result["p95_wait_secs"][0]),
+        "feasible": bool(result["feasible"][0]),
+    }
+
+
+def size_fleet_for_wait(
+    fleet: pd.DataFrame,
+    sessions_per_node: Optional[int] = None,
+    max_nodes: int = MAX_NODES
+) -> pd.DataFrame:
+    """
+    Size every pool in a fleet against its wait-time target in one call.
+
+    Args:
+        fleet: DataFrame with ``SIZING_INPUT_COLUMNS`` and an optional
+            sessions_per_node column
+        sessions_per_node: Override for the sessions_per_node column
+        max_nodes: Largest node count to consider
+
+    Returns:
+        DataFrame with ``SIZING_COLUMNS``, indexed like ``fleet``
+    """
+    missing = [c for c in SIZING_INPUT_COLUMNS if c not in fleet.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    if sessions_per_node is None:
+        if "sessions_per_node" in fleet.columns:
+            sessions_per_node = fleet["sessions_per_node"].to_numpy(dtype=np.int64)
+        else:
+            sessions_per_node = DEFAULT_SESSIONS_PER_NODE
+
+    result = size_nodes_for_wait_batch(
+        fleet["arrival_rate_per_hour"].to_numpy(dtype=float),
+        fleet["mean_session_minutes"].to_numpy(dtype=float),
+        fleet["target_p95_wait_secs"].to_numpy(dtype=float),
+        sessions_per_node,
+        max_nodes
+    )
+    return pd.DataFrame(
+        {col: np.broadcast_to(result[col], (len(fleet),)) for col in SIZING_COLUMNS},
+        index=fleet.index
+    )
@@ -0,0 +1,200 @@
+"""Compact, immutable record types for catalog specs and recommendations."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+class _Record:
+    """
+    Base for slotted, frozen records that still read like dicts.
+
+    Records support ``record["field"]``, ``record.get("field")``, ``keys()``,
+    ``items()`` and ``dict(record)`` so code written against the old dict
+    results keeps working. ``to_dict()`` returns a plain (nested) dict copy.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.__slots__
+
+    def values(self) -> Tuple[Any, ...]:
+        return self._astuple()
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return zip(self.__slots__, self._astuple())
+
+    def _astuple(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict copy, converting nested records too."""
+        return {
+            name: value.to_dict() if isinstance(value, _Record) else value
+            for name, value in self.items()
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _Record):
+            return type(self) is type(other) and self._astuple() == other._astuple()
+        if isinstance(other, Mapping):
+            return self.to_dict() == {
+                k: v.to_dict() if isinstance(v, _Record) else v for k, v in other.items()
+            }
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._astuple())
+
+    # Frozen slotted classes need explicit state handling for pickle/copy
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return self._astuple()
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
+Mapping.register(_Record)
+
+
+@dataclass(frozen=True, eq=False)
+class WarehouseSpec(_Record):
+    """Warehouse size specification."""
+
+    __slots__ = ("size", "code", "credits_per_hour", "memory_gb", "vcpu", "typical_use")
+
+    size: str
+    code: str
+    credits_per_hour: float
+    memory_gb: float
+    vcpu: float
+    typical_use: str
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "WarehouseSpec":
+        return cls(
+            size=data["size"],
+            code=data["code"],
+            credits_per_hour=data["credits_per_hour"],
+            memory_gb=data["memory_gb"],
+            vcpu=data["vcpu"],
+            typical_use=data.get("typical_use", "")
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class ComputePoolSpec(_Record):
+    """Compute pool instance family specification."""
+
+    __slots__ = (
+        "family", "type", "memory_gb", "vcpu", "credits_per_hour", "description",
+        "gpu_memory_gb", "gpu_count"
+    )
+
+    family: str
+    type: str
+    memory_gb: float
+    vcpu: float
+    credits_per_hour: float
+    description: str
+    gpu_memory_gb: Optional[float]
+    gpu_count: Optional[int]
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ComputePoolSpec":
+        return cls(
+            family=data["family"],
+            type=data["type"],
+            memory_gb=data["memory_gb"],
+            vcpu=data["vcpu"],
+            credits_per_hour=data["credits_per_hour"],
+            description=data.get("description", ""),
+            gpu_memory_gb=data.get("gpu_memory_gb"),
+            gpu_count=data.get("gpu_count")
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class GpuDetails(_Record):
+    """GPU resources of a recommended instance family."""
+
+    __slots__ = ("gpu_memory_gb", "gpu_count")
+
+    gpu_memory_gb: Optional[float]
+    gpu_count: Optional[int]
+
+    @classmethod
+    def from_pool(cls, pool: ComputePoolSpec) -> "GpuDetails":
+        return cls(gpu_memory_gb=pool.gpu_memory_gb, gpu_count=pool.gpu_count)
+
+
+@dataclass(frozen=True, eq=False)
+class PoolRecommendation(_Record):
+    """Compute pool recommendation, as returned by ``recommend_compute_pool``."""
+
+    __slots__ = (
+        "instance_family", "instance_type", "memory_gb", "vcpu", "credits_per_hour",
+        "description", "recommended_min_nodes", "recommended_max_nodes",
+        "auto_suspend_minutes", "gpu_details", "workload_multiplier", "original_warehouse"
+    )
+
+    instance_family: str
+    instance_type: str
+    memory_gb: float
+    vcpu: float
+    credits_per_hour: float
+    description: str
+    recommended_min_nodes: int
+    recommended_max_nodes: int
+    auto_suspend_minutes: int
+    gpu_details: Optional[GpuDetails]
+    workload_multiplier: float
+    original_warehouse: WarehouseSpec
+
+    @classmethod
+    def from_pool(
+        cls,
+        pool: ComputePoolSpec,
+        warehouse: WarehouseSpec,
+        min_nodes: int,
+        max_nodes: int,
+        auto_suspend_minutes: int,
+        workload_multiplier: float,
+        gpu_required: bool
+    ) -> "PoolRecommendation":
+        """Build a recommendation for an instance family and node range."""
+        return cls(
+            instance_family=pool.family,
+            instance_type=pool.type,
+            memory_gb=pool.memory_gb,
+            vcpu=pool.vcpu,
+            credits_per_hour=pool.credits_per_hour,
+            description=pool.description,
+            recommended_min_nodes=min_nodes,
+            recommended_max_nodes=max_nodes,
+            auto_suspend_minutes=auto_suspend_minutes,
+            gpu_details=GpuDetails.from_pool(pool) if gpu_required else None,
+            workload_multiplier=workload_multiplier,
+            original_warehouse=warehouse
+        )
@@ -0,0 +1,487 @@
+"""Run the monitoring SQL templates locally over exported ACCOUNT_USAGE data.
+
+The templates in ``data/sql_templates`` are written for Snowflake. This
+module loads exported METERING_HISTORY and QUERY_HISTORY files into an
+indexed SQLite database (standard library ``sqlite3``) and translates the
+Snowflake-specific functions the templates use, so the same queries can be
+run and charted without a Snowflake connection.
+
+Timestamps are stored as UTC text (``YYYY-MM-DD HH:MM:SS``), which sorts
+chronologically, works with SQLite's date functions and lets range filters
+use the ``(service_type, name, start_time)`` index.
+"""
+
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .exports import DEFAULT_EXPORT_CHUNK_SIZE, ExportSource, iter_export_chunks, parse_export_timestamps
+
+# Column name and type of every loaded column; other export columns are ignored.
+# TIMESTAMP columns are stored as UTC text (see TIMESTAMP_FORMAT).
+METERING_HISTORY_SCHEMA = [
+    ("service_type", "TEXT"),
+    ("name", "TEXT"),
+    ("entity_id", "INTEGER"),
+    ("start_time", "TIMESTAMP"),
+    ("end_time", "TIMESTAMP"),
+    ("credits_used", "REAL"),
+    ("credits_used_compute", "REAL"),
+    ("credits_used_cloud_services", "REAL"),
+]
+QUERY_HISTORY_SCHEMA = [
+    ("query_id", "TEXT"),
+    ("query_type", "TEXT"),
+    ("user_name", "TEXT"),
+    ("warehouse_name", "TEXT"),
+    ("query_tag", "TEXT"),
+    ("execution_status", "TEXT"),
+    ("start_time", "TIMESTAMP"),
+    ("end_time", "TIMESTAMP"),
+    ("total_elapsed_time", "REAL"),
+    ("bytes_scanned", "REAL"),
+]
+
+# Table name -> (schema, required columns, indexes)
+ACCOUNT_USAGE_TABLES = {
+    "metering_history": (
+        METERING_HISTORY_SCHEMA,
+        ("service_type", "name", "start_time", "credits_used"),
+        (("service_type", "name", "start_time"),),
+    ),
+    "query_history": (
+        QUERY_HISTORY_SCHEMA,
+        ("query_id", "start_time"),
+        (("execution_status", "start_time"), ("query_tag", "start_time")),
+    ),
+}
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# DATE_TRUNC unit -> strftime format of the truncated timestamp
+_TRUNC_FORMATS = {
+    "second": "%Y-%m-%d %H:%M:%S",
+    "minute": "%Y-%m-%d %H:%M:00",
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d 00:00:00",
+    "month": "%Y-%m-01 00:00:00",
+    "year": "%Y-01-01 00:00:00",
+}
+
+# DATEADD unit -> (SQLite modifier unit, multiplier)
+_DATEADD_UNITS = {
+    "second": ("seconds", 1),
+    "minute": ("minutes", 1),
+    "hour": ("hours", 1),
+    "day": ("days", 1),
+    "week": ("days", 7),
+    "month": ("months", 1),
+    "quarter": ("months", 3),
+    "year": ("years", 1),
+}
+
+# EXTRACT part -> strftime format
+_EXTRACT_FORMATS = {
+    "year": "%Y",
+    "month": "%m",
+    "day": "%d",
+    "hour": "%H",
+    "minute": "%M",
+    "second": "%S",
+    "dayofweek": "%w",
+    "dayofyear": "%j",
+}
+
+# Template query header, e.g. "-- Query 5: Compare warehouse vs compute pool costs"
+_QUERY_HEADER = re.compile(r"^--\s*Query\s+(\d+)\s*:", re.MULTILINE | re.IGNORECASE)
+
+def _mask_literals(sql: str) -> str:
+    """Blank out string literals and comments so scans only see SQL syntax."""
+    masked = list(sql)
+    i = 0
+    while i < len(sql):
+        if sql[i] == "'":
+            j = i + 1
+            while j < len(sql):
+                if sql[j] == "'" and sql[j + 1:j + 2] == "'":
+                    j += 2
+                    continue
+                if sql[j] == "'":
+                    break
+                j += 1
+            for k in range(i + 1, min(j, len(sql))):
+                masked[k] = " "
+            i = j + 1
+        elif sql.startswith("--", i):
+            j = sql.find("\n", i)
+            j = len(sql) if j < 0 else j
+            for k in range(i, j):
+                masked[k] = " "
+            i = j
+        else:
+            i += 1
+    return "".join(masked)
+
+
+def _call_arguments(sql: str, masked: str, start: int) -> Tuple[List[str], int]:
+    """Split the arguments of a call whose opening parenthesis ends at ``start``."""
+    depth = 1
+    args = []
+    arg_start = start
+    i = start
+    while i < len(masked):
+        c = masked[i]
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                args.append(sql[arg_start:i].strip())
+                return [a for a in args if a], i + 1
+        elif c == "," and depth == 1:
+            args.append(sql[arg_start:i].strip())
+            arg_start = i + 1
+        i += 1
+    raise ValueError("Unbalanced parentheses in SQL")
+
+
+def _rewrite_calls(sql: str, name: str, rewrite: Callable[[List[str]], str]) -> str:
+    """Replace every call of function ``name`` with ``rewrite(arguments)``."""
+    pattern = re.compile(rf"\b{name}\s*\(", re.IGNORECASE)
+    masked = _mask_literals(sql)
+    out = []
+    pos = 0
+    for match in pattern.finditer(masked):
+        if match.start() < pos:
+            continue
+        args, end = _call_arguments(sql, masked, match.end())
+        out.append(sql[pos:match.start()])
+        out.append(rewrite([_rewrite_calls(a, name, rewrite) for a in args]))
+        pos = end
+    out.append(sql[pos:])
+    return "".join(out)
+
+
+def _unit(arg: str) -> str:
+    """Date part of DATE_TRUNC / DATEADD / EXTRACT, quoted or bare."""
+    unit = arg.strip().strip("'\"").lower()
+    return unit[:-1] if unit.endswith("s") and unit[:-1] in _DATEADD_UNITS else unit
+
+
+def _date_trunc(args: List[str]) -> str:
+    if len(args) != 2:
+        raise ValueError("DATE_TRUNC takes a date part and an expression")
+    unit, expr = _unit(args[0]), args[1]
+    if unit == "week":
+        # Snowflake weeks start on Monday: step back six days, then forward to Monday
+        return f"strftime('%Y-%m-%d 00:00:00', {expr}, '-6 days', 'weekday 1')"
+    if unit == "quarter":
+        return (
+            f"printf('%s-%02d-01 00:00:00', strftime('%Y', {expr}), "
+            f"(CAST(strftime('%m', {expr}) AS INTEGER) - 1) / 3 * 3 + 1)"
+        )
+    if unit not in _TRUNC_FORMATS:
+        raise ValueError(f"Unsupported DATE_TRUNC part: {args[0]}")
+    return f"strftime('{_TRUNC_FORMATS[unit]}', {expr})"
+
+
+def _dateadd(args: List[str]) -> str:
+    if len(args) != 3:
+        raise ValueError("DATEADD takes a date part, an amount and an expression")
+    unit = _unit(args[0])
+    if unit not in _DATEADD_UNITS:
+        raise ValueError(f"Unsupported DATEADD part: {args[0]}")
+    modifier, multiplier = _DATEADD_UNITS[unit]
+    amount = f"({args[1]})" if multiplier == 1 else f"({args[1]}) * {multiplier}"
+    return f"datetime({args[2]}, {amount} || ' {modifier}')"
+
+
+def _extract(args: List[str]) -> str:
+    part, _, expr = args[0].partition(" ")
+    expr = re.sub(r"^\s*FROM\s+", "", expr, flags=re.IGNORECASE)
+    unit = _unit(part)
+    if unit not in _EXTRACT_FORMATS:
+        raise ValueError(f"Unsupported EXTRACT part: {part}")
+    return f"CAST(strftime('{_EXTRACT_FORMATS[unit]}', {expr}) AS INTEGER)"
+
+
+def translate_sql(sql: str, now: datetime) -> str:
+    """
+    Translate Snowflake SQL from the templates to SQLite.
+
+    ``SNOWFLAKE.ACCOUNT_USAGE.<VIEW>`` becomes the local table of the same
+    name. DATE_TRUNC, DATEADD and EXTRACT are rewritten with ``strftime`` and
+    ``datetime``; CURRENT_TIMESTAMP() and CURRENT_DATE() become literals of
+    ``now``. DATE() needs no change, since SQLite's ``date()`` returns the
+    same ``YYYY-MM-DD`` day. Window functions and FULL OUTER JOIN are native.
+
+    Args:
+        sql: Snowflake SQL, one or more statements
+        now: Timestamp CURRENT_TIMESTAMP() stands for
+
+    Returns:
+        SQLite SQL
+    """
+    sql = re.sub(
+        r"\bSNOWFLAKE\.ACCOUNT_USAGE\.(\w+)",
+        lambda m: m.group(1).lower(),
+        sql,
+        flags=re.IGNORECASE
+    )
+    sql = _rewrite_calls(sql, "DATE_TRUNC", _date_trunc)
+    sql = _rewrite_calls(sql, "DATEADD", _dateadd)
+    sql = _rewrite_calls(sql, "EXTRACT", _extract)
+    sql = re.sub(
+        r"\bCURRENT_TIMESTAMP\b(\s*\(\s*\))?",
+        f"'{now.strftime(TIMESTAMP_FORMAT)}'",
+        sql,
+        flags=re.IGNORECASE
+    )
+    sql = re.sub(
+        r"\bCURRENT_DATE\b(\s*\(\s*\))?",
+        f"'{now.strftime('%Y-%m-%d')}'",
+        sql,
+        flags=re.IGNORECASE
+    )
+    return sql
+
+
+def split_sql_statements(sql: str) -> List[str]:
+    """Split a script on semicolons outside string literals and comments."""
+    masked = _mask_literals(sql)
+    statements = []
+    start = 0
+    for i, c in enumerate(masked):
+        if c == ";":
+            statements.append(sql[start:i])
+            start = i + 1
+    statements.append(sql[start:])
+    return [s.strip() for s in statements if _mask_literals(s).strip()]
+
+
+def numbered_sql_statements(sql: str) -> Dict[int, str]:
+    """
+    Statements of a template keyed by their ``-- Query N:`` header.
+
+    A statement belongs to the last header in its leading comments; statements
+    without a header are left out. Callers pick queries by number, so adding
+    or reordering queries in a template does not shift which one they run.
+    """
+    numbered = {}
+    for statement in split_sql_statements(sql):
+        headers = _QUERY_HEADER.findall(statement)
+        if headers:
+            numbered[int(headers[-1])] = statement
+    return numbered
+
+
+def fill_placeholders(sql: str, placeholders: Optional[Dict[str, str]]) -> str:
+    """Replace template placeholders such as ``<YOUR_COMPUTE_POOL_NAME>``, escaping quotes."""
+    for placeholder, value in (placeholders or {}).items():
+        sql = sql.replace(placeholder, str(value).replace("'", "''"))
+    return sql
+
+
+def _to_timestamp_text(values: pd.Series) -> List[Optional[str]]:
+    """UTC ``YYYY-MM-DD HH:MM:SS`` text of exported timestamps, None where missing."""
+    codes, uniques = pd.factorize(parse_export_timestamps(values))
+    text = np.append(pd.Series(uniques).dt.strftime(TIMESTAMP_FORMAT).to_numpy(dtype=object), None)
+    return text[codes].tolist()
+
+
+class LocalSQLEngine:
+    """
+    SQLite database of exported ACCOUNT_USAGE views that runs the templates.
+
+    Load exports with ``load_metering_history`` / ``load_query_history``,
+    then run template SQL with ``query`` (one statement) or ``run_script``
+    (several; changes are rolled back unless ``persist=True``, so running the
+    budget setup script twice does not insert its budget twice).
+    CURRENT_TIMESTAMP() resolves to ``now`` if given, else to the latest
+    timestamp loaded, so the templates' "last N days" windows cover the
+    export rather than the day it is analyzed. The connection is shared
+    behind a lock, so one engine can serve several Streamlit sessions.
+    """
+
+    def __init__(self, path: str = ":memory:", now: Optional[datetime] = None):
+        self.path = path
+        self.now = now
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA synchronous = OFF")
+        self._conn.execute("PRAGMA temp_store = MEMORY")
+        for table, (schema, _, _) in ACCOUNT_USAGE_TABLES.items():
+            columns = ", ".join(
+                f"{name} {'TEXT' if sql_type == 'TIMESTAMP' else sql_type}" for name, sql_type in schema
+            )
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+        self._latest = self._latest_loaded()
+
+    def load_table(
+        self,
+        table: str,
+        source: ExportSource,
+        chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE
+    ) -> int:
+        """
+        Append an export to one of ``ACCOUNT_USAGE_TABLES``.
+
+        Rows are inserted in one transaction per call; indexes are created
+        after the first load and maintained by SQLite afterwards.
+
+        Args:
+            table: metering_history or query_history
+            source: Export path (CSV, JSON Lines or Parquet), DataFrame, or
+                iterable of DataFrames with the view's columns (any case)
+            chunk_size: Rows per chunk when reading a path
+
+        Returns:
+            Number of rows loaded
+        """
+        if table not in ACCOUNT_USAGE_TABLES:
+            raise ValueError(f"Unknown table: {table} (use {', '.join(ACCOUNT_USAGE_TABLES)})")
+        schema, required, indexes = ACCOUNT_USAGE_TABLES[table]
+        names = [name for name, _ in schema]
+
+        loaded = 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for chunk in iter_export_chunks(source, chunk_size, names):
+                    missing = [c for c in required if c not in chunk.columns]
+                    if missing:
+                        raise ValueError(f"Missing required columns for {table}: {', '.join(missing)}")
+
+                    # Columns absent from the export are left NULL rather than bound
+                    present = [(name, sql_type) for name, sql_type in schema if name in chunk.columns]
+                    values = []
+                    for name, sql_type in present:
+                        if sql_type == "TIMESTAMP":
+                            values.append(_to_timestamp_text(chunk[name]))
+                        elif sql_type == "REAL":
+                            values.append(pd.to_numeric(chunk[name], errors="coerce").tolist())
+                        else:
+                            column = chunk[name]
+                            values.append(column.astype(object).where(column.notna(), None).tolist())
+                    insert = (
+                        f"INSERT INTO {table} ({', '.join(name for name, _ in present)}) "
+                        f"VALUES ({', '.join('?' * len(present))})"
+                    )
+                    self._conn.executemany(insert, zip(*values))
+                    loaded += len(chunk)
+
+                for columns in indexes:
+                    self._conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(columns)} "
+                        f"ON {table} ({', '.join(columns)})"
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("ANALYZE")
+            self._latest = self._latest_loaded()
+        return loaded
+
+    def load_metering_history(self, source: ExportSource, chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE) -> int:
+        """Append an exported METERING_HISTORY; see ``load_table``."""
+        return self.load_table("metering_history", source, chunk_size)
+
+    def load_query_history(self, source: ExportSource, chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE) -> int:
+        """Append an exported QUERY_HISTORY; see ``load_table``."""
+        return self.load_table("query_history", source, chunk_size)
+
+    def row_counts(self) -> Dict[str, int]:
+        """Rows loaded per table."""
+        with self._lock:
+            return {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ACCOUNT_USAGE_TABLES
+            }
+
+    def _latest_loaded(self) -> Optional[str]:
+        """Latest start or end time in any table. Caller holds the lock or is the constructor."""
+        return self._conn.execute(
+            "SELECT MAX(t) FROM ("
+            "SELECT MAX(COALESCE(end_time, start_time)) AS t FROM metering_history "
+            "UNION ALL SELECT MAX(COALESCE(end_time, start_time)) FROM query_history)"
+        ).fetchone()[0]
+
+    @property
+    def reference_time(self) -> datetime:
+        """Timestamp CURRENT_TIMESTAMP() stands for: ``now``, else the latest loaded timestamp."""
+        if self.now is not None:
+            return self.now
+        if self._latest is None:
+            return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+        return datetime.strptime(self._latest, TIMESTAMP_FORMAT)
+
+    def _execute(self, statement: str) -> Optional[pd.DataFrame]:
+        """Run one translated statement; a DataFrame if it returns rows. Caller holds the lock."""
+        cursor = self._conn.execute(statement)
+        if cursor.description is None:
+            return None
+        return pd.DataFrame(cursor.fetchall(), columns=[d[0] for d in cursor.description])
+
+    def query(self, sql: str, placeholders: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Run a single Snowflake SELECT from the templates.
+
+        Args:
+            sql: One statement, e.g. a section of ``usage_queries.sql``
+            placeholders: Values for template placeholders such as
+                ``<YOUR_COMPUTE_POOL_NAME>``
+
+        Returns:
+            Result rows; timestamps are UTC text
+        """
+        statements = split_sql_statements(sql)
+        if len(statements) != 1:
+            raise ValueError(f"Expected one statement, got {len(statements)}; use run_script")
+        results = self.run_script(statements[0], placeholders)
+        if not results:
+            raise ValueError("Statement returned no result set")
+        return results[0]
+
+    def run_script(
+        self,
+        sql: str,
+        placeholders: Optional[Dict[str, str]] = None,
+        persist: bool = False
+    ) -> List[pd.DataFrame]:
+        """
+        Run every statement of a template script in order.
+
+        Args:
+            sql: Snowflake script, e.g. ``budget_setup.sql``
+            placeholders: Values for template placeholders
+            persist: Keep tables and rows the script creates; by default the
+                script runs in a transaction that is rolled back
+
+        Returns:
+            One DataFrame per statement that returns rows, in script order
+        """
+        translated = translate_sql(fill_placeholders(sql, placeholders), self.reference_time)
+        results = []
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for statement in split_sql_statements(translated):
+                    result = self._execute(statement)
+                    if result is not None:
+                        results.append(result)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT" if persist else "ROLLBACK")
+        return results
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,653 @@
+"""Columnar cache of METERING_HISTORY / QUERY_HISTORY exports.
+
+Large CSV exports are parsed once and written as Arrow IPC files,
+partitioned Hive-style by month and pool (``month=2024-01/name=MY_POOL``).
+Readers memory-map the files and prune in two ways: directories outside the
+requested months and pools are never opened, and only the requested columns
+are read. Streamlit reruns therefore read a few small column buffers instead
+of parsing the CSV again.
+
+IPC is used rather than Parquet because uncompressed IPC buffers can be
+memory-mapped and used without decoding. Requires pyarrow.
+"""
+
+import glob
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .exports import (
+    DEFAULT_EXPORT_CHUNK_SIZE,
+    PYARROW_AVAILABLE,
+    ExportSource,
+    iter_export_chunks,
+    parse_export_timestamps
+)
+from .sql_engine import METERING_HISTORY_SCHEMA, QUERY_HISTORY_SCHEMA
+
+if PYARROW_AVAILABLE:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+
+DEFAULT_USAGE_CACHE_DIR = os.environ.get(
+    "USAGE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "usage_cache")
+)
+
+# One cache per distinct upload lives under this root, evicted least recently used first
+UPLOAD_CACHE_ROOT = os.path.join(DEFAULT_USAGE_CACHE_DIR, "uploads")
+DEFAULT_MAX_UPLOAD_CACHES = 8
+DEFAULT_UPLOAD_CACHE_MAX_AGE = timedelta(days=7)
+
+# Cached view -> (column partitioned on as the pool, column schema, primary key). Metering
+# is keyed without ENTITY_ID: exports often omit it, and a name identifies one warehouse
+# or pool per hour, so the same row is deduplicated whether or not the column was exported.
+CACHE_SOURCES = {
+    "metering_history": ("name", METERING_HISTORY_SCHEMA, ("service_type", "name", "start_time")),
+    "query_history": ("warehouse_name", QUERY_HISTORY_SCHEMA, ("query_id",)),
+}
+
+# ACCOUNT_USAGE latency is hours; rows this far behind the high-water mark are still merged
+DEFAULT_LATE_WINDOW = timedelta(days=2)
+
+MANIFEST_FILE = "_manifest.json"
+KEY_INDEX_FILE = "_keys.arrow"
+DAILY_ROLLUP_FILE = "_daily_rollup.arrow"
+
+DAILY_ROLLUP_COLUMNS = ["month", "name", "service_type", "date", "credits_used", "measurements"]
+
+# Version of the key hashing in KEY_INDEX_FILE; stores with another version are re-indexed
+KEY_HASH_VERSION = 3
+
+# Stands in for a null key column value when hashing
+_NULL_KEY = "\x00null"
+
+_ARROW_TYPES = {"TEXT": "string", "REAL": "float64", "INTEGER": "int64", "TIMESTAMP": "timestamp[us]"}
+
+# Rows buffered per partition before a record batch is written
+_MIN_ROWS_PER_BATCH = 65_536
+
+
+def _require_pyarrow() -> None:
+    if not PYARROW_AVAILABLE:
+        raise ImportError("The usage cache requires pyarrow (pip install pyarrow)")
+
+
+def _source_spec(source: str):
+    if source not in CACHE_SOURCES:
+        raise ValueError(f"Unknown cache source: {source} (use {', '.join(CACHE_SOURCES)})")
+    return CACHE_SOURCES[source]
+
+
+def cache_schema(source: str = "metering_history") -> "pa.Schema":
+    """Arrow schema of a cached view, including the month partition column."""
+    _require_pyarrow()
+    _, columns, _ = _source_spec(source)
+    fields = [
+        pa.field(name, pa.type_for_alias(_ARROW_TYPES[sql_type])) for name, sql_type in columns
+    ]
+    return pa.schema(fields + [pa.field("month", pa.string())])
+
+
+def _partitioning(source: str) -> "ds.Partitioning":
+    pool_column, _, _ = _source_spec(source)
+    return ds.partitioning(
+        pa.schema([("month", pa.string()), (pool_column, pa.string())]),
+        flavor="hive"
+    )
+
+
+def chunk_to_table(chunk: pd.DataFrame, source: str = "metering_history") -> "pa.Table":
+    """
+    Convert one export chunk to the cache schema.
+
+    Timestamps are parsed to naive UTC, numbers coerced, and columns missing
+    from the export are null. Rows without a start_time are dropped, since
+    they cannot be placed in a month.
+    """
+    schema = cache_schema(source)
+    arrays = {}
+    for field in schema:
+        if field.name == "month":
+            continue
+        if field.name not in chunk.columns:
+            arrays[field.name] = pa.nulls(len(chunk), field.type)
+        elif pa.types.is_timestamp(field.type):
+            arrays[field.name] = pa.array(parse_export_timestamps(chunk[field.name]), field.type)
+        elif pa.types.is_string(field.type):
+            column = chunk[field.name]
+            arrays[field.name] = pa.array(column.astype(object).where(column.notna(), None), field.type)
+        else:
+            numbers = pd.to_numeric(chunk[field.name], errors="coerce")
+            arrays[field.name] = pa.array(numbers, field.type, from_pandas=True)
+
+    table = pa.table(arrays)
+    table = table.filter(pc.is_valid(table["start_time"]))
+    month = pc.strftime(table["start_time"], format="%Y-%m")
+    return table.append_column("month", month).cast(schema)
+
+
+def _source_dir(cache_dir: str, source: str) -> str:
+    return os.path.join(cache_dir, source)
+
+
+def _write_batches(batches: Iterator["pa.RecordBatch"], cache_dir: str, source: str, part_prefix: str) -> None:
+    """
+    Append record batches to the cache as new files, one per (month, pool) they touch.
+
+    Rows are buffered per partition into record batches of at least
+    ``_MIN_ROWS_PER_BATCH``, so scans read a few large batches per file
+    rather than many small ones.
+    """
+    ds.write_dataset(
+        batches,
+        _source_dir(cache_dir, source),
+        schema=cache_schema(source),
+        format="ipc",
+        partitioning=_partitioning(source),
+        basename_template=f"{part_prefix}-{{i}}.arrow",
+        existing_data_behavior="overwrite_or_ignore",
+        min_rows_per_group=_MIN_ROWS_PER_BATCH,
+        max_rows_per_group=4 * _MIN_ROWS_PER_BATCH
+    )
+
+
+def load_cache_manifest(cache_dir: str = DEFAULT_USAGE_CACHE_DIR, source: str = "metering_history") -> Dict:
+    """Manifest of a cached view, or {} if it has not been built."""
+    path = os.path.join(_source_dir(cache_dir, source), MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _write_manifest(cache_dir: str, source: str, manifest: Dict) -> None:
+    path = os.path.join(_source_dir(cache_dir, source), MANIFEST_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def _isoformat(value) -> Optional[str]:
+    return pd.Timestamp(value).isoformat(sep=" ") if value is not None else None
+
+
+def _sorted_partitions(partitions) -> List[List[str]]:
+    return sorted((list(p) for p in partitions), key=lambda p: (p[0], p[1] or ""))
+
+
+def _update_stats(stats: Dict, table: "pa.Table", pool_column: str) -> None:
+    """Accumulate row count, (month, pool) partitions and start_time range of a table."""
+    stats["rows"] += table.num_rows
+    keys = table.select(["month", pool_column]).group_by(["month", pool_column]).aggregate([])
+    stats["partitions"].update(zip(keys["month"].to_pylist(), keys[pool_column].to_pylist()))
+    low, high = (v.as_py() for v in pc.min_max(table["start_time"]).values())
+    stats["first"] = low if stats["first"] is None else min(stats["first"], low)
+    stats["last"] = high if stats["last"] is None else max(stats["last"], high)
+
+
+def _key_hashes(table: "pa.Table", source: str, key_columns: Sequence[str]) -> np.ndarray:
+    """
+    64-bit hash of each row's primary key.
+
+    Key columns are cast to their cache schema type and then to text, so a
+    key hashes the same whether its chunk had nulls in the column, had none
+    or lacked the column (which pandas would see as int64, float64 or object).
+    """
+    schema = cache_schema(source)
+    keys = pd.DataFrame({
+        name: pc.fill_null(
+            table[name].cast(schema.field(name).type).cast(pa.string()), _NULL_KEY
+        ).to_numpy(zero_copy_only=False)
+        for name in key_columns
+    })
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def _load_key_index(cache_dir: str, source: str) -> pd.DataFrame:
+    """Key hashes and start times of the rows inside the late-arrival window."""
+    path = os.path.join(_source_dir(cache_dir, source), KEY_INDEX_FILE)
+    if not os.path.exists(path):
+        return pd.DataFrame({"key": np.array([], dtype=np.uint64), "start_time": np.array([], dtype="datetime64[us]")})
+    with pa.memory_map(path) as source_file:
+        return pa.ipc.open_file(source_file).read_all().to_pandas()
+
+
+def _rebuild_key_index(cache_dir: str, source: str, since: datetime) -> pd.DataFrame:
+    """Key hashes of the stored rows with start_time at or after ``since``."""
+    _, _, key_columns = _source_spec(source)
+    columns = list(dict.fromkeys(list(key_columns) + ["start_time"]))
+    table = read_usage_table(cache_dir, source, columns, start=since)
+    return pd.DataFrame({
+        "key": _key_hashes(table, source, key_columns),
+        "start_time": table["start_time"].to_numpy(zero_copy_only=False),
+    })
+
+
+def _write_key_index(cache_dir: str, source: str, keys: pd.DataFrame) -> None:
+    path = os.path.join(_source_dir(cache_dir, source), KEY_INDEX_FILE)
+    table = pa.table({
+        "key": pa.array(keys["key"].to_numpy(), pa.uint64()),
+        "start_time": pa.array(keys["start_time"].to_numpy(dtype="datetime64[us]"), pa.timestamp("us")),
+    })
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def append_usage_cache(
+    export: ExportSource,
+    cache_dir: str = DEFAULT_USAGE_CACHE_DIR,
+    source: str = "metering_history",
+    chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE,
+    late_window: timedelta = DEFAULT_LATE_WINDOW
+) -> Dict:
+    """
+    Merge an export into the cache incrementally; existing files are never rewritten.
+
+    Each view keeps a high-water mark on start_time. Exports overlap the
+    previous one and ACCOUNT_USAGE delivers rows late, so rows up to
+    ``late_window`` before the mark are still accepted; rows older than
+    that were covered by earlier exports and are skipped as stale. Accepted
+    rows are dropped if their primary key (``CACHE_SOURCES``) is already in
+    the store, using a hash index of the keys inside the window, so the
+    first version of a row wins. New rows are written as new files, and the
+    (month, pool) partitions they touch are recorded in the manifest's
+    append log for ``changed_partitions``.
+
+    Because the first version wins, a METERING_HISTORY hour that Snowflake
+    re-sends with revised credits keeps the credits first stored; rebuild
+    the store with ``build_usage_cache`` from a fresh export to pick up
+    revisions.
+
+    Args:
+        export: Export path (CSV, JSON Lines or Parquet), DataFrame, or
+            iterable of DataFrames such as ``pd.read_csv(..., chunksize=...)``
+        cache_dir: Cache root; each view gets its own subdirectory
+        source: metering_history or query_history
+        chunk_size: Rows per chunk when reading a path
+        late_window: How far before the high-water mark rows are still accepted
+
+    Returns:
+        Summary of the append: rows read, appended, duplicate and stale,
+        the high-water mark before and after, and the changed partitions
+    """
+    _require_pyarrow()
+    pool_column, columns, key_columns = _source_spec(source)
+    os.makedirs(_source_dir(cache_dir, source), exist_ok=True)
+
+    manifest = load_cache_manifest(cache_dir, source)
+    watermark = manifest.get("last_start_time")
+    cutoff = pd.Timestamp(watermark) - late_window if watermark else None
+
+    if watermark and manifest.get("key_hash_version", 1) != KEY_HASH_VERSION:
+        keys = _rebuild_key_index(cache_dir, source, cutoff.to_pydatetime())
+    else:
+        keys = _load_key_index(cache_dir, source)
+    # pandas builds a hash table over the Index on first lookup and reuses it
+    key_index = pd.Index(keys["key"].to_numpy())
+    new_keys = []
+    stats = {"rows": 0, "partitions": set(), "first": None, "last": None}
+    counts = {"rows_read": 0, "duplicates": 0, "stale": 0}
+
+    def batches() -> Iterator["pa.RecordBatch"]:
+        nonlocal key_index
+        for chunk in iter_export_chunks(export, chunk_size, [name for name, _ in columns]):
+            counts["rows_read"] += len(chunk)
+            table = chunk_to_table(chunk, source)
+            if cutoff is not None:
+                fresh = pc.greater_equal(table["start_time"], pa.scalar(cutoff.to_datetime64(), pa.timestamp("us")))
+                counts["stale"] += table.num_rows - pc.sum(fresh).as_py()
+                table = table.filter(fresh)
+
+            hashes = _key_hashes(table, source, key_columns)
+            seen = key_index.get_indexer(hashes) >= 0
+            first_in_chunk = ~pd.Series(hashes).duplicated().to_numpy()
+            keep = ~seen & first_in_chunk
+            counts["duplicates"] += int((~keep).sum())
+            if not keep.any():
+                continue
+
+            table = table.filter(pa.array(keep))
+            new_keys.append(pd.DataFrame({
+                "key": hashes[keep],
+                "start_time": table["start_time"].to_numpy(zero_copy_only=False),
+            }))
+            key_index = key_index.append(pd.Index(hashes[keep]))
+            _update_stats(stats, table, pool_column)
+            yield from table.to_batches()
+
+    append_id = uuid.uuid4().hex[:12]
+    try:
+        _write_batches(batches(), cache_dir, source, f"part-{append_id}")
+    except BaseException:
+        # Leave the store as it was: drop the files this append wrote
+        pattern = os.path.join(_source_dir(cache_dir, source), "**", f"part-{append_id}-*.arrow")
+        for path in glob.glob(pattern, recursive=True):
+            os.remove(path)
+        raise
+
+    last = max(filter(None, [pd.Timestamp(watermark) if watermark else None, stats["last"]]), default=None)
+    first_seen = manifest.get("first_start_time")
+    first = min(filter(None, [pd.Timestamp(first_seen) if first_seen else None, stats["first"]]), default=None)
+
+    keys = pd.concat([keys] + new_keys, ignore_index=True)
+    if last is not None:
+        keys = keys[keys["start_time"] >= pd.Timestamp(last) - late_window]
+    _write_key_index(cache_dir, source, keys)
+
+    changed = _sorted_partitions(stats["partitions"])
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    entry = {
+        "append_id": append_id,
+        "appended_at": now,
+        "rows_read": counts["rows_read"],
+        "rows_appended": stats["rows"],
+        "duplicates": counts["duplicates"],
+        "stale": counts["stale"],
+        "watermark_before": watermark,
+        "watermark_after": _isoformat(last),
+        "changed_partitions": changed,
+    }
+    manifest = {
+        "source": source,
+        "key_hash_version": KEY_HASH_VERSION,
+        "rows": manifest.get("rows", 0) + stats["rows"],
+        "first_start_time": _isoformat(first),
+        "last_start_time": _isoformat(last),
+        "partitions": _sorted_partitions({tuple(p) for p in manifest.get("partitions", [])} | stats["partitions"]),
+        "built_at": manifest.get("built_at", now),
+        "updated_at": now,
+        "appends": manifest.get("appends", []) + [entry],
+    }
+    _write_manifest(cache_dir, source, manifest)
+    return entry
+
+
+def build_usage_cache(
+    export: ExportSource,
+    cache_dir: str = DEFAULT_USAGE_CACHE_DIR,
+    source: str = "metering_history",
+    chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE
+) -> Dict:
+    """
+    Convert an export into the partitioned Arrow cache, replacing any previous cache.
+
+    The export is streamed ``chunk_size`` rows at a time, so memory stays
+    bounded by the chunk size rather than the export size. Rows repeated
+    within the export are dropped by primary key.
+
+    Args:
+        export: Export path (CSV, JSON Lines or Parquet), DataFrame, or
+            iterable of DataFrames such as ``pd.read_csv(..., chunksize=...)``
+        cache_dir: Cache root; each view gets its own subdirectory
+        source: metering_history or query_history
+        chunk_size: Rows per chunk when reading a path
+
+    Returns:
+        The cache manifest: rows, time range and (month, pool) partitions
+    """
+    _require_pyarrow()
+    _source_spec(source)
+    target = _source_dir(cache_dir, source)
+    if os.path.isdir(target):
+        shutil.rmtree(target)
+    append_usage_cache(export, cache_dir, source, chunk_size)
+    return load_cache_manifest(cache_dir, source)
+
+
+def evict_upload_caches(
+    root: str = UPLOAD_CACHE_ROOT,
+    in_use: Optional[str] = None,
+    max_caches: int = DEFAULT_MAX_UPLOAD_CACHES,
+    max_age: timedelta = DEFAULT_UPLOAD_CACHE_MAX_AGE
+) -> List[str]:
+    """
+    Remove per-upload caches beyond the most recently used or older than ``max_age``.
+
+    Every subdirectory of ``root`` holding a cached view is one cache; its
+    modification time is its last use. ``in_use`` is marked as used now and
+    never removed. Readers that already memory-mapped an evicted file keep
+    their mapping until they close it.
+
+    Args:
+        root: Directory holding one cache per upload
+        in_use: Cache the caller is about to read
+        max_caches: Caches kept, including ``in_use``
+        max_age: Caches unused for longer are removed
+
+    Returns:
+        Paths of the removed caches
+    """
+    if in_use is not None and os.path.isdir(in_use):
+        os.utime(in_use)
+    if not os.path.isdir(root):
+        return []
+
+    caches = []
+    for entry in os.scandir(root):
+        if entry.is_dir() and any(os.path.isdir(os.path.join(entry.path, s)) for s in CACHE_SOURCES):
+            caches.append((entry.stat().st_mtime, entry.path))
+    caches.sort(reverse=True)
+
+    in_use = os.path.abspath(in_use) if in_use is not None else None
+    oldest = (datetime.now(timezone.utc) - max_age).timestamp()
+    kept = 1 if in_use is not None else 0
+    removed = []
+    for mtime, path in caches:
+        if os.path.abspath(path) == in_use:
+            continue
+        if kept < max_caches and mtime >= oldest:
+            kept += 1
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        removed.append(path)
+    return removed
+
+
+def changed_partitions(
+    cache_dir: str = DEFAULT_USAGE_CACHE_DIR,
+    source: str = "metering_history",
+    since_append: int = 0
+) -> List[List[str]]:
+    """
+    (month, pool) partitions changed by appends after the first ``since_append``.
+
+    Downstream aggregates store how many appends they have seen and pass it
+    here to recompute only the partitions that changed since.
+    """
+    appends = load_cache_manifest(cache_dir, source).get("appends", [])
+    changed = set()
+    for entry in appends[since_append:]:
+        changed.update(tuple(p) for p in entry["changed_partitions"])
+    return _sorted_partitions(changed)
+
+
+def open_usage_cache(cache_dir: str = DEFAULT_USAGE_CACHE_DIR, source: str = "metering_history") -> "ds.Dataset":
+    """Memory-mapped Arrow dataset over a cached view."""
+    _require_pyarrow()
+    target = _source_dir(cache_dir, source)
+    if not os.path.isdir(target):
+        raise ValueError(f"No {source} cache in {cache_dir}; run build_usage_cache first")
+    return ds.dataset(
+        target,
+        schema=cache_schema(source),
+        format="ipc",
+        partitioning=_partitioning(source),
+        filesystem=pafs.LocalFileSystem(use_mmap=True)
+    )
+
+
+def _cache_filter(
+    source: str,
+    pools: Optional[Sequence[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    service_type: Optional[str] = None
+):
+    """Filter expression; month and pool terms prune whole partitions."""
+    pool_column, _, _ = _source_spec(source)
+    terms = []
+    if pools is not None:
+        terms.append(ds.field(pool_column).isin(list(pools)))
+    if start is not None:
+        start = pd.Timestamp(start)
+        terms.append(ds.field("month") >= start.strftime("%Y-%m"))
+        terms.append(ds.field("start_time") >= pa.scalar(start.to_datetime64(), pa.timestamp("us")))
+    if end is not None:
+        end = pd.Timestamp(end)
+        terms.append(ds.field("month") <= end.strftime("%Y-%m"))
+        terms.append(ds.field("start_time") < pa.scalar(end.to_datetime64(), pa.timestamp("us")))
+    if service_type is not None:
+        terms.append(ds.field("service_type") == service_type)
+
+    expression = None
+    for term in terms:
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def read_usage_table(
+    cache_dir: str = DEFAULT_USAGE_CACHE_DIR,
+    source: str = "metering_history",
+    columns: Optional[Sequence[str]] = None,
+    pools: Optional[Sequence[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    service_type: Optional[str] = None
+) -> "pa.Table":
+    """
+    Read a pruned Arrow table from the cache.
+
+    Args:
+        cache_dir: Cache root
+        source: metering_history or query_history
+        columns: Columns to read; all by default
+        pools: Pool (or, for query_history, warehouse) names to keep
+        start: Keep rows with start_time at or after this naive UTC time
+        end: Keep rows with start_time before this naive UTC time
+        service_type: METERING_HISTORY service type to keep, e.g. COMPUTE_POOL
+
+    Returns:
+        Arrow table of the matching rows
+    """
+    dataset = open_usage_cache(cache_dir, source)
+    return dataset.to_table(
+        columns=list(columns) if columns is not None else None,
+        filter=_cache_filter(source, pools, start, end, service_type)
+    )
+
+
+def read_usage_cache(
+    cache_dir: str = DEFAULT_USAGE_CACHE_DIR,
+    source: str = "metering_history",
+    columns: Optional[Sequence[str]] = None,
+    pools: Optional[Sequence[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    service_type: Optional[str] = None
+) -> pd.DataFrame:
+    """Read a pruned DataFrame from the cache; see ``read_usage_table``."""
+    return read_usage_table(cache_dir, source, columns, pools, start, end, service_type).to_pandas()
+
+
+def daily_credit_usage(
+    cache_dir: str = DEFAULT_USAGE_CACHE_DIR,
+    pools: Optional[Sequence[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    service_type: Optional[str] = "COMPUTE_POOL"
+) -> List[Dict]:
+    """
+    Daily credits from the cached METERING_HISTORY, for ``create_credit_usage_timeline``.
+
+    Only start_time and credits_used are read, and the daily sums are
+    computed in Arrow without converting rows to pandas.
+
+    Returns:
+        List of {"date", "credits"} dictionaries in date order
+    """
+    table = read_usage_table(
+        cache_dir, "metering_history", ["start_time", "credits_used"], pools, start, end, service_type
+    )
+    days = pc.floor_temporal(table["start_time"], unit="day")
+    daily = pa.table({"date": days, "credits": table["credits_used"]}).group_by("date").aggregate(
+        [("credits", "sum")]
+    ).sort_by("date")
+    return [
+        {"date": date, "credits": credits}
+        for date, credits in zip(daily["date"].to_pylist(), daily["credits_sum"].to_pylist())
+    ]
+
+
+def cached_names(cache_dir: str = DEFAULT_USAGE_CACHE_DIR, service_type: Optional[str] = "COMPUTE_POOL") -> List[str]:
+    """Distinct METERING_HISTORY names of a service type in the cache, sorted."""
+    table = read_usage_table(cache_dir, "metering_history", ["name"], service_type=service_type)
+    return sorted(name for name in pc.unique(table["name"]).to_pylist() if name is not None)
+
+
+def refresh_daily_rollup(cache_dir: str = DEFAULT_USAGE_CACHE_DIR) -> Dict:
+    """
+    Bring the materialized daily credits per METERING_HISTORY name up to date.
+
+    The rollup records how many appends it has seen; only the (month, name)
+    partitions changed by later appends are re-read and re-aggregated, and
+    their rows replace the old ones. A day always falls in one month, so
+    each recomputed partition's days are complete.
+
+    Returns:
+        Dictionary with the ``rollup`` DataFrame (``DAILY_ROLLUP_COLUMNS``),
+        the ``recomputed_partitions`` and ``appends_applied``
+    """
+    manifest = load_cache_manifest(cache_dir, "metering_history")
+    if not manifest:
+        raise ValueError(f"No metering_history cache in {cache_dir}; run build_usage_cache first")
+    path = os.path.join(_source_dir(cache_dir, "metering_history"), DAILY_ROLLUP_FILE)
+
+    applied = 0
+    rollup = pd.DataFrame(columns=DAILY_ROLLUP_COLUMNS)
+    if os.path.exists(path):
+        with pa.memory_map(path) as source_file:
+            table = pa.ipc.open_file(source_file).read_all()
+        applied = int(table.schema.metadata[b"appends_applied"])
+        rollup = table.to_pandas()
+
+    changed = [p for p in changed_partitions(cache_dir, "metering_history", applied) if p[1] is not None]
+    if changed:
+        months = sorted({month for month, _ in changed})
+        names = sorted({name for _, name in changed})
+        rows = open_usage_cache(cache_dir, "metering_history").to_table(
+            columns=["month", "name", "service_type", "start_time", "credits_used"],
+            filter=ds.field("month").isin(months) & ds.field("name").isin(names)
+        ).to_pandas()
+        pairs = pd.MultiIndex.from_tuples([tuple(p) for p in changed], names=["month", "name"])
+        rows = rows[pd.MultiIndex.from_frame(rows[["month", "name"]]).isin(pairs)]
+
+        fresh = rows.assign(date=rows["start_time"].dt.floor("D")).groupby(
+            ["month", "name", "service_type", "date"], as_index=False
+        ).agg(credits_used=("credits_used", "sum"), measurements=("credits_used", "size"))
+        stale = pd.MultiIndex.from_frame(rollup[["month", "name"]]).isin(pairs) if len(rollup) else []
+        rollup = pd.concat([rollup[~np.asarray(stale, dtype=bool)], fresh], ignore_index=True)
+        rollup = rollup.sort_values(["name", "date"], ignore_index=True)[DAILY_ROLLUP_COLUMNS]
+
+    applied = len(manifest.get("appends", []))
+    table = pa.Table.from_pandas(rollup, preserve_index=False).replace_schema_metadata(
+        {"appends_applied": str(applied)}
+    )
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+
+    return {"rollup": rollup, "recomputed_partitions": changed, "appends_applied": applied}
@@ -1,120 +1,293 @@
 """Core logic for mapping warehouses to compute pools."""
 
-import json
-import os
-from typing import Dict, List, Optional
+import heapq
+from typing import Dict, List, Mapping, Optional, Tuple
 
+import numpy as np
 
-def load_warehouse_specs() -> List[Dict]:
-    """Load warehouse specifications from JSON."""
-    path = os.path.join(os.path.dirname(__file__), "../data/warehouse_specs.json")
-    with open(path, "r") as f:
-        data = json.load(f)
-    return data["warehouses"]
+from .autoscaling import DEFAULT_SESSIONS_PER_NODE
+from .catalog import get_catalog
+from .cost_calculator import calculate_compute_pool_cost
+from .records import PoolRecommendation, WarehouseSpec
 
+# Default workload multipliers applied to warehouse memory/CPU requirements;
+# calibrated values in data/recommender_params.json take precedence
+WORKLOAD_MULTIPLIERS = {
+    "SQL-heavy": 0.8,  # Notebooks use less than pure SQL
+    "ML-heavy": 1.5,   # ML needs more resources
+    "Balanced": 1.0,
+    "Interactive": 0.9  # Interactive sessions can be lighter
+}
+DEFAULT_WORKLOAD_MULTIPLIER = 1.0
 
-def load_compute_pool_specs() -> List[Dict]:
-    """Load compute pool specifications from JSON."""
-    path = os.path.join(os.path.dirname(__file__), "../data/compute_pool_specs.json")
-    with open(path, "r") as f:
-        data = json.load(f)
-    return data["instance_families"]
+# Default node heuristic: MIN_NODES for every 2 users, MAX_NODES one per user
+NODE_HEURISTIC = {
+    "min_nodes_per_user": 0.5,
+    "max_nodes_per_user": 1.0
+}
 
+# Auto-suspend recommendation based on workload
+AUTO_SUSPEND_MINUTES = {
+    "SQL-heavy": 10,
+    "ML-heavy": 30,
+    "Balanced": 15,
+    "Interactive": 5
+}
+DEFAULT_AUTO_SUSPEND_MINUTES = 15
 
-def get_warehouse_by_code(code: str) -> Optional[Dict]:
+# Largest node count considered for a single compute pool
+MAX_NODES = 100
+
+# vCPU mismatch is weighted more than memory mismatch when matching families
+VCPU_WEIGHT = 2
+
+
+def get_warehouse_by_code(code: str) -> Optional[WarehouseSpec]:
     """Get warehouse configuration by size code."""
-    warehouses = load_warehouse_specs()
-    for wh in warehouses:
-        if wh["code"] == code:
-            return wh
-    return None
+    return get_catalog().get_warehouse(code)
+
+
+def pool_match_score(pool: Dict, target_memory: float, target_vcpu: float) -> float:
+    """Distance between an instance family and a memory/vCPU target (lower is better)."""
+    memory_diff = abs(pool["memory_gb"] - target_memory)
+    vcpu_diff = abs(pool["vcpu"] - target_vcpu)
+    return memory_diff + (vcpu_diff * VCPU_WEIGHT)  # Weight vCPU more
+
+
+def _usable_params(values: Mapping) -> Dict[str, float]:
+    """Calibrated values that are finite positive numbers; others fall back to defaults."""
+    return {
+        k: v for k, v in values.items()
+        if isinstance(v, (int, float)) and not isinstance(v, bool) and np.isfinite(v) and v > 0
+    }
+
+
+def workload_multipliers() -> Dict[str, float]:
+    """Workload multipliers in effect: calibrated values over the defaults."""
+    calibrated = get_catalog().recommender_params.get("workload_multipliers", {})
+    return {**WORKLOAD_MULTIPLIERS, **_usable_params(calibrated)}
+
+
+def node_heuristic() -> Dict[str, float]:
+    """Nodes per concurrent user in effect: calibrated values over the defaults."""
+    calibrated = get_catalog().recommender_params.get("node_heuristic", {})
+    return {**NODE_HEURISTIC, **_usable_params(calibrated)}
+
+
+def users_node_range(concurrent_users) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Recommended (min, max) node counts for arrays of concurrent users.
+
+    Returns:
+        Tuple of int64 arrays
+    """
+    heuristic = node_heuristic()
+    users = np.asarray(concurrent_users, dtype=float)
+    # Tolerance keeps exact products (e.g. 4 x 0.5) from rounding up
+    min_nodes = np.maximum(1, np.ceil(users * heuristic["min_nodes_per_user"] - 1e-9))
+    max_nodes = np.maximum(min_nodes, np.ceil(users * heuristic["max_nodes_per_user"] - 1e-9))
+    return min_nodes.astype(np.int64), max_nodes.astype(np.int64)
+
+
+def recommended_node_range(concurrent_users: int) -> Tuple[int, int]:
+    """Recommended (min, max) node counts for a number of concurrent users."""
+    # Heuristic: 2 users per node for interactive workloads, unless calibrated
+    min_nodes, max_nodes = users_node_range(concurrent_users)
+    return int(min_nodes), int(max_nodes)
+
+
+def concurrency_node_range(
+    p50_concurrency,
+    max_concurrency,
+    sessions_per_node: int = DEFAULT_SESSIONS_PER_NODE
+):
+    """
+    Recommended (min, max) node counts from observed session concurrency.
+
+    MIN_NODES covers typical (median) concurrency and MAX_NODES covers the
+    observed peak, capped at ``MAX_NODES``. Works on scalars or arrays.
+    """
+    min_nodes = np.clip(np.ceil(np.asarray(p50_concurrency) / sessions_per_node), 1, MAX_NODES)
+    max_nodes = np.clip(np.ceil(np.asarray(max_concurrency) / sessions_per_node), min_nodes, MAX_NODES)
+    return min_nodes.astype(np.int64), max_nodes.astype(np.int64)
+
+
+def _resource_targets(
+    warehouse: Dict,
+    workload_type: str,
+    workload_multiplier: Optional[float] = None
+) -> Tuple[float, float, float]:
+    """Workload multiplier and the memory/vCPU targets it implies."""
+    multiplier = workload_multiplier
+    if multiplier is None:
+        multiplier = workload_multipliers().get(workload_type, DEFAULT_WORKLOAD_MULTIPLIER)
+    return multiplier, warehouse["memory_gb"] * multiplier, warehouse["vcpu"] * multiplier
 
 
 def recommend_compute_pool(
     warehouse_size: str,
     workload_type: str,
     concurrent_users: int,
-    gpu_required: bool = False
-) -> Dict:
+    gpu_required: bool = False,
+    target_p95_wait_secs: Optional[float] = None,
+    mean_session_minutes: float = 60.0,
+    concurrency: Optional[Mapping] = None,
+    workload_multiplier: Optional[float] = None
+) -> PoolRecommendation:
     """
     Recommend a compute pool configuration based on warehouse characteristics.
 
+    By default nodes are sized with a 2 users per node heuristic. When
+    ``concurrency`` (observed ``p50_concurrency`` and ``max_concurrency``,
+    e.g. a row of ``concurrency_from_file``) is given, the node range comes
+    from ``concurrency_node_range`` instead. When ``target_p95_wait_secs``
+    is set, the minimum node count is instead the cheapest one whose Erlang-C
+    P95 wait for a session slot meets the target, with sessions arriving at
+    ``concurrent_users / mean_session_minutes``.
+
     Args:
         warehouse_size: Warehouse size code (XS, S, M, L, XL, 2XL, 3XL, 4XL, 5XL, 6XL)
         workload_type: Type of workload (SQL-heavy, ML-heavy, Balanced, Interactive)
         concurrent_users: Expected number of concurrent users
         gpu_required: Whether GPU is needed
+        target_p95_wait_secs: Optional P95 wait target for queueing-based sizing
+        mean_session_minutes: Average session length for queueing-based sizing
+        concurrency: Optional observed concurrency statistics for history-based sizing
+        workload_multiplier: Optional multiplier overriding the workload type's
+            default, e.g. a calibrated one from ``classify_query_history``
 
     Returns:
-        Dictionary with recommendation details
+        PoolRecommendation record (readable like a dictionary) with recommendation details
     """
     warehouse = get_warehouse_by_code(warehouse_size)
     if not warehouse:
         raise ValueError(f"Unknown warehouse size: {warehouse_size}")
 
-    compute_pools = load_compute_pool_specs()
-
     # Apply workload multipliers to memory/CPU requirements
-    workload_multipliers = {
-        "SQL-heavy": 0.8,  # Notebooks use less than pure SQL
-        "ML-heavy": 1.5,   # ML needs more resources
-        "Balanced": 1.0,
-        "Interactive": 0.9  # Interactive sessions can be lighter
-    }
-
-    multiplier = workload_multipliers.get(workload_type, 1.0)
-    target_memory = warehouse["memory_gb"] * multiplier
-    target_vcpu = warehouse["vcpu"] * multiplier
+    multiplier, target_memory, target_vcpu = _resource_targets(
+        warehouse, workload_type, workload_multiplier
+    )
 
     # Filter by GPU requirement
-    if gpu_required:
-        candidates = [p for p in compute_pools if p["type"] == "GPU"]
-    else:
-        candidates = [p for p in compute_pools if p["type"] == "CPU"]
+    candidates = get_catalog().pools_of_type("GPU" if gpu_required else "CPU")
 
     # Find best match based on memory and vCPU
     best_match = None
     min_diff = float('inf')
 
     for pool in candidates:
-        memory_diff = abs(pool["memory_gb"] - target_memory)
-        vcpu_diff = abs(pool["vcpu"] - target_vcpu)
-        total_diff = memory_diff + (vcpu_diff * 2)  # Weight vCPU more
+        total_diff = pool_match_score(pool, target_memory, target_vcpu)
 
         if total_diff < min_diff:
             min_diff = total_diff
             best_match = pool
 
     # Calculate recommended node count
-    # Heuristic: 2 users per node for interactive workloads
-    min_nodes = max(1, (concurrent_users + 1) // 2)
-    max_nodes = max(min_nodes, concurrent_users)
+    min_nodes, max_nodes = recommended_node_range(concurrent_users)
+    if concurrency is not None:
+        observed = concurrency_node_range(
+            concurrency["p50_concurrency"], concurrency["max_concurrency"]
+        )
+        min_nodes, max_nodes = int(observed[0]), int(observed[1])
+    if target_p95_wait_secs is not None:
+        from .queueing import size_nodes_for_wait
+
+        sizing = size_nodes_for_wait(
+            concurrent_users * 60 / mean_session_minutes,  # Little's law
+            mean_session_minutes,
+            target_p95_wait_secs
+        )
+        min_nodes = sizing["nodes"]
+        max_nodes = max(min_nodes, max_nodes)
 
     # Auto-suspend recommendation based on workload
-    auto_suspend_minutes = {
-        "SQL-heavy": 10,
-        "ML-heavy": 30,
-        "Balanced": 15,
-        "Interactive": 5
-    }.get(workload_type, 15)
+    auto_suspend_minutes = AUTO_SUSPEND_MINUTES.get(
+        workload_type, DEFAULT_AUTO_SUSPEND_MINUTES
+    )
 
-    return {
-        "instance_family": best_match["family"],
-        "instance_type": best_match["type"],
-        "memory_gb": best_match["memory_gb"],
-        "vcpu": best_match["vcpu"],
-        "credits_per_hour": best_match["credits_per_hour"],
-        "description": best_match["description"],
-        "recommended_min_nodes": min_nodes,
-        "recommended_max_nodes": max_nodes,
-        "auto_suspend_minutes": auto_suspend_minutes,
-        "gpu_details": {
-            "gpu_memory_gb": best_match.get("gpu_memory_gb"),
-            "gpu_count": best_match.get("gpu_count")
-        } if gpu_required else None,
-        "workload_multiplier": multiplier,
-        "original_warehouse": warehouse
-    }
+    return PoolRecommendation.from_pool(
+        best_match,
+        warehouse,
+        min_nodes=min_nodes,
+        max_nodes=max_nodes,
+        auto_suspend_minutes=auto_suspend_minutes,
+        workload_multiplier=multiplier,
+        gpu_required=gpu_required
+    )
+
+
+def rank_compute_pools(
+    warehouse_size: str,
+    workload_type: str,
+    concurrent_users: int,
+    gpu_required: bool = False,
+    top_k: int = 3,
+    hours_per_day: float = 8.0,
+    days_per_month: int = 22,
+    credit_rate: float = 4.0
+) -> List[Dict]:
+    """
+    Rank the closest instance families for a warehouse.
+
+    Uses the same score as ``recommend_compute_pool``, so the first entry is
+    always its ``best_match``. Later entries are the fallbacks to use when a
+    family is unavailable (for example because of quota limits).
+
+    Args:
+        warehouse_size: Warehouse size code
+        workload_type: Type of workload
+        concurrent_users: Expected number of concurrent users
+        gpu_required: Whether GPU is needed
+        top_k: Number of candidates to return
+        hours_per_day: Session hours per day for the cost projection
+        days_per_month: Working days per month for the cost projection
+        credit_rate: Cost per credit for the cost projection
+
+    Returns:
+        List of candidate dictionaries ordered by score
+    """
+    warehouse = get_warehouse_by_code(warehouse_size)
+    if not warehouse:
+        raise ValueError(f"Unknown warehouse size: {warehouse_size}")
+
+    _, target_memory, target_vcpu = _resource_targets(warehouse, workload_type)
+    candidates = get_catalog().pools_of_type("GPU" if gpu_required else "CPU")
+
+    # Ties keep catalog order, matching the strict < in recommend_compute_pool
+    ranked = heapq.nsmallest(
+        top_k,
+        ((pool_match_score(pool, target_memory, target_vcpu), i, pool)
+         for i, pool in enumerate(candidates)),
+        key=lambda item: item[:2]
+    )
+
+    min_nodes, max_nodes = recommended_node_range(concurrent_users)
+    results = []
+    for rank, (score, _, pool) in enumerate(ranked, start=1):
+        pool_cost = calculate_compute_pool_cost(
+            {
+                "credits_per_hour": pool["credits_per_hour"],
+                "recommended_min_nodes": min_nodes,
+                "recommended_max_nodes": max_nodes
+            },
+            hours_per_day,
+            days_per_month,
+            credit_rate
+        )
+        results.append({
+            "rank": rank,
+            "instance_family": pool["family"],
+            "instance_type": pool["type"],
+            "memory_gb": pool["memory_gb"],
+            "vcpu": pool["vcpu"],
+            "score": score,
+            "credits_per_hour": pool["credits_per_hour"],
+            "cost_per_node_hour": pool["credits_per_hour"] * credit_rate,
+            "avg_node_count": pool_cost["avg_node_count"],
+            "projected_monthly_cost": pool_cost["monthly_cost"]
+        })
+
+    return results
 
 
 def get_migration_sql(recommendation: Dict, pool_name: str = "NOTEBOOK_POOL") -> str:
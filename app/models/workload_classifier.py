@@ -0,0 +1,254 @@
+"""Workload-type classification from exported QUERY_HISTORY.
+
+The calculator's workload type (SQL-heavy, ML-heavy, Balanced, Interactive)
+is normally picked by hand. This module derives it per warehouse from the
+queries the warehouse actually ran: the query-type mix, bytes scanned,
+spilling and the share of Python (UDF / Snowpark) work. Exports are streamed
+in chunks and reduced to per-warehouse sums, so memory is bounded by the
+number of warehouses rather than the number of queries.
+"""
+
+import re
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .exports import DEFAULT_EXPORT_CHUNK_SIZE, read_export
+from .warehouse_mapping import workload_multipliers
+
+# QUERY_TYPE values that write data (ETL / ELT work)
+DML_QUERY_TYPES = frozenset({
+    "INSERT",
+    "UPDATE",
+    "DELETE",
+    "MERGE",
+    "COPY",
+    "UNLOAD",
+    "CREATE_TABLE_AS_SELECT",
+    "INSERT_MULTI_TABLE",
+})
+
+# QUERY_TEXT markers of Python work: UDF/procedure definitions and the
+# temporary objects Snowpark Python creates. This only sees DDL and Snowpark
+# sessions; calls to existing Python UDFs look like SQL unless their names are
+# added with ``python_pattern_with_udfs``.
+DEFAULT_PYTHON_PATTERN = r"LANGUAGE\s+PYTHON|SNOWPARK_TEMP_|SYSTEM\$SNOWPARK"
+
+# Queries faster than this count as interactive
+SHORT_QUERY_MS = 5000
+
+# Classification thresholds; rules are applied in the order of ``classify_workloads``
+CLASSIFIER_THRESHOLDS = {
+    "ml_python_share": 0.20,
+    "ml_spill_share": 0.05,
+    "sql_gb_scanned_per_query": 1.0,
+    "sql_dml_share": 0.30,
+    "interactive_short_share": 0.60,
+    "interactive_gb_scanned_per_query": 0.1,
+}
+
+# Each unit of spill share raises the multiplier by this fraction
+SPILL_MULTIPLIER_WEIGHT = 0.5
+MAX_WORKLOAD_MULTIPLIER = 2.0
+
+QUERY_HISTORY_COLUMNS = [
+    "warehouse_name",
+    "query_type",
+    "bytes_scanned",
+    "bytes_spilled_to_local_storage",
+    "bytes_spilled_to_remote_storage",
+    "total_elapsed_time",
+    "query_text",
+]
+
+WORKLOAD_FEATURE_COLUMNS = [
+    "warehouse_name",
+    "queries",
+    "select_share",
+    "dml_share",
+    "python_share",
+    "spill_share",
+    "short_query_share",
+    "gb_scanned_per_query",
+    "gb_spilled",
+    "workload_type",
+    "workload_multiplier",
+]
+
+# Per-warehouse sums accumulated across chunks
+_SUM_COLUMNS = ["queries", "selects", "dml", "python", "spilled", "short", "bytes_scanned", "bytes_spilled"]
+
+
+def _numeric(chunk: pd.DataFrame, column: str) -> np.ndarray:
+    """Numeric values of an optional column, 0 where missing."""
+    if column not in chunk.columns:
+        return np.zeros(len(chunk))
+    return pd.to_numeric(chunk[column], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+
+def python_pattern_with_udfs(udf_names: Iterable[str], base_pattern: str = DEFAULT_PYTHON_PATTERN) -> str:
+    """
+    Extend a Python-marker pattern with call sites of known Python UDFs/UDTFs.
+
+    A name matches when it is called, optionally schema-qualified, e.g.
+    ``score(`` or ``ml.features.score (``.
+
+    Args:
+        udf_names: Names of existing Python UDFs, UDTFs or procedures
+        base_pattern: Pattern to extend
+
+    Returns:
+        Regular expression for ``python_pattern`` arguments
+    """
+    names = sorted({name.strip() for name in udf_names if name and name.strip()})
+    if not names:
+        return base_pattern
+    calls = "|".join(re.escape(name) for name in names)
+    return rf"{base_pattern}|(?<![\w$])(?:{calls})\s*\("
+
+
+def chunk_workload_sums(chunk: pd.DataFrame, python_pattern: str = DEFAULT_PYTHON_PATTERN) -> pd.DataFrame:
+    """
+    Reduce one chunk of QUERY_HISTORY to per-warehouse feature sums.
+
+    Only warehouse_name and query_type are required; missing byte, timing
+    or text columns count as zero. Queries without a warehouse are skipped.
+
+    Returns:
+        DataFrame indexed by warehouse name
+    """
+    missing = [c for c in ("warehouse_name", "query_type") if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    chunk = chunk[chunk["warehouse_name"].notna()]
+    query_type = chunk["query_type"].astype(str).str.upper()
+    spilled = (
+        _numeric(chunk, "bytes_spilled_to_local_storage") +
+        _numeric(chunk, "bytes_spilled_to_remote_storage")
+    )
+
+    if "query_text" in chunk.columns:
+        python = chunk["query_text"].astype(str).str.contains(python_pattern, case=False, regex=True)
+        python = python.to_numpy(dtype=bool)
+    else:
+        python = np.zeros(len(chunk), dtype=bool)
+
+    if "total_elapsed_time" in chunk.columns:
+        short = _numeric(chunk, "total_elapsed_time") < SHORT_QUERY_MS
+    else:
+        short = np.zeros(len(chunk), dtype=bool)
+
+    sums = pd.DataFrame({
+        "queries": 1,
+        "selects": (query_type == "SELECT").to_numpy(),
+        "dml": query_type.isin(DML_QUERY_TYPES).to_numpy(),
+        "python": python,
+        "spilled": spilled > 0,
+        "short": short,
+        "bytes_scanned": _numeric(chunk, "bytes_scanned"),
+        "bytes_spilled": spilled,
+    }, index=chunk.index, columns=_SUM_COLUMNS)
+    return sums.groupby(chunk["warehouse_name"].to_numpy(), sort=False).sum()
+
+
+def classify_workloads(features: pd.DataFrame) -> pd.DataFrame:
+    """
+    Assign a workload type and multiplier to per-warehouse features.
+
+    Rules, first match wins: a notable Python share or frequent spilling
+    is ML-heavy; large scans or a high DML share is SQL-heavy; mostly short,
+    small queries are Interactive; anything else is Balanced. The multiplier
+    starts from the workload type's multiplier in effect and grows with the spill share, since
+    spilling means the warehouse is already short of memory.
+
+    Args:
+        features: DataFrame with the share and per-query feature columns of
+            ``WORKLOAD_FEATURE_COLUMNS``
+
+    Returns:
+        Copy of ``features`` with workload_type and workload_multiplier set
+    """
+    t = CLASSIFIER_THRESHOLDS
+    ml = (features["python_share"] >= t["ml_python_share"]) | (features["spill_share"] >= t["ml_spill_share"])
+    sql = (
+        (features["gb_scanned_per_query"] >= t["sql_gb_scanned_per_query"]) |
+        (features["dml_share"] >= t["sql_dml_share"])
+    )
+    interactive = (
+        (features["short_query_share"] >= t["interactive_short_share"]) &
+        (features["gb_scanned_per_query"] < t["interactive_gb_scanned_per_query"])
+    )
+
+    result = features.copy()
+    result["workload_type"] = np.select(
+        [ml.to_numpy(), sql.to_numpy(), interactive.to_numpy()],
+        ["ML-heavy", "SQL-heavy", "Interactive"],
+        default="Balanced"
+    )
+    base = result["workload_type"].map(workload_multipliers()).to_numpy(dtype=float)
+    multiplier = base * (1 + SPILL_MULTIPLIER_WEIGHT * features["spill_share"].to_numpy(dtype=float))
+    result["workload_multiplier"] = np.round(np.minimum(multiplier, MAX_WORKLOAD_MULTIPLIER), 2)
+    return result
+
+
+def classify_query_history_chunks(
+    chunks: Iterable[pd.DataFrame],
+    python_pattern: str = DEFAULT_PYTHON_PATTERN
+) -> pd.DataFrame:
+    """
+    Classify every warehouse in a stream of QUERY_HISTORY chunks.
+
+    Args:
+        chunks: DataFrames with lower-case QUERY_HISTORY columns
+        python_pattern: Regular expression marking Python queries in QUERY_TEXT
+
+    Returns:
+        DataFrame with ``WORKLOAD_FEATURE_COLUMNS``, one row per warehouse
+    """
+    partials = [chunk_workload_sums(chunk, python_pattern) for chunk in chunks]
+    if partials:
+        sums = pd.concat(partials).groupby(level=0, sort=True).sum()
+    else:
+        sums = pd.DataFrame(columns=_SUM_COLUMNS, dtype=float)
+
+    queries = sums["queries"].to_numpy(dtype=float)
+    features = pd.DataFrame({
+        "warehouse_name": sums.index.to_numpy(),
+        "queries": queries.astype(np.int64),
+        "select_share": sums["selects"].to_numpy(dtype=float) / queries,
+        "dml_share": sums["dml"].to_numpy(dtype=float) / queries,
+        "python_share": sums["python"].to_numpy(dtype=float) / queries,
+        "spill_share": sums["spilled"].to_numpy(dtype=float) / queries,
+        "short_query_share": sums["short"].to_numpy(dtype=float) / queries,
+        "gb_scanned_per_query": sums["bytes_scanned"].to_numpy(dtype=float) / queries / 1e9,
+        "gb_spilled": sums["bytes_spilled"].to_numpy(dtype=float) / 1e9,
+    })
+    return classify_workloads(features)[WORKLOAD_FEATURE_COLUMNS]
+
+
+def classify_query_history(
+    path: str,
+    python_pattern: str = DEFAULT_PYTHON_PATTERN,
+    chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE
+) -> pd.DataFrame:
+    """
+    Classify every warehouse in an exported QUERY_HISTORY file.
+
+    Reads only the columns the classifier uses, ``chunk_size`` rows at a time;
+    CSV, JSON Lines and Parquet exports are supported.
+
+    Args:
+        path: QUERY_HISTORY export
+        python_pattern: Regular expression marking Python queries in QUERY_TEXT
+        chunk_size: Rows per chunk
+
+    Returns:
+        DataFrame with ``WORKLOAD_FEATURE_COLUMNS``, one row per warehouse
+    """
+    return classify_query_history_chunks(
+        read_export(path, chunk_size, columns=QUERY_HISTORY_COLUMNS),
+        python_pattern
+    )
+
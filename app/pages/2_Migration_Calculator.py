@@ -3,6 +3,7 @@
 import streamlit as st
 import sys
 import os
+import numpy as np
 import pandas as pd
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -13,17 +14,28 @@ from components import (
     create_disclaimer,
     create_cost_comparison_chart,
     create_resource_comparison,
+    create_sensitivity_heatmap,
+    create_pareto_frontier_chart,
+    create_cost_distribution_chart,
+    create_break_even_chart,
     create_pdf_download_button,
     format_table_for_pdf,
     format_sql_for_pdf
 )
 
 from models import (
-    recommend_compute_pool,
-    get_warehouse_by_code,
+    get_catalog,
+    reload_catalog,
+    rank_compute_pools,
     get_migration_sql,
-    compare_costs,
-    load_warehouse_specs
+    load_warehouse_specs,
+    cost_sensitivity_grid,
+    break_even_vectorized,
+    cached_compare_costs,
+    explore_pareto_frontier,
+    simulate_recommendation,
+    monte_carlo_compare_costs,
+    triangular_spec
 )
 
 st.set_page_config(
@@ -34,6 +46,9 @@ st.set_page_config(
 
 inject_custom_css()
 
+# Pick up spec or recommender_params.json changes (e.g. a new calibration) without a restart
+reload_catalog(only_if_changed=True)
+
 st.title("🧮 Migration Calculator")
 
 st.markdown("""
@@ -105,25 +120,77 @@ with col2:
         help="Your Snowflake credit rate (default: $4)"
     )
 
+# Results below the recommendation are cached on the stored inputs, so widget
+# changes elsewhere on the page rerun the script without recomputing them.
+# catalog_version is part of the key so a reloaded catalog invalidates them.
+@st.cache_data(show_spinner=False)
+def cached_pareto_frontier(inputs, catalog_version):
+    """Every family and node count for the recommended instance type, priced at the stored inputs."""
+    recommendation, _ = cached_compare_costs(**inputs)
+    return explore_pareto_frontier(
+        hours_per_day=inputs['hours_per_day'],
+        credit_rate=inputs['credit_rate'],
+        max_nodes=max(10, recommendation['recommended_max_nodes'] * 2),
+        instance_type=recommendation['instance_type']
+    )
+
+
+@st.cache_data(show_spinner=False)
+def cached_sensitivity_grid(inputs, catalog_version):
+    """Savings over session hours and node counts for the stored inputs."""
+    recommendation, _ = cached_compare_costs(**inputs)
+    return cost_sensitivity_grid(
+        recommendation['original_warehouse'],
+        recommendation,
+        hours_per_day=np.arange(1.0, 24.5, 0.5),
+        avg_node_count=np.arange(1, max(10, recommendation['recommended_max_nodes'] * 2) + 1),
+        credit_rate=[inputs['credit_rate']]
+    )
+
+
+@st.cache_data(show_spinner=False)
+def cached_cost_uncertainty(inputs, catalog_version, hours_range, days_range, users_range):
+    """Monte Carlo cost distribution for the stored inputs and usage ranges."""
+    recommendation, _ = cached_compare_costs(**inputs)
+    return monte_carlo_compare_costs(
+        recommendation['original_warehouse'],
+        recommendation,
+        hours_per_day=triangular_spec(hours_range[0], inputs['hours_per_day'], hours_range[1]),
+        days_per_month=triangular_spec(days_range[0], 22, days_range[1]),
+        concurrent_users=triangular_spec(users_range[0], inputs['concurrent_users'], users_range[1]),
+        credit_rate=inputs['credit_rate'],
+        seed=0
+    )
+
+
+@st.cache_data(show_spinner=False)
+def cached_autoscaling_simulation(inputs, catalog_version, mean_session_minutes):
+    """Simulated month of sessions on the recommended pool for the stored inputs."""
+    recommendation, _ = cached_compare_costs(**inputs)
+    return simulate_recommendation(
+        recommendation,
+        concurrent_users=inputs['concurrent_users'],
+        hours_per_day=inputs['hours_per_day'],
+        credit_rate=inputs['credit_rate'],
+        mean_session_minutes=mean_session_minutes
+    )
+
+
 # Calculate Button
 if st.button("🔍 Calculate Recommendation", type="primary", use_container_width=True):
 
     # Store results in session state
     try:
-        warehouse = get_warehouse_by_code(warehouse_size)
-        recommendation = recommend_compute_pool(
+        # Memoized across reruns and sessions; misses are served from the precomputed table
+        recommendation, comparison = cached_compare_costs(
             warehouse_size=warehouse_size,
             workload_type=workload_type,
             concurrent_users=concurrent_users,
-            gpu_required=gpu_required
-        )
-
-        comparison = compare_costs(
-            warehouse=warehouse,
-            recommendation=recommendation,
+            gpu_required=gpu_required,
             hours_per_day=hours_per_day,
             credit_rate=credit_rate
         )
+        warehouse = recommendation['original_warehouse']
 
         st.session_state['calculation_done'] = True
         st.session_state['warehouse'] = warehouse
@@ -150,6 +217,7 @@ if st.session_state.get('calculation_done', False):
     comparison = st.session_state['comparison']
     warehouse = st.session_state['warehouse']
     inputs = st.session_state['inputs']
+    catalog_version = get_catalog().version
 
     # Key Metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -271,6 +339,277 @@ if st.session_state.get('calculation_done', False):
 
     st.markdown("---")
 
+    # Alternative Instance Families
+    st.markdown("### 🥈 Alternative Instance Families")
+
+    st.markdown("""
+    Next-best matches for your workload, in case the recommended family is unavailable
+    (for example due to quota limits). Lower match scores are closer to your warehouse's resources.
+    """)
+
+    alternatives = rank_compute_pools(
+        warehouse_size=inputs['warehouse_size'],
+        workload_type=inputs['workload_type'],
+        concurrent_users=inputs['concurrent_users'],
+        gpu_required=inputs['gpu_required'],
+        top_k=3,
+        hours_per_day=inputs['hours_per_day'],
+        credit_rate=inputs['credit_rate']
+    )
+
+    df_alternatives = pd.DataFrame({
+        "Rank": [a['rank'] for a in alternatives],
+        "Instance Family": [a['instance_family'] for a in alternatives],
+        "Memory (GB)": [a['memory_gb'] for a in alternatives],
+        "vCPU": [a['vcpu'] for a in alternatives],
+        "Match Score": [f"{a['score']:.1f}" for a in alternatives],
+        "Cost/Node/Hour": [f"${a['cost_per_node_hour']:,.2f}" for a in alternatives],
+        "Projected Monthly Cost": [f"${a['projected_monthly_cost']:,.2f}" for a in alternatives]
+    })
+    st.dataframe(df_alternatives, use_container_width=True, hide_index=True)
+
+    st.markdown("---")
+
+    # Pareto Frontier
+    st.markdown("### 📈 Cost vs Capacity Frontier")
+
+    st.markdown("""
+    Every instance family and node count for your workload type, priced at your usage.
+    Highlighted configurations are Pareto-optimal: nothing else offers as much memory, vCPU
+    and GPU memory for the same or lower cost.
+    """)
+
+    frontier = cached_pareto_frontier(inputs, catalog_version)
+    recommended_nodes = comparison['compute_pool_cost']['avg_node_count']
+    recommended_point = frontier[
+        (frontier['instance_family'] == recommendation['instance_family']) &
+        (frontier['node_count'] == recommended_nodes)
+    ]
+    st.plotly_chart(
+        create_pareto_frontier_chart(
+            frontier,
+            highlight=recommended_point.iloc[0].to_dict() if not recommended_point.empty else None
+        ),
+        use_container_width=True
+    )
+    st.caption(
+        f"{int(frontier['pareto_optimal'].sum())} of {len(frontier)} configurations are Pareto-optimal."
+    )
+
+    st.markdown("---")
+
+    # Sensitivity Analysis
+    st.markdown("### 🎚️ Cost Sensitivity")
+
+    st.markdown("""
+    How monthly savings change with session hours and average node count at your credit rate.
+    Green cells favor the compute pool; red cells favor the warehouse.
+    """)
+
+    sensitivity = cached_sensitivity_grid(inputs, catalog_version)
+    st.plotly_chart(create_sensitivity_heatmap(sensitivity), use_container_width=True)
+
+    st.markdown("---")
+
+    # Break-Even Analysis
+    st.markdown("### ⚖️ Break-Even Points")
+
+    st.markdown("""
+    Where the compute pool stops (or starts) paying off, solved directly instead of by dragging sliders.
+    Each break-even holds your other inputs fixed. Idle hours are pool hours billed after sessions end
+    each day before auto-suspend kicks in; they are what makes light daily usage favor the warehouse.
+    """)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        idle_hours = st.number_input(
+            "Idle Pool Hours Per Day",
+            min_value=0.0,
+            max_value=24.0,
+            value=recommendation['auto_suspend_minutes'] / 60,
+            step=0.25,
+            help="Billed pool hours per day outside sessions (defaults to one auto-suspend timeout)"
+        )
+    with col2:
+        pool_credit_rate = st.number_input(
+            "Compute Pool Credit Rate (USD)",
+            min_value=0.5,
+            max_value=10.0,
+            value=float(inputs['credit_rate']),
+            step=0.5,
+            help="Price per compute pool credit, if it differs from your warehouse credit rate"
+        )
+
+    break_even_inputs = dict(
+        warehouse_credits_per_hour=warehouse['credits_per_hour'],
+        pool_credits_per_hour_per_node=recommendation['credits_per_hour'],
+        credit_rate=inputs['credit_rate'],
+        pool_idle_hours_per_day=idle_hours,
+        pool_credit_rate=pool_credit_rate
+    )
+    break_even = break_even_vectorized(
+        hours_per_day=inputs['hours_per_day'],
+        avg_node_count=recommended_nodes,
+        **break_even_inputs
+    )
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(
+            "Break-Even Node Count",
+            f"{float(break_even['break_even_avg_node_count']):,.1f}",
+            delta="Pool cheaper below"
+        )
+    with col2:
+        hours_star = float(break_even['break_even_hours_per_day'])
+        st.metric(
+            "Break-Even Hours/Day",
+            f"{hours_star:,.2f}" if np.isfinite(hours_star) else "Never",
+            delta="Pool cheaper above"
+        )
+    with col3:
+        st.metric(
+            "Break-Even Pool Credit Rate",
+            f"${float(break_even['break_even_pool_credit_rate']):,.2f}",
+            delta="Pool cheaper below"
+        )
+
+    hours_axis = np.arange(0.5, 24.25, 0.25)
+    nodes_axis = np.arange(1, max(10, int(np.ceil(float(break_even['break_even_avg_node_count']) * 1.5))) + 1)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(
+            create_break_even_chart(
+                hours_axis,
+                break_even_vectorized(
+                    hours_per_day=hours_axis, avg_node_count=recommended_nodes, **break_even_inputs
+                )['monthly_savings'],
+                hours_star,
+                inputs['hours_per_day'],
+                "Hours Per Day"
+            ),
+            use_container_width=True
+        )
+    with col2:
+        st.plotly_chart(
+            create_break_even_chart(
+                nodes_axis,
+                break_even_vectorized(
+                    hours_per_day=inputs['hours_per_day'], avg_node_count=nodes_axis, **break_even_inputs
+                )['monthly_savings'],
+                float(break_even['break_even_avg_node_count']),
+                recommended_nodes,
+                "Average Node Count"
+            ),
+            use_container_width=True
+        )
+
+    st.markdown("---")
+
+    # Monte Carlo Cost Distribution
+    st.markdown("### 🎲 Cost Uncertainty")
+
+    st.markdown("""
+    Usage rarely matches a single estimate. Set a likely range for each input and the calculator
+    samples 100,000 usage scenarios (triangular distributions peaking at your inputs above)
+    to show the spread of monthly costs and how often the compute pool comes out cheaper.
+    """)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        hours_range = st.slider(
+            "Hours Per Day Range",
+            min_value=0.5,
+            max_value=24.0,
+            value=(max(0.5, inputs['hours_per_day'] - 2.0), min(24.0, inputs['hours_per_day'] + 2.0)),
+            step=0.5
+        )
+    with col2:
+        days_range = st.slider(
+            "Active Days Per Month Range",
+            min_value=1,
+            max_value=31,
+            value=(18, 24)
+        )
+    with col3:
+        users_range = st.slider(
+            "Concurrent Users Range",
+            min_value=1,
+            max_value=100,
+            value=(max(1, inputs['concurrent_users'] // 2), min(100, inputs['concurrent_users'] * 2))
+        )
+
+    uncertainty = cached_cost_uncertainty(inputs, catalog_version, hours_range, days_range, users_range)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("P50 Savings", f"${uncertainty['monthly_savings']['p50']:,.2f}")
+    with col2:
+        st.metric("P90 Pool Cost", f"${uncertainty['compute_pool_monthly_cost']['p90']:,.2f}")
+    with col3:
+        st.metric("P99 Pool Cost", f"${uncertainty['compute_pool_monthly_cost']['p99']:,.2f}")
+    with col4:
+        st.metric("Pool Cheaper", f"{uncertainty['probability_pool_cheaper']:.0%} of scenarios")
+
+    st.plotly_chart(
+        create_cost_distribution_chart(uncertainty['samples']),
+        use_container_width=True
+    )
+
+    df_uncertainty = pd.DataFrame({
+        "Percentile": ["P50", "P90", "P99"],
+        "Warehouse": [f"${v:,.2f}" for v in uncertainty['warehouse_monthly_cost'].values()],
+        "Compute Pool": [f"${v:,.2f}" for v in uncertainty['compute_pool_monthly_cost'].values()],
+        "Savings": [f"${v:,.2f}" for v in uncertainty['monthly_savings'].values()]
+    })
+    st.dataframe(df_uncertainty, use_container_width=True, hide_index=True)
+
+    st.markdown("---")
+
+    # Autoscaling Simulation
+    st.markdown("### ⏱️ Autoscaling Simulation")
+
+    st.markdown("""
+    The estimate above bills the midpoint of the node range for every session hour. This simulation
+    replays a month of notebook sessions against the recommended pool instead: it resumes on demand,
+    scales out when sessions queue, releases idle nodes and suspends after the auto-suspend timeout.
+    """)
+
+    mean_session_minutes = st.slider(
+        "Average Session Length (minutes)",
+        min_value=5,
+        max_value=240,
+        value=60,
+        step=5,
+        help="Average time a notebook session stays open"
+    )
+
+    simulation = cached_autoscaling_simulation(inputs, catalog_version, mean_session_minutes)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric(
+            "Simulated Monthly Cost",
+            f"${simulation['monthly_cost']:,.2f}",
+            delta=f"${simulation['monthly_cost'] - pool_cost:,.2f} vs estimate",
+            delta_color="inverse"
+        )
+    with col2:
+        st.metric("Billed Node Hours", f"{simulation['node_hours']:,.1f}")
+    with col3:
+        st.metric("P95 Wait for a Node", f"{simulation['p95_wait_secs']:.0f} s")
+    with col4:
+        st.metric("Peak Nodes", simulation['peak_nodes'])
+
+    st.caption(
+        f"{simulation['sessions']:,} simulated sessions; "
+        f"{simulation['sessions_waited']:,} waited for a node to start, "
+        f"{simulation['resumes']:,} pool resumes and {simulation['scale_outs']:,} scale-outs."
+    )
+
+    st.markdown("---")
+
     # SQL Generation
     st.markdown("### 📜 Migration SQL")
 
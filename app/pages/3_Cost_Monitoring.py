@@ -3,6 +3,10 @@
 import streamlit as st
 import sys
 import os
+import hashlib
+import sqlite3
+import numpy as np
+import pandas as pd
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -10,9 +14,24 @@ from components import (
     inject_custom_css,
     create_info_box,
     create_warning_box,
+    create_credit_usage_timeline,
+    create_usage_query_chart,
     create_pdf_download_button,
     format_sql_for_pdf
 )
+from models import (
+    LocalSQLEngine,
+    numbered_sql_statements,
+    detect_idle_pools,
+    build_usage_cache,
+    evict_upload_caches,
+    load_cache_manifest,
+    read_usage_cache,
+    cached_names,
+    daily_credit_usage
+)
+from models.exports import DEFAULT_EXPORT_CHUNK_SIZE, PYARROW_AVAILABLE
+from models.usage_cache import UPLOAD_CACHE_ROOT
 
 st.set_page_config(
     page_title="Cost Monitoring",
@@ -221,6 +240,239 @@ st.download_button(
 
 st.markdown("---")
 
+# Run Queries Locally
+st.markdown("## 🔎 Run the Queries on Your Exported Usage")
+
+st.markdown("""
+Export `METERING_HISTORY` and `QUERY_HISTORY` from `SNOWFLAKE.ACCOUNT_USAGE` (for example
+with Snowsight's download button) and upload them here. The queries above run unchanged
+against a local, indexed SQLite copy, with Snowflake date functions translated;
+`CURRENT_TIMESTAMP()` stands for the latest timestamp in the exports. Without files,
+an example month of usage is used.
+""")
+
+# Loading the SQLite engine is a bulk insert; keep loaded engines across reruns and
+# sessions (the engine serializes access behind its own lock) so widget changes only
+# run queries. Keys are the upload fingerprint and, for the cache path, the selection.
+@st.cache_resource(show_spinner="Loading exports into the local query engine...", max_entries=4)
+def cached_cache_engine(cache_dir, now, local_pool, local_warehouse, has_queries):
+    """Engine over the last 90 days of the selected names' metering and all query history."""
+    window_start = now - pd.Timedelta(days=90)
+    engine = LocalSQLEngine(now=now)
+    try:
+        engine.load_metering_history(read_usage_cache(
+            cache_dir, "metering_history", pools=[local_pool, local_warehouse], start=window_start
+        ))
+        if has_queries:
+            engine.load_query_history(read_usage_cache(cache_dir, "query_history", start=window_start))
+    except BaseException:
+        engine.close()
+        raise
+    return engine
+
+
+@st.cache_resource(show_spinner="Loading exports into the local query engine...", max_entries=4)
+def cached_export_engine(cache_key, _metering, _queries):
+    """Engine over the full exports, when the columnar cache is unavailable."""
+    engine = LocalSQLEngine()
+    try:
+        engine.load_metering_history(_metering)
+        if _queries is not None:
+            engine.load_query_history(_queries)
+    except BaseException:
+        engine.close()
+        raise
+    return engine
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def cached_idle_pools(cache_dir, now, has_queries):
+    """Idle pool-days over the cache's last 90 days, across all pools."""
+    window_start = now - pd.Timedelta(days=90)
+    return detect_idle_pools(
+        read_usage_cache(cache_dir, "metering_history", start=window_start),
+        read_usage_cache(cache_dir, "query_history", start=window_start) if has_queries else None,
+        now=now
+    )
+
+
+col1, col2 = st.columns(2)
+with col1:
+    metering_file = st.file_uploader("METERING_HISTORY Export (CSV)", type=["csv"])
+with col2:
+    query_file = st.file_uploader("QUERY_HISTORY Export (CSV)", type=["csv"])
+
+if metering_file is not None:
+    metering = pd.read_csv(metering_file, chunksize=DEFAULT_EXPORT_CHUNK_SIZE)
+    queries = pd.read_csv(query_file, chunksize=DEFAULT_EXPORT_CHUNK_SIZE) if query_file is not None else None
+    upload_hash = hashlib.sha256(metering_file.getvalue())
+    if query_file is not None:
+        upload_hash.update(query_file.getvalue())
+    cache_key = upload_hash.hexdigest()[:16]
+else:
+    rng = np.random.default_rng(0)
+    hours = pd.date_range("2024-01-01", periods=30 * 24, freq="h")
+    busy = (hours.hour >= 9) & (hours.hour < 18) & (hours.dayofweek < 5)
+    metering = pd.concat([
+        pd.DataFrame({
+            "service_type": service_type,
+            "name": name,
+            "start_time": hours,
+            "end_time": hours + pd.Timedelta(hours=1),
+            "credits_used": np.where(busy, scale * rng.uniform(0.6, 1.0, len(hours)), scale * 0.05),
+        })
+        for service_type, name, scale in [
+            ("COMPUTE_POOL", "NOTEBOOK_POOL", 0.22),
+            ("COMPUTE_POOL", "ML_TRAINING_POOL", 0.75),
+            ("WAREHOUSE", "NOTEBOOK_WH", 2.0),
+        ]
+    ], ignore_index=True)
+    n_queries = 20000
+    queries = pd.DataFrame({
+        "query_id": [f"example-{i}" for i in range(n_queries)],
+        "user_name": rng.choice(["ANALYST_1", "ANALYST_2", "DATA_SCIENTIST"], n_queries),
+        "warehouse_name": None,
+        # Notebook sessions tag their queries with the pool they run on (Query 2)
+        "query_tag": rng.choice(["NOTEBOOK_POOL", "ML_TRAINING_POOL"], n_queries, p=[0.9, 0.1]),
+        "execution_status": "SUCCESS",
+        "start_time": hours[busy][rng.integers(0, busy.sum(), n_queries)]
+        + pd.to_timedelta(rng.integers(0, 3600, n_queries), unit="s"),
+        "total_elapsed_time": rng.exponential(20000, n_queries),
+    })
+    # Fingerprint the generated data so a changed generator never reads a stale cache
+    example_hash = hashlib.sha256(pd.util.hash_pandas_object(metering, index=False).to_numpy().tobytes())
+    example_hash.update(pd.util.hash_pandas_object(queries, index=False).to_numpy().tobytes())
+    cache_key = "example-" + example_hash.hexdigest()[:16]
+
+try:
+    if PYARROW_AVAILABLE:
+        # Parse each upload once into the columnar cache; reruns read pruned columns from it
+        cache_dir = os.path.join(UPLOAD_CACHE_ROOT, cache_key)
+        evict_upload_caches(in_use=cache_dir)
+        if not load_cache_manifest(cache_dir, "metering_history"):
+            with st.spinner("Converting exports to the columnar cache..."):
+                if queries is not None:
+                    build_usage_cache(queries, cache_dir, "query_history")
+                build_usage_cache(metering, cache_dir, "metering_history")
+        manifests = [load_cache_manifest(cache_dir, source) for source in ("metering_history", "query_history")]
+        latest = max(m["last_start_time"] for m in manifests if m.get("last_start_time"))
+        pool_names = cached_names(cache_dir, "COMPUTE_POOL")
+        warehouse_names = cached_names(cache_dir, "WAREHOUSE")
+    else:
+        engine = cached_export_engine(cache_key, metering, queries)
+        pool_names = engine.query(
+            "SELECT DISTINCT name FROM metering_history WHERE service_type = 'COMPUTE_POOL' ORDER BY name"
+        )["name"].tolist()
+        warehouse_names = engine.query(
+            "SELECT DISTINCT name FROM metering_history WHERE service_type = 'WAREHOUSE' ORDER BY name"
+        )["name"].tolist()
+    if not pool_names:
+        raise ValueError("The METERING_HISTORY export has no COMPUTE_POOL rows")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        local_pool = st.selectbox("Compute Pool", pool_names)
+    with col2:
+        local_warehouse = st.selectbox("Warehouse (for Migration Analysis)", warehouse_names or ["<NONE>"])
+
+    placeholders = {
+        "<YOUR_COMPUTE_POOL_NAME>": local_pool,
+        "<YOUR_WAREHOUSE_NAME>": local_warehouse,
+    }
+
+    if PYARROW_AVAILABLE:
+        # The templates look back at most 90 days, so only those rows of the selected names are loaded
+        now = pd.Timestamp(latest).to_pydatetime()
+        engine = cached_cache_engine(cache_dir, now, local_pool, local_warehouse, bool(manifests[1]))
+    counts = engine.row_counts()
+    st.caption(
+        f"{counts['metering_history']:,} metering rows and {counts['query_history']:,} query rows loaded; "
+        f"CURRENT_TIMESTAMP() = {engine.reference_time:%Y-%m-%d %H:%M}."
+    )
+
+    if PYARROW_AVAILABLE:
+        timeline = daily_credit_usage(cache_dir, pools=[local_pool], start=now - pd.Timedelta(days=30))
+    else:
+        daily = engine.query(cost_monitoring_sql, placeholders)
+        timeline = [{"date": d, "credits": c} for d, c in zip(daily["usage_date"], daily["total_credits"])][::-1]
+    st.plotly_chart(create_credit_usage_timeline(timeline), use_container_width=True)
+
+    # Keyed by "-- Query N:" header, so reordering the template cannot feed a tab the wrong query
+    usage_statements = numbered_sql_statements(usage_queries_sql)
+    local_tabs = st.tabs(
+        ["Hourly Patterns", "Idle Detection", "Peak Hours", "Weekly Trends", "Migration Analysis", "Budget"]
+    )
+
+    with local_tabs[0]:
+        hourly = engine.query(usage_statements[1], placeholders)
+        hourly["hour"] = pd.to_datetime(hourly["hour"])
+        st.plotly_chart(
+            create_usage_query_chart(hourly, "hour", "credits_per_hour", "Hourly Credit Consumption"),
+            use_container_width=True
+        )
+        st.dataframe(hourly, use_container_width=True, hide_index=True)
+
+    with local_tabs[1]:
+        st.markdown(
+            "Days on which a compute pool used credits but ran fewer than 5 successful queries, "
+            "across all pools. Queries are matched to pools by `QUERY_TAG`."
+        )
+        if PYARROW_AVAILABLE:
+            idle = cached_idle_pools(cache_dir, now, bool(manifests[1]))
+        else:
+            idle = engine.query(usage_statements[2], placeholders)
+        if idle.empty:
+            st.success("No idle pool-days in the last 30 days.")
+        else:
+            st.dataframe(idle, use_container_width=True, hide_index=True)
+
+    with local_tabs[2]:
+        peak = engine.query(usage_statements[6], placeholders)
+        st.plotly_chart(
+            create_usage_query_chart(peak, "hour_of_day", "avg_credits", "Average Credits by Hour of Day", kind="bar"),
+            use_container_width=True
+        )
+        st.dataframe(peak, use_container_width=True, hide_index=True)
+
+    with local_tabs[3]:
+        weekly = engine.query(usage_statements[7], placeholders)
+        weekly["week_start"] = pd.to_datetime(weekly["week_start"])
+        st.plotly_chart(
+            create_usage_query_chart(
+                weekly, "week_start", "weekly_cost_usd", "Weekly Cost", y_title="Cost (USD)", kind="bar"
+            ),
+            use_container_width=True
+        )
+        st.dataframe(weekly, use_container_width=True, hide_index=True)
+
+    with local_tabs[4]:
+        comparison = engine.query(usage_statements[5], placeholders)
+        long_costs = comparison.melt(
+            id_vars="cost_date",
+            value_vars=["warehouse_cost_usd", "pool_cost_usd"],
+            var_name="service",
+            value_name="cost_usd"
+        )
+        st.plotly_chart(
+            create_usage_query_chart(
+                long_costs, "cost_date", "cost_usd", "Daily Warehouse vs Compute Pool Cost",
+                y_title="Cost (USD)", color="service"
+            ),
+            use_container_width=True
+        )
+        st.dataframe(comparison, use_container_width=True, hide_index=True)
+
+    with local_tabs[5]:
+        # The script creates and fills the budget table; run_script rolls it back afterwards
+        budget_status, burn_rate = engine.run_script(budget_sql, placeholders)
+        st.dataframe(budget_status, use_container_width=True, hide_index=True)
+        st.dataframe(burn_rate, use_container_width=True, hide_index=True)
+
+except (KeyError, ValueError, sqlite3.Error) as e:
+    st.error(f"Could not run the queries on the exports: {e}")
+
+st.markdown("---")
+
 # Alert Threshold Calculator
 st.markdown("## 🚨 Alert Threshold Calculator")
 
@@ -3,6 +3,7 @@
 import streamlit as st
 import sys
 import os
+import numpy as np
 import pandas as pd
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -11,10 +12,19 @@ from components import (
     inject_custom_css,
     create_info_box,
     create_warning_box,
+    create_suspend_frontier_chart,
     create_pdf_download_button,
     format_sql_for_pdf
 )
 
+from models import (
+    get_catalog,
+    idle_gaps,
+    generate_sessions,
+    estimate_resume_latency,
+    calculate_suspend_frontier
+)
+
 st.set_page_config(
     page_title="Best Practices",
     page_icon="✨",
@@ -205,6 +215,86 @@ create_warning_box("""
     Setting it too long wastes credits on idle pools. Monitor actual usage patterns and adjust.
 """)
 
+# Idle Cost vs Cold Start Frontier
+st.markdown("### 📉 Idle Cost vs Cold Starts")
+
+st.markdown("""
+Every timeout is a trade-off: shorter timeouts burn fewer idle credits but make more sessions wait
+for the pool to resume. Upload an activity trace (for example an exported query or session history
+with `start_time` and optional `end_time` columns) to see the trade-off for your own usage pattern.
+Without a file, an example month of notebook sessions is used.
+""")
+
+trace_file = st.file_uploader("Activity Trace (CSV)", type=["csv"])
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    frontier_families = [p.family for p in get_catalog().compute_pools]
+    frontier_family = st.selectbox(
+        "Instance Family",
+        frontier_families,
+        index=frontier_families.index("CPU_X64_M") if "CPU_X64_M" in frontier_families else 0
+    )
+with col2:
+    frontier_min_nodes = st.number_input("MIN_NODES", min_value=1, max_value=100, value=1)
+with col3:
+    frontier_credit_rate = st.number_input(
+        "Credit Rate (USD)", min_value=1.0, max_value=10.0, value=4.0, step=0.5
+    )
+
+if trace_file is not None:
+    trace = pd.read_csv(trace_file)
+    if "pool_name" not in trace.columns:
+        trace["pool_name"] = "UPLOADED_TRACE"
+    trace_pool = st.selectbox("Pool", sorted(trace["pool_name"].astype(str).unique()))
+    trace = trace[trace["pool_name"].astype(str) == trace_pool]
+else:
+    arrivals, durations = generate_sessions(1, hours_per_day=8, mean_session_minutes=30, seed=0)
+    origin = pd.Timestamp("2024-01-01")
+    trace = pd.DataFrame({
+        "pool_name": "EXAMPLE_POOL",
+        "start_time": origin + pd.to_timedelta(arrivals, unit="s"),
+        "end_time": origin + pd.to_timedelta(arrivals + durations, unit="s"),
+    })
+
+try:
+    _, _, gaps = idle_gaps(
+        trace,
+        start_column="start_time",
+        end_column="end_time" if "end_time" in trace.columns else None
+    )
+    trace_start = pd.to_datetime(trace["start_time"])
+    trace_days = max((trace_start.max() - trace_start.min()).total_seconds() / 86400, 1.0)
+
+    frontier_pool = get_catalog().get_pool(frontier_family)
+    resume_latency = estimate_resume_latency(frontier_pool.type, frontier_min_nodes)
+    frontier = calculate_suspend_frontier(
+        gaps,
+        trace_days,
+        credits_per_hour=frontier_pool.credits_per_hour * frontier_min_nodes,
+        candidate_secs=np.arange(60, 4 * 3600 + 1, 60),
+        credit_rate=frontier_credit_rate,
+        resume_latency_secs=resume_latency
+    )
+
+    st.plotly_chart(create_suspend_frontier_chart(frontier), use_container_width=True)
+
+    common = np.isin(frontier["auto_suspend_secs"], [300, 600, 900, 1800, 3600])
+    df_frontier = pd.DataFrame({
+        "AUTO_SUSPEND_SECS": frontier["auto_suspend_secs"][common].astype(int),
+        "Idle Credits/Day": [f"{v:.2f}" for v in frontier["idle_credits_per_day"][common]],
+        "Idle Cost/Day": [f"${v:,.2f}" for v in frontier["idle_cost_per_day"][common]],
+        "Cold Starts/Day": [f"{v:.1f}" for v in frontier["cold_starts_per_day"][common]],
+        "Cold-Start Wait/Day": [f"{v / 60:.1f} min" for v in frontier["cold_start_wait_secs_per_day"][common]]
+    })
+    st.dataframe(df_frontier, use_container_width=True, hide_index=True)
+    st.caption(
+        f"{len(gaps):,} idle gaps over {trace_days:.0f} days; "
+        f"estimated resume latency {resume_latency:.0f} s."
+    )
+except (KeyError, ValueError) as e:
+    st.error(f"Could not analyze activity trace: {e}")
+
 st.markdown("---")
 
 # Configuration Templates
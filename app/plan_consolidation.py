@@ -0,0 +1,84 @@
+"""Command-line consolidation planner for many small compute pools.
+
+Reads hourly credits per pool (Query 1 in
+``app/data/sql_templates/usage_queries.sql`` exported for every pool), packs
+pools whose busy hours do not overlap into shared pools, and writes the
+CREATE COMPUTE POOL statements for the consolidated layout. Runs without
+Streamlit or Plotly.
+
+Usage:
+    python app/plan_consolidation.py hourly_usage.csv -o consolidated.sql
+    python app/plan_consolidation.py hourly_usage.csv --max-nodes 10 --assignments pools.csv
+    python app/plan_consolidation.py hourly_usage.csv -o consolidated.sql --retire-sql retire.sql
+
+Usage columns (case-insensitive):
+    hour, pool_name, credits_per_hour (required)
+    instance_family (optional; defaults to --default-family)
+    auto_suspend_minutes (optional; consolidated pools take their members' minimum)
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.consolidation import DEFAULT_INSTANCE_FAMILY, plan_consolidation
+from models.exports import normalize_columns
+from models.warehouse_mapping import MAX_NODES
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Consolidate compute pools by packing their hourly usage profiles."
+    )
+    parser.add_argument("usage", help="Hourly credits per pool (.csv)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="Output SQL file; defaults to stdout")
+    parser.add_argument("--assignments", default=None,
+                        help="Optional CSV mapping each pool to its consolidated pool")
+    parser.add_argument("--retire-sql", default=None,
+                        help="Optional SQL file dropping the pools that were merged")
+    parser.add_argument("--max-nodes", type=int, default=MAX_NODES,
+                        help=f"MAX_NODES of each consolidated pool; pools peaking above it "
+                             f"are left as they are (default: {MAX_NODES})")
+    parser.add_argument("--min-nodes", type=int, default=1,
+                        help="MIN_NODES of each pool (default: 1)")
+    parser.add_argument("--credit-rate", type=float, default=4.0,
+                        help="Cost per credit in USD (default: 4)")
+    parser.add_argument("--default-family", default=DEFAULT_INSTANCE_FAMILY,
+                        help=f"Instance family of pools without one (default: {DEFAULT_INSTANCE_FAMILY})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    plan = plan_consolidation(
+        normalize_columns(pd.read_csv(args.usage)),
+        max_nodes=args.max_nodes,
+        min_nodes=args.min_nodes,
+        credit_rate=args.credit_rate,
+        default_family=args.default_family
+    )
+
+    if args.output == "-":
+        print(plan["migration_sql"])
+    else:
+        with open(args.output, "w") as f:
+            f.write(plan["migration_sql"] + "\n")
+    if args.assignments:
+        plan["assignments"].to_csv(args.assignments, index=False)
+    if args.retire_sql:
+        with open(args.retire_sql, "w") as f:
+            f.write(plan["retire_sql"] + "\n")
+
+    summary = {k: v for k, v in plan.items() if not isinstance(v, (pd.DataFrame, str))}
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Command-line fleet migration planner.
+
+Streams a CSV or JSONL warehouse inventory through the recommendation and
+cost models and writes one plan row per warehouse, including the migration
+SQL. Runs without Streamlit or Plotly.
+
+Usage:
+    python app/plan_fleet.py inventory.csv -o plan.jsonl
+    python app/plan_fleet.py inventory.jsonl -o plan.csv --workers 8
+
+Inventory columns:
+    warehouse_size, workload_type, concurrent_users (required)
+    warehouse_name, gpu_required, hours_per_day, days_per_month,
+    credit_rate, pool_name (optional)
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.fleet_planner import DEFAULT_CHUNK_SIZE, plan_fleet
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Plan compute pool migrations for a warehouse inventory."
+    )
+    parser.add_argument("inventory", help="Warehouse inventory (.csv or .jsonl)")
+    parser.add_argument(
+        "-o", "--output", default="-",
+        help="Output file (.jsonl or .csv); defaults to JSONL on stdout"
+    )
+    parser.add_argument("--hours-per-day", type=float, default=8.0,
+                        help="Default session hours per day (default: 8)")
+    parser.add_argument("--days-per-month", type=int, default=22,
+                        help="Default working days per month (default: 22)")
+    parser.add_argument("--credit-rate", type=float, default=4.0,
+                        help="Default cost per credit in USD (default: 4)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Inventory rows per chunk (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count; 1 disables multiprocessing)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    output_format = "csv" if args.output.lower().endswith(".csv") else "jsonl"
+    output = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+
+    try:
+        summary = plan_fleet(
+            args.inventory,
+            output,
+            output_format=output_format,
+            hours_per_day=args.hours_per_day,
+            days_per_month=args.days_per_month,
+            credit_rate=args.credit_rate,
+            chunk_size=args.chunk_size,
+            workers=args.workers
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())